@@ -0,0 +1,109 @@
+"""
+채팅 그래프 동시 세션 벤치마크 (동기 invoke 노드 vs 비동기 astream 노드)
+
+/chatbot/ 엔드포인트와 같은 방식으로 astream_events를 동시에 여러 세션에서 실행하고,
+세션별 첫 토큰까지의 시간(TTFT)과 전체 토큰 처리량(tokens/s)을 측정합니다.
+
+기본값은 토큰마다 --token-delay만큼 쉬는 모의 모델(FakeListChatModel)로, 노드가 이벤트 루프/스레드 풀을
+어떻게 점유하는지만 비교합니다. --ollama를 주면 실제 모델을 사용합니다. (이 경우 처리량은 Ollama의
+OLLAMA_NUM_PARALLEL 설정에 좌우됨)
+
+    python benchmarks/bench_chat_concurrency.py
+    python benchmarks/bench_chat_concurrency.py --ollama llama3.1 --sessions 1 8
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import List, Optional, Tuple
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.messages import BaseMessage
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.graph import END, START, StateGraph
+
+from mllm_server.routers.chatbot import router
+
+QUESTION = "Is my driving safe right now?"
+ANSWER_WORDS = 16  # 모의 모델은 글자 단위로 스트리밍 (약 80 토큰)
+
+
+def sync_llama_chatbot(state: router.State):
+    # 변경 전 node_llama_chatbot (동기 invoke)
+    user_query_message = state["messages"][-1].content
+    user_query_message += "-" * 16 + "\n" + "Current User's Vehicle State:\n"
+    for key, value in state["contexts"].items():
+        user_query_message += f"{key}: {value}\n"
+    query: List[BaseMessage] = state["messages"]
+    query[-1].content = user_query_message
+    return {"messages": [router.llm_llama.invoke(query)]}
+
+
+def sync_vehicle_context_fetch(state: router.State):
+    state["contexts"] = router.sensor_context_cache.get(router.sensor_context_tokens)
+    return state
+
+
+def build_graph(mode: str):
+    if mode == "sync":
+        chatbot, vehicle_context = sync_llama_chatbot, sync_vehicle_context_fetch
+    else:
+        chatbot, vehicle_context = router.node_llama_chatbot, router.node_vehicle_context_fetch
+    builder = StateGraph(router.State)
+    builder.add_node("chatbot", chatbot)
+    builder.add_node("vehicle_context", vehicle_context)
+    builder.add_edge(START, "vehicle_context")
+    builder.add_edge("vehicle_context", "chatbot")
+    builder.add_edge("chatbot", END)
+    return builder.compile(checkpointer=InMemorySaver())
+
+
+async def run_session(graph, session: str, start: float) -> Tuple[Optional[float], int, float]:
+    first_token = None
+    tokens = 0
+    config = {"configurable": {"thread_id": session}}
+    async for event in graph.astream_events({"messages": [("user", QUESTION)]}, config=config, version="v2"):
+        if event["event"] == "on_chat_model_stream" and event["data"]["chunk"].content:
+            if first_token is None:
+                first_token = time.perf_counter() - start
+            tokens += 1
+    return first_token, tokens, time.perf_counter() - start
+
+
+async def run(graph, sessions: int, tag: str) -> Tuple[List[Optional[float]], int, float]:
+    start = time.perf_counter()
+    results = await asyncio.gather(*(run_session(graph, f"{tag}-{i}", start) for i in range(sessions)))
+    elapsed = time.perf_counter() - start
+    return [r[0] for r in results], sum(r[1] for r in results), elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ollama", metavar="MODEL", help="실제 Ollama 모델 (예: llama3.1)")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--token-delay", type=float, default=0.02, help="모의 모델의 토큰 간격 (초)")
+    parser.add_argument("--modes", nargs="+", choices=["sync", "async"], default=["sync", "async"])
+    args = parser.parse_args()
+
+    if args.ollama:
+        from langchain_ollama import ChatOllama
+
+        router.llm_llama = ChatOllama(model=args.ollama)
+    else:
+        answer = " ".join(["word"] * ANSWER_WORDS)
+        router.llm_llama = FakeListChatModel(responses=[answer], sleep=args.token_delay)
+
+    header = ("mode", "sessions", "ttft p50 ms", "ttft max ms", "tokens", "elapsed s", "tokens/s")
+    print(f"{header[0]:<8}" + "".join(f"{h:>14}" for h in header[1:]))
+    for mode in args.modes:
+        graph = build_graph(mode)
+        for sessions in args.sessions:
+            ttfts, tokens, elapsed = asyncio.run(run(graph, sessions, f"{mode}-{sessions}"))
+            ttfts = [t * 1000 for t in ttfts if t is not None] or [float("nan")]
+            row = (sessions, statistics.median(ttfts), max(ttfts), tokens, elapsed, tokens / elapsed)
+            print(f"{mode:<8}" + "".join(f"{v:>14.2f}" if isinstance(v, float) else f"{v:>14}" for v in row))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+긴 대화에서의 프롬프트 길이와 지연 벤치마크 (전체 기록 vs 대화 기록 창 + 누적 요약)
+
+채팅 그래프(/chatbot/과 같은 stream_events)로 --turns턴짜리 합성 세션을 진행합니다.
+모의 모델은 프롬프트 토큰 수에 비례하는 prefill 시간(--prefill-ms, 토큰당)을 기다린 뒤 답변을 스트리밍합니다.
+  - full: HISTORY_TOKENS=0 (기존 방식, 매 턴 전체 기록을 보냄)
+  - window: 최근 --history-turns턴을 --history-tokens 안에서 그대로 보내고 나머지는 누적 요약
+턴별 답변 프롬프트 토큰 수, 첫 토큰까지의 시간(TTFT), 턴 전체 시간(window는 답변 뒤의 요약 갱신 포함),
+체크포인트에 남은 메시지 수를 출력합니다. --csv를 주면 턴별 곡선 전체를 저장합니다.
+
+    python benchmarks/bench_chat_history.py
+    python benchmarks/bench_chat_history.py --turns 200 --prefill-ms 0.3 --csv history.csv
+"""
+
+import argparse
+import asyncio
+import csv
+import os
+import random
+import statistics
+import tempfile
+import time
+from typing import Any, Dict, List
+
+os.environ.setdefault("SCANER_FILTER_ADDRESS", "127.0.0.1:0")
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.messages import BaseMessage
+
+from mllm_server.chat_history import HistoryWindow, message_tokens
+from mllm_server.routers.chatbot import router
+from mllm_server.types import UserMessage
+
+QUESTIONS = [
+    "How fast am I going right now and is that within the limit on this road?",
+    "I am getting a bit tired, can you suggest when I should take a break?",
+    "Was that last turn too sharp for the passengers in the back?",
+    "Remind me what I told you about my destination earlier.",
+    "Is my steering steady enough, or am I drifting in the lane?",
+    "Could you keep an eye on my braking for the next few minutes?",
+]
+ANSWER = (
+    "You are holding a steady 62 km/h, which is within the limit here, and your steering has been calm "
+    "for the last few seconds. Braking has been smooth, so there is nothing to worry about at the moment."
+)
+SUMMARY = (
+    "The driver is on a long trip and asked repeatedly about speed, lane keeping and braking. "
+    "Speed has stayed near the limit, steering and braking were smooth, one sharp turn was noted. "
+    "The driver mentioned feeling tired and wants a break suggestion and reminders about the destination. "
+) * 2
+
+
+class PrefillChatModel(FakeListChatModel):
+    """
+    프롬프트 토큰 수에 비례해 기다린 뒤 응답하는 모의 모델. 요약 요청에는 SUMMARY로 응답합니다.
+    """
+
+    prefill_s_per_token: float = 0.0
+    answer_prompts: List[int] = []
+    summary_prompts: List[int] = []
+
+    def _prepare(self, messages: List[BaseMessage]) -> float:
+        tokens = sum(message_tokens(message) for message in messages)
+        is_summary = str(messages[-1].content).startswith("You keep a running summary")
+        (self.summary_prompts if is_summary else self.answer_prompts).append(tokens)
+        self.responses = [SUMMARY if is_summary else ANSWER]
+        self.i = 0
+        return tokens * self.prefill_s_per_token
+
+    def _call(self, messages: List[BaseMessage], *args: Any, **kwargs: Any) -> str:
+        time.sleep(self._prepare(messages))
+        return super()._call(messages, *args, **kwargs)
+
+    async def _astream(self, messages: List[BaseMessage], *args: Any, **kwargs: Any):
+        await asyncio.sleep(self._prepare(messages))
+        async for chunk in super()._astream(messages, *args, **kwargs):
+            yield chunk
+
+
+async def run_session(mode: str, args: argparse.Namespace) -> List[Dict[str, float]]:
+    model = PrefillChatModel(responses=[ANSWER], prefill_s_per_token=args.prefill_ms / 1e3)
+    router.llm_llama = model
+    router.history_window = HistoryWindow(
+        args.history_turns, 0 if mode == "full" else args.history_tokens, fold_turns=args.fold_turns
+    )
+    rng = random.Random(args.seed)
+    session = f"{mode}-{time.time_ns()}"
+    rows = []
+    for turn in range(1, args.turns + 1):
+        question = UserMessage(role="user", content=f"({turn}) {rng.choice(QUESTIONS)}")
+        start = time.perf_counter()
+        ttft = None
+        async for line in router.stream_events([question], session):
+            if ttft is None and b'"on_chat_model_stream"' in line:
+                ttft = time.perf_counter() - start
+        # 엔드포인트는 응답을 보낸 뒤 요약을 예약하므로 여기서는 바로 실행해 턴 시간에 포함
+        await router.fold_history(session)
+        elapsed = time.perf_counter() - start
+        state = await router.simple_chat_graph.aget_state({"configurable": {"thread_id": session}})
+        rows.append(
+            {
+                "mode": mode,
+                "turn": turn,
+                "prompt tokens": model.answer_prompts[-1],
+                "ttft ms": ttft * 1e3,
+                "turn ms": elapsed * 1e3,
+                "messages": len(state.values["messages"]),
+            }
+        )
+    return rows
+
+
+async def main_async(args: argparse.Namespace) -> List[Dict[str, float]]:
+    rows = []
+    async with router.chatbot_lifespan():
+        for mode in ("full", "window"):
+            rows += await run_session(mode, args)
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=200)
+    parser.add_argument("--prefill-ms", type=float, default=0.1, help="모의 모델의 프롬프트 토큰당 prefill 시간")
+    parser.add_argument("--history-turns", type=int, default=6)
+    parser.add_argument("--history-tokens", type=int, default=1024)
+    parser.add_argument("--fold-turns", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--csv", default=None, help="턴별 결과를 저장할 CSV 경로")
+    args = parser.parse_args()
+
+    csv_path = os.path.abspath(args.csv) if args.csv else None
+    # 에셋(체크포인트 등)은 임시 디렉터리에 생성
+    os.chdir(tempfile.mkdtemp(prefix="bench_chat_history-"))
+    rows = asyncio.run(main_async(args))
+
+    marks = sorted({t for t in (1, 10, 25, 50, 100, 150, 200, args.turns) if t <= args.turns})
+    header = ("mode", "turn", "prompt tokens", "ttft ms", "turn ms", "messages")
+    print(f"{header[0]:<8}" + "".join(f"{h:>14}" for h in header[1:]))
+    for row in rows:
+        if row["turn"] in marks:
+            print(f"{row['mode']:<8}{row['turn']:>14}" + "".join(f"{row[h]:>14.1f}" for h in header[2:]))
+    # 요약은 몇 턴에 한 번씩 일어나므로 턴 전체 시간은 평균도 함께 비교
+    for mode in ("full", "window"):
+        mode_rows = [row for row in rows if row["mode"] == mode]
+        means = [statistics.mean(row[h] for row in mode_rows) for h in header[2:]]
+        print(f"{mode:<8}{'mean':>14}" + "".join(f"{v:>14.1f}" for v in means))
+    if csv_path:
+        with open(csv_path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=header)
+            writer.writeheader()
+            writer.writerows(rows)
+        print(f"per-turn curves written to {csv_path}")
+
+
+if __name__ == "__main__":
+    main()
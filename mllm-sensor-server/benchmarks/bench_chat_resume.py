@@ -0,0 +1,172 @@
+"""
+끊기는 링크에서의 채팅 스트림 벤치마크 (NDJSON 재전송 vs SSE 재개)
+
+모의 모델로 서버(uvicorn)를 띄우고, 연결이 평균 --link-s초마다 끊기는 클라이언트가 답변 하나를 끝까지 받을 때까지
+  - ndjson: POST /chatbot/ 을 처음부터 다시 보냄 (끊길 때마다 새로 생성)
+  - sse: POST /chatbot/runs 후 끊기면 GET /chatbot/runs/{id}/events 에 Last-Event-ID로 재접속
+를 반복합니다. 생성 횟수(스케줄러 admitted)와 답변을 모두 받기까지의 시간, 재접속 횟수를 비교합니다.
+
+    python benchmarks/bench_chat_resume.py
+    python benchmarks/bench_chat_resume.py --link-s 0.5 --questions 10
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import socket
+import statistics
+import tempfile
+import time
+from typing import Dict, List, Tuple
+
+os.environ.setdefault("SCANER_FILTER_ADDRESS", "127.0.0.1:0")
+
+import httpx
+import orjson
+import uvicorn
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from mllm_server.llm import LLM_MODEL, llm_scheduler
+from mllm_server.routers.chatbot import router
+from mllm_server.server import fastapi_app
+
+HOST = "127.0.0.1"
+ANSWER = "Your speed is steady and the steering is calm, so there is nothing to worry about right now."
+QUESTION = {"role": "user", "content": "Am I driving safely?"}
+STREAM_ONLY = {"events": ["on_chat_model_stream"]}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind((HOST, 0))
+        return sock.getsockname()[1]
+
+
+async def read_until(response: httpx.Response, deadline: float, on_line) -> bool:
+    """
+    deadline까지 줄 단위로 읽습니다. 스트림이 끝나면 True, 링크가 끊기면(deadline) False
+    """
+    lines = response.aiter_lines()
+    while True:
+        timeout = deadline - time.monotonic()
+        if timeout <= 0:
+            return False
+        try:
+            line = await asyncio.wait_for(lines.__anext__(), timeout)
+        except StopAsyncIteration:
+            return True
+        except asyncio.TimeoutError:
+            return False
+        if on_line(line):
+            return True
+
+
+async def ask_ndjson(client: httpx.AsyncClient, session: str, link_s: float) -> Tuple[str, int]:
+    body = {"session": session, "messages": [QUESTION], "event_filter": STREAM_ONLY}
+    attempts = 0
+    while True:
+        attempts += 1
+        answer: List[str] = []
+
+        def on_line(line: str) -> bool:
+            if line:
+                answer.append(orjson.loads(line)["data"]["chunk"]["content"])
+            return False
+
+        deadline = time.monotonic() + random.expovariate(1 / link_s)
+        async with client.stream("POST", "/chatbot/", json=body) as response:
+            if await read_until(response, deadline, on_line):
+                return "".join(answer), attempts
+
+
+async def ask_sse(client: httpx.AsyncClient, session: str, link_s: float) -> Tuple[str, int]:
+    body = {"session": session, "messages": [QUESTION], "event_filter": STREAM_ONLY}
+    answer: List[str] = []
+    state = {"last_id": "0", "event": "message"}
+    run_id = None
+    attempts = 0
+
+    def on_line(line: str) -> bool:
+        if line.startswith("id: "):
+            state["last_id"] = line[4:]
+        elif line.startswith("event: "):
+            state["event"] = line[7:]
+        elif line.startswith("data: "):
+            if state["event"] == "end":
+                return True
+            if state["event"] == "message":
+                answer.append(orjson.loads(line[6:])["data"]["chunk"]["content"])
+        elif not line:
+            state["event"] = "message"
+        return False
+
+    while True:
+        attempts += 1
+        deadline = time.monotonic() + random.expovariate(1 / link_s)
+        if run_id is None:
+            request = client.stream("POST", "/chatbot/runs", json=body)
+        else:
+            headers = {"Last-Event-ID": state["last_id"]}
+            request = client.stream("GET", f"/chatbot/runs/{run_id}/events", headers=headers)
+        async with request as response:
+            run_id = response.headers["x-run-id"]
+            if await read_until(response, deadline, on_line):
+                return "".join(answer), attempts
+
+
+async def run(mode: str, port: int, questions: int, link_s: float) -> Dict[str, float]:
+    ask = ask_ndjson if mode == "ndjson" else ask_sse
+    admitted = llm_scheduler.get_stats().get(LLM_MODEL, {}).get("admitted", 0)
+    times, attempts, complete = [], [], 0
+    async with httpx.AsyncClient(base_url=f"http://{HOST}:{port}", timeout=None) as client:
+        for i in range(questions):
+            start = time.monotonic()
+            answer, tries = await ask(client, f"{mode}-{i}", link_s)
+            times.append(time.monotonic() - start)
+            attempts.append(tries)
+            complete += answer == ANSWER
+    generations = llm_scheduler.get_stats()[LLM_MODEL]["admitted"] - admitted
+    return {
+        "generations": generations / questions,
+        "connections": statistics.mean(attempts),
+        "time s p50": statistics.median(times),
+        "time s max": max(times),
+        "complete": complete / questions,
+    }
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(fastapi_app, host=HOST, port=port, log_level="warning"))
+    task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+    try:
+        header = ("mode", "generations", "connections", "time s p50", "time s max", "complete")
+        print(f"{header[0]:<8}" + "".join(f"{h:>14}" for h in header[1:]))
+        for mode in ("ndjson", "sse"):
+            random.seed(args.seed)
+            result = await run(mode, port, args.questions, args.link_s)
+            print(f"{mode:<8}" + "".join(f"{v:>14.2f}" for v in result.values()))
+    finally:
+        server.should_exit = True
+        await task
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--questions", type=int, default=10)
+    parser.add_argument("--link-s", type=float, default=1.0, help="연결이 유지되는 평균 시간 (지수 분포)")
+    parser.add_argument("--token-delay", type=float, default=0.02, help="모의 모델의 토큰 간격 (초)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    # 에셋(체크포인트 등)은 임시 디렉터리에 생성
+    os.chdir(tempfile.mkdtemp(prefix="bench_chat_resume-"))
+    router.llm_llama = FakeListChatModel(responses=[ANSWER], sleep=args.token_delay)
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+체크포인트 저장소 벤치마크 (기본 AsyncSqliteSaver vs PooledSqliteSaver)
+
+세션마다 턴을 진행하며 채팅 그래프와 같은 형태의 체크포인트(add_messages로 늘어나는 메시지 목록)를 씁니다.
+--concurrency개의 세션이 동시에 쓰고, 그동안 조회 작업이 임의 세션의 최신 체크포인트를 읽습니다.
+쓰기/읽기 지연 백분위와 파일 크기(DB + WAL)를 비교합니다.
+
+기본값(10k 세션 x 50턴, 체크포인트 100만 개)은 기본 저장소에서 약 16 GB를 쓰고 두 저장소를 합쳐 1시간 가까이
+걸리므로, 빠르게 확인할 때는 --sessions를 줄입니다. (세션 수를 줄이면 정리 작업의 부하가 작아 쓰기 p99 차이가 드러나지 않음)
+
+    python benchmarks/bench_checkpoint_store.py
+    python benchmarks/bench_checkpoint_store.py --sessions 500 --turns 50
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+import aiosqlite
+import numpy as np
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.checkpoint.base import empty_checkpoint
+from langgraph.checkpoint.base.id import uuid6
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+from mllm_server.checkpoint_store import open_checkpointer
+
+CHECKPOINTS_PER_TURN = 2  # 입력 체크포인트 + 응답 체크포인트
+QUESTION = "Is my driving safe right now? " * 2
+ANSWER = "Your speed is steady and the steering is calm, so there is nothing to worry about. " * 3
+
+
+class Session:
+    def __init__(self, thread_id: str) -> None:
+        self.thread_id = thread_id
+        self.messages: List = []
+        self.parent: Optional[str] = None
+        self.step = 0
+
+    async def write(self, saver: AsyncSqliteSaver, message, latencies: List[float]) -> None:
+        self.messages.append(message)
+        checkpoint = empty_checkpoint()
+        checkpoint["id"] = str(uuid6())
+        checkpoint["channel_values"] = {"messages": list(self.messages), "contexts": {"Speed": "60 km/h, steady"}}
+        config = {"configurable": {"thread_id": self.thread_id, "checkpoint_ns": "", "checkpoint_id": self.parent}}
+        self.step += 1
+        start = time.perf_counter()
+        result = await saver.aput(config, checkpoint, {"source": "loop", "step": self.step}, {})
+        latencies.append(time.perf_counter() - start)
+        self.parent = result["configurable"]["checkpoint_id"]
+
+
+async def write_sessions(saver, sessions: List[Session], turns: int, concurrency: int, latencies: List[float]) -> None:
+    queue: asyncio.Queue = asyncio.Queue()
+    # 턴 단위로 모든 세션을 돌아가며 진행 (실제 서비스처럼 세션마다 대화가 조금씩 늘어남)
+    for _ in range(turns):
+        for session in sessions:
+            queue.put_nowait(session)
+
+    async def worker() -> None:
+        while not queue.empty():
+            session = queue.get_nowait()
+            await session.write(saver, HumanMessage(content=QUESTION), latencies)
+            await session.write(saver, AIMessage(content=ANSWER), latencies)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+
+async def read_sessions(
+    saver, sessions: List[Session], rate: float, stop: asyncio.Event, latencies: List[float]
+) -> None:
+    # 두 저장소에 같은 조회 부하를 주기 위해 일정한 주기로 조회 (조회마다 별도 작업)
+    rng = random.Random(0)
+
+    async def read(session: Session) -> None:
+        start = time.perf_counter()
+        await saver.aget_tuple({"configurable": {"thread_id": session.thread_id, "checkpoint_ns": ""}})
+        latencies.append(time.perf_counter() - start)
+
+    tasks = set()
+    while not stop.is_set():
+        task = asyncio.create_task(read(rng.choice(sessions)))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+        await asyncio.sleep(1 / rate)
+    await asyncio.gather(*tasks)
+
+
+def file_size(path: str) -> int:
+    return sum(os.path.getsize(p) for p in (path, path + "-wal") if os.path.exists(p))
+
+
+async def run(kind: str, path: str, args: argparse.Namespace) -> Dict[str, float]:
+    sessions = [Session(f"session-{i}") for i in range(args.sessions)]
+    writes: List[float] = []
+    reads: List[float] = []
+    stop = asyncio.Event()
+    start = time.perf_counter()
+    if kind == "default":
+        async with aiosqlite.connect(path) as conn:
+            saver = AsyncSqliteSaver(conn)
+            await saver.setup()
+            reader = asyncio.create_task(read_sessions(saver, sessions, args.read_rate, stop, reads))
+            await write_sessions(saver, sessions, args.turns, args.concurrency, writes)
+            stop.set()
+            await reader
+    else:
+        async with open_checkpointer(path, keep=args.keep, compact_interval_s=args.compact_interval) as saver:
+            reader = asyncio.create_task(read_sessions(saver, sessions, args.read_rate, stop, reads))
+            await write_sessions(saver, sessions, args.turns, args.concurrency, writes)
+            stop.set()
+            await reader
+    elapsed = time.perf_counter() - start
+
+    write_ms = np.array(writes) * 1e3
+    read_ms = np.array(reads) * 1e3
+    return {
+        "writes/s": len(writes) / elapsed,
+        "write p50 ms": float(np.percentile(write_ms, 50)),
+        "write p99 ms": float(np.percentile(write_ms, 99)),
+        "read p99 ms": float(np.percentile(read_ms, 99)) if len(read_ms) else float("nan"),
+        "file MB": file_size(path) / 2**20,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=10000)
+    parser.add_argument("--turns", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--read-rate", type=float, default=100.0, help="초당 조회 수")
+    parser.add_argument("--keep", type=int, default=10, help="PooledSqliteSaver가 세션별로 남기는 체크포인트 수")
+    parser.add_argument("--compact-interval", type=float, default=5.0)
+    parser.add_argument("--kinds", nargs="+", choices=["default", "pooled"], default=["default", "pooled"])
+    parser.add_argument("--dir", default=None, help="DB를 만들 디렉터리 (기본: 임시 디렉터리)")
+    args = parser.parse_args()
+
+    directory = args.dir or tempfile.mkdtemp(prefix="bench_checkpoint-")
+    print(f"{args.sessions} sessions x {args.turns} turns x {CHECKPOINTS_PER_TURN} checkpoints, in {directory}")
+    header = ("kind", "writes/s", "write p50 ms", "write p99 ms", "read p99 ms", "file MB")
+    print(f"{header[0]:<8}" + "".join(f"{h:>14}" for h in header[1:]))
+    for kind in args.kinds:
+        path = os.path.join(directory, f"{kind}.sqlite")
+        result = asyncio.run(run(kind, path, args))
+        print(f"{kind:<8}" + "".join(f"{v:>14.2f}" for v in result.values()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+채팅 NDJSON 스트림 직렬화 벤치마크 (convert_serializable + json.dumps vs orjson, 이벤트 필터 유무)
+
+모의 모델로 /chatbot/ 그래프를 실행해 astream_events(v2) 이벤트를 모은 뒤, 같은 이벤트를 각 방식으로
+직렬화해 토큰(on_chat_model_stream)당 직렬화 시간과 전송 바이트 수를 비교합니다.
+대화가 길어질수록 chain start/end 이벤트에 담기는 상태(메시지 목록)가 커지므로 --turns로 조절합니다.
+
+    python benchmarks/bench_event_stream.py
+    python benchmarks/bench_event_stream.py --turns 20 --repeat 50
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from typing import Any, Callable, Dict, List
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langgraph.checkpoint.memory import InMemorySaver
+
+from mllm_server.routers.chatbot import router
+from mllm_server.types import EventFilter
+from mllm_server.utils import convert_serializable, encode_event
+
+QUESTION = "Is my driving safe right now?"
+ANSWER = "You are keeping a steady speed and the steering is calm, so your driving looks safe. " * 2
+
+
+async def collect_events(turns: int) -> List[Dict[str, Any]]:
+    # 마지막 턴의 이벤트만 반환 (앞선 턴은 대화 기록을 쌓는 용도)
+    graph = router.graph_builder.compile(checkpointer=InMemorySaver())
+    config = {"configurable": {"thread_id": "bench"}}
+    events = []
+    for _ in range(turns):
+        events = [event async for event in graph.astream_events({"messages": [("user", QUESTION)]}, config, version="v2")]
+    return events
+
+
+def encode_json(event: Dict[str, Any]) -> bytes:
+    # 변경 전 generate_event_response()
+    event = dict(event)
+    event["data"] = convert_serializable(event["data"])
+    return (json.dumps(event) + "\n").encode()
+
+
+def measure(events: List[Dict[str, Any]], encode: Callable, event_filter: EventFilter, repeat: int) -> Dict[str, float]:
+    best = float("inf")
+    size = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        size = 0
+        for event in events:
+            if event_filter is None or event_filter.matches(event):
+                size += len(encode(event))
+        best = min(best, time.perf_counter() - start)
+    return {"seconds": best, "bytes": size}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=5, help="측정 전에 쌓을 대화 턴 수 (측정 턴 포함)")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    router.llm_llama = FakeListChatModel(responses=[ANSWER])
+    events = asyncio.run(collect_events(args.turns))
+    tokens = sum(event["event"] == "on_chat_model_stream" for event in events)
+    print(f"{len(events)} events, {tokens} tokens (turn {args.turns})")
+
+    stream_only = EventFilter(events=["on_chat_model_stream"])
+    cases = [
+        ("json, all events", encode_json, None),
+        ("orjson, all events", encode_event, None),
+        ("json, stream only", encode_json, stream_only),
+        ("orjson, stream only", encode_event, stream_only),
+    ]
+    header = ("case", "us/token", "bytes/token", "total KB")
+    print(f"{header[0]:<22}" + "".join(f"{h:>14}" for h in header[1:]))
+    for name, encode, event_filter in cases:
+        result = measure(events, encode, event_filter, args.repeat)
+        print(
+            f"{name:<22}{result['seconds'] * 1e6 / tokens:>14.2f}"
+            f"{result['bytes'] / tokens:>14.1f}{result['bytes'] / 1024:>14.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
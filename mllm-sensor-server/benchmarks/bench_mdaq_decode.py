@@ -0,0 +1,98 @@
+"""
+MDAQ 프레임 디코더 마이크로 벤치마크
+
+  - 패킷 단위: struct.unpack(형식 문자열) vs 미리 컴파일한 struct.Struct vs 링 버퍼 슬롯 복사
+  - 기록 전체: 레코드별 struct 루프 vs decode_capture() (벡터화)
+
+    python benchmarks/bench_mdaq_decode.py --frames 100000
+"""
+
+import argparse
+import os
+import struct
+import tempfile
+import time
+
+import numpy as np
+
+from mdaq_watcher.frames import MDAQ_FRAME, MdaqFrameRing, decode_capture, decode_frames
+from mllm_server.telemetry_log import SOURCE_MDAQ, SOURCE_SCANER, TelemetryLog, TelemetryRecorder
+
+
+def make_frames(count: int, seed: int) -> bytes:
+    rng = np.random.default_rng(seed)
+    frames = np.zeros(count, dtype=decode_frames(b"").dtype)
+    frames["start"] = 9
+    frames["floats"] = rng.normal(size=(count, 9))
+    frames["ints"] = rng.integers(0, 2, size=(count, 51))
+    return frames.tobytes()
+
+
+def per_packet(packets) -> None:
+    start = time.perf_counter()
+    for data in packets:
+        struct.unpack("<i9f52i", data)
+    format_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for data in packets:
+        MDAQ_FRAME.unpack(data)
+    compiled_time = time.perf_counter() - start
+
+    ring = MdaqFrameRing()
+    start = time.perf_counter()
+    for data in packets:
+        ring.append(data)
+    ring_time = time.perf_counter() - start
+
+    n = len(packets)
+    print(f"struct.unpack(fmt)  : {format_time / n * 1e6:8.3f} us/frame")
+    print(f"Struct.unpack       : {compiled_time / n * 1e6:8.3f} us/frame")
+    print(f"ring slot copy      : {ring_time / n * 1e6:8.3f} us/frame")
+
+
+def whole_capture(packets, path: str) -> None:
+    with TelemetryRecorder(path) as recorder:
+        for i, data in enumerate(packets):
+            recorder.append(data, SOURCE_MDAQ, i)
+            # SCANeR 레코드가 섞여 있는 실제 로그처럼 구성
+            recorder.append(b"\0" * 32, SOURCE_SCANER, i)
+
+    with TelemetryLog(path) as log:
+        start = time.perf_counter()
+        floats = [MDAQ_FRAME.unpack(record.payload)[1:10] for record in log.records(source=SOURCE_MDAQ)]
+        loop_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        capture = decode_capture(log)
+        vector_time = time.perf_counter() - start
+
+        assert len(capture.frames) == len(packets)
+        assert np.array_equal(capture.frames["floats"], np.array(floats, dtype=np.float32))
+        assert np.array_equal(capture.timestamps, np.arange(len(packets)))
+        del capture
+
+    print(f"capture struct loop : {loop_time * 1e3:8.1f} ms")
+    print(f"decode_capture      : {vector_time * 1e3:8.1f} ms ({loop_time / vector_time:.1f}x)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--frames", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    buffer = make_frames(args.frames, args.seed)
+    frames = decode_frames(buffer)
+    size = MDAQ_FRAME.size
+    packets = [buffer[i : i + size] for i in range(0, len(buffer), size)]
+    assert MDAQ_FRAME.unpack(packets[-1])[1:10] == tuple(frames["floats"][-1].tolist())
+
+    print(f"frames={args.frames} ({size} bytes/frame)")
+    per_packet(packets)
+    with tempfile.TemporaryDirectory() as tmp:
+        whole_capture(packets, os.path.join(tmp, "mdaq.tlog"))
+
+
+if __name__ == "__main__":
+    main()
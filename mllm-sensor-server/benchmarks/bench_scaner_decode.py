@@ -0,0 +1,105 @@
+"""
+SCANeR 데이터그램 디코더 마이크로 벤치마크 (struct 루프 vs NumPy 뷰)
+
+    python benchmarks/bench_scaner_decode.py --channels 300 --packets 20000
+    python benchmarks/bench_scaner_decode.py --log scaner.tlog  # 기록한 패킷 사용
+"""
+
+import argparse
+import time
+from typing import List
+
+import numpy as np
+
+from mllm_server.scaner_udp import (
+    SPEED_CHANNEL_ID,
+    STEERING_CHANNEL_ID,
+    ScanerDatagramDecoder,
+    decode_scaner_datagram,
+)
+from mllm_server.telemetry_log import SOURCE_SCANER, TelemetryLog
+
+
+def make_packets(channel_count: int, packet_count: int, inf_ratio: float, seed: int) -> List[bytes]:
+    rng = np.random.default_rng(seed)
+    others = rng.choice(
+        [i for i in range(channel_count * 2) if i not in (STEERING_CHANNEL_ID, SPEED_CHANNEL_ID)],
+        size=channel_count - 2,
+        replace=False,
+    )
+    ids = np.concatenate([others, [STEERING_CHANNEL_ID, SPEED_CHANNEL_ID]]).astype(np.float64)
+    rng.shuffle(ids)
+    # 구독 채널은 항상 유효한 ID로 유지
+    sentinel = (rng.random(ids.size) < inf_ratio) & ~np.isin(ids, [STEERING_CHANNEL_ID, SPEED_CHANNEL_ID])
+    ids[sentinel] = np.inf
+
+    packets = []
+    for _ in range(packet_count):
+        pairs = np.empty((ids.size, 2), dtype="<f8")
+        pairs[:, 0] = ids
+        pairs[:, 1] = rng.normal(size=ids.size)
+        packets.append(pairs.tobytes())
+    return packets
+
+
+def load_packets(path: str, packet_count: int) -> List[bytes]:
+    with TelemetryLog(path) as log:
+        packets = [bytes(record.payload) for record in log.records(source=SOURCE_SCANER)]
+    return packets[:packet_count]
+
+
+def bench_struct(packets: List[bytes]) -> float:
+    start = time.perf_counter()
+    for data in packets:
+        results = decode_scaner_datagram(data)
+        if STEERING_CHANNEL_ID in results and SPEED_CHANNEL_ID in results:
+            results[STEERING_CHANNEL_ID], results[SPEED_CHANNEL_ID]
+    return time.perf_counter() - start
+
+
+def bench_numpy(packets: List[bytes]) -> float:
+    decoder = ScanerDatagramDecoder([STEERING_CHANNEL_ID, SPEED_CHANNEL_ID])
+    start = time.perf_counter()
+    for data in packets:
+        values, present = decoder.decode(data)
+        if present.all():
+            values[0], values[1]
+    return time.perf_counter() - start
+
+
+def verify(packets: List[bytes]) -> None:
+    decoder = ScanerDatagramDecoder([STEERING_CHANNEL_ID, SPEED_CHANNEL_ID])
+    for data in packets[:100]:
+        expected = decode_scaner_datagram(data[: len(data) // 8 * 8])
+        values, present = decoder.decode(data)
+        for slot, channel_id in enumerate((STEERING_CHANNEL_ID, SPEED_CHANNEL_ID)):
+            assert present[slot] == (channel_id in expected)
+            assert not present[slot] or values[slot] == expected[channel_id]
+        assert decoder.decode_all(data) == expected
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--channels", type=int, default=300)
+    parser.add_argument("--packets", type=int, default=20000)
+    parser.add_argument("--inf-ratio", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--log", help="TelemetryRecorder로 기록한 로그 (지정하면 합성 패킷 대신 사용)")
+    args = parser.parse_args()
+
+    if args.log:
+        packets = load_packets(args.log, args.packets)
+    else:
+        packets = make_packets(args.channels, args.packets, args.inf_ratio, args.seed)
+    verify(packets)
+
+    struct_time = bench_struct(packets)
+    numpy_time = bench_numpy(packets)
+    print(f"packets={len(packets)} ({len(packets[0])} bytes/packet, source={args.log or 'synthetic'})")
+    print(f"struct loop : {struct_time / len(packets) * 1e6:8.2f} us/packet")
+    print(f"numpy view  : {numpy_time / len(packets) * 1e6:8.2f} us/packet")
+    print(f"speedup     : {struct_time / numpy_time:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+SCANeR 수신기 벤치마크 (loopback)
+
+ScanerEmulator를 별도 프로세스로 실행해 수신 구현별로 다음을 측정합니다.
+  - 지속 처리량 (packets/s), 드롭률 (패킷 번호 기준), 커널 드롭
+  - 패킷당 디코딩 시간 p50/p99, 송신 ~ 수신 지연 p50/p99
+  - 종료 지연 (deactivate/stop)
+수신한 패킷 번호와 값도 함께 검증합니다.
+
+    python benchmarks/bench_scaner_ingest.py --rate 5000 --duration 3 --channels 300
+    python benchmarks/bench_scaner_ingest.py --rate 2000 --burst 50 --inf-ratio 0.1
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import time
+from typing import Dict, List
+
+import numpy as np
+
+from mllm_server.channels import DEFAULT_CHANNELS, ChannelSpec
+from mllm_server.scaner_emulator import SEND_TIME_CHANNEL_ID, SEQUENCE_CHANNEL_ID, ScanerEmulator
+from mllm_server.scaner_udp import AsyncScanerFilterServer, ScanerFilterServer
+
+HOST = "127.0.0.1"
+IMPLEMENTATIONS = ["thread-struct", "thread-numpy", "asyncio"]
+
+
+def emit(port: int, args: argparse.Namespace, sent: "multiprocessing.Value") -> None:
+    emulator = ScanerEmulator(
+        (HOST, port),
+        channel_count=args.channels,
+        rate_hz=args.rate,
+        burst=args.burst,
+        inf_ratio=args.inf_ratio,
+    )
+    sent.value = emulator.run(duration=args.duration)
+    emulator.close()
+
+
+def make_server(name: str, port: int, args: argparse.Namespace) -> ScanerFilterServer:
+    channels = DEFAULT_CHANNELS + [
+        ChannelSpec(SEQUENCE_CHANNEL_ID, "sequence"),
+        ChannelSpec(SEND_TIME_CHANNEL_ID, "send_time"),
+    ]
+    capacity = int(args.rate * args.duration * 1.2) + 1024
+    kwargs = dict(timeout=args.timeout, history_capacity=capacity, channels=channels)
+    if name == "thread-struct":
+        # 기존 구현과 같은 방식 (패킷마다 recvfrom + struct 루프)
+        return ScanerFilterServer(HOST, port, decoder="struct", batch=False, **kwargs)
+    if name == "thread-numpy":
+        return ScanerFilterServer(HOST, port, decoder="numpy", batch=True, **kwargs)
+    return AsyncScanerFilterServer(HOST, port, decoder="numpy", batch=True, **kwargs)
+
+
+def summarize(server: ScanerFilterServer, sent: int, elapsed: float, shutdown: float) -> Dict[str, float]:
+    sequence = server.channels["sequence"].history.snapshot()
+    send_time = server.channels["send_time"].history.snapshot()
+    speed = server.channels["speed"].history.snapshot()
+
+    # 검증: 패킷 번호는 증가해야 하고, 값은 에뮬레이터가 보낸 범위 안에 있어야 함
+    assert np.all(np.diff(sequence.values) > 0), "sequence numbers are out of order"
+    assert np.all((speed.values >= 30.0) & (speed.values <= 70.0)), "unexpected speed values"
+    assert np.all(sequence.values < sent), "unexpected sequence numbers"
+
+    latency_ms = (send_time.timestamps / 1e9 - send_time.values) * 1e3
+    ingest = server.get_ingest_stats()
+    return {
+        "sent": sent,
+        "received": ingest["packets_received"],
+        "pkt/s": ingest["packets_received"] / elapsed,
+        "drop %": (1 - len(np.unique(sequence.values)) / sent) * 100 if sent else 0.0,
+        "kernel drops": ingest["kernel_drops"] if ingest["kernel_drops"] is not None else float("nan"),
+        "decode p50 us": ingest.get("decode_time_us_p50", float("nan")),
+        "decode p99 us": ingest.get("decode_time_us_p99", float("nan")),
+        "latency p50 ms": float(np.percentile(latency_ms, 50)) if latency_ms.size else float("nan"),
+        "latency p99 ms": float(np.percentile(latency_ms, 99)) if latency_ms.size else float("nan"),
+        "shutdown ms": shutdown * 1e3,
+    }
+
+
+def run_emitter(port: int, args: argparse.Namespace) -> int:
+    sent = multiprocessing.Value("q", 0)
+    emitter = multiprocessing.Process(target=emit, args=(port, args, sent))
+    emitter.start()
+    emitter.join()
+    return sent.value
+
+
+def bench_thread(name: str, port: int, args: argparse.Namespace) -> Dict[str, float]:
+    server = make_server(name, port, args)
+    server.activate()
+    sent = run_emitter(port, args)
+    time.sleep(args.settle)
+
+    start = time.perf_counter()
+    server.deactivate()
+    return summarize(server, sent, args.duration, time.perf_counter() - start)
+
+
+async def bench_asyncio(name: str, port: int, args: argparse.Namespace) -> Dict[str, float]:
+    server = make_server(name, port, args)
+    await server.start()
+    sent = await asyncio.to_thread(run_emitter, port, args)
+    await asyncio.sleep(args.settle)
+
+    start = time.perf_counter()
+    await server.stop()
+    return summarize(server, sent, args.duration, time.perf_counter() - start)
+
+
+def print_table(results: Dict[str, Dict[str, float]]) -> None:
+    columns: List[str] = list(next(iter(results.values())).keys())
+    print(f"{'implementation':15s}" + "".join(f"{c:>15s}" for c in columns))
+    for name, result in results.items():
+        print(f"{name:15s}" + "".join(f"{result[c]:15.2f}" for c in columns))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=46112)
+    parser.add_argument("--channels", type=int, default=100)
+    parser.add_argument("--rate", type=float, default=2000.0, help="packets/s")
+    parser.add_argument("--burst", type=int, default=1)
+    parser.add_argument("--inf-ratio", type=float, default=0.05)
+    parser.add_argument("--duration", type=float, default=3.0)
+    parser.add_argument("--settle", type=float, default=0.2, help="송신 종료 후 남은 패킷 처리 대기 (초)")
+    parser.add_argument("--timeout", type=float, default=5, help="threading 수신기의 소켓 타임아웃")
+    parser.add_argument("--impl", nargs="+", choices=IMPLEMENTATIONS, default=IMPLEMENTATIONS)
+    args = parser.parse_args()
+
+    print(
+        f"rate={args.rate} Hz, burst={args.burst}, channels={args.channels}, "
+        f"inf_ratio={args.inf_ratio}, duration={args.duration} s"
+    )
+    results = {}
+    for offset, name in enumerate(args.impl):
+        port = args.port + offset
+        if name == "asyncio":
+            results[name] = asyncio.run(bench_asyncio(name, port, args))
+        else:
+            results[name] = bench_thread(name, port, args)
+    print_table(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+센서 컨텍스트 프롬프트 벤치마크 (원본 20개 값 나열 vs 특징 요약)
+
+합성 주행 데이터(급감속, 급조향 포함)를 버스에 넣고 두 방식의 프롬프트 길이/추정 토큰 수와
+요약 갱신/인코딩 비용을 비교합니다. --ollama를 주면 실제 모델로 프롬프트 토큰 수(prompt_eval_count)와
+첫 토큰까지의 시간(TTFT)을 측정합니다.
+
+    python benchmarks/bench_sensor_prompt.py
+    python benchmarks/bench_sensor_prompt.py --ollama llama3.1 --runs 5
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from mllm_server.scaner_udp import SENSOR_DATA_LENGTH
+from mllm_server.sensor_bus import SensorBus
+from mllm_server.sensor_summary import SensorSummarizer
+from mllm_server.utils import estimate_tokens
+
+QUESTION = "Is my driving safe right now?"
+RATE_HZ = 100
+
+
+def make_drive(bus: SensorBus, seconds: float, start_ns: int) -> int:
+    n = int(seconds * RATE_HZ)
+    timestamps = start_ns + (np.arange(n) * 1e9 / RATE_HZ).astype(np.int64)
+    t = np.arange(n) / RATE_HZ
+    rng = np.random.default_rng(0)
+
+    speed = 60 + 5 * np.sin(2 * np.pi * t / 30) + rng.normal(0, 0.05, n)
+    brake = (t > seconds - 8) & (t < seconds - 6)  # 2초 동안 25 km/h/s 감속
+    speed -= np.cumsum(brake) * 25 / RATE_HZ
+    steering = 10 * np.sin(2 * np.pi * t / 20) + rng.normal(0, 0.1, n)
+    turn = (t > seconds - 3) & (t < seconds - 2.5)  # 0.5초 동안 60도 꺾음
+    steering += np.cumsum(turn) * 120 / RATE_HZ
+
+    bus.register("steering", "scaner", label="Steering Angle", unit="deg").extend(steering, timestamps)
+    bus.register("speed", "scaner", label="Speed", unit="km/h").extend(speed, timestamps)
+    return int(timestamps[-1])
+
+
+def raw_context(bus: SensorBus) -> Dict[str, str]:
+    # 기존 node_vehicle_context_fetch와 같은 형식 (채널별 최근 20개 값을 str(list))
+    return {
+        channel.display_name: str(channel.ring.window(SENSOR_DATA_LENGTH).values.tolist())
+        for channel in bus.channels()
+    }
+
+
+def build_prompt(context: Dict[str, str]) -> str:
+    # node_llama_chatbot과 같은 형식
+    prompt = QUESTION + "-" * 16 + "\n" + "Current User's Vehicle State:\n"
+    for key, value in context.items():
+        prompt += f"{key}: {value}\n"
+    return prompt
+
+
+async def measure_ollama(model: str, prompt: str, runs: int) -> Tuple[float, int]:
+    from langchain_ollama import ChatOllama
+
+    llm = ChatOllama(model=model, num_predict=16)
+    ttfts: List[float] = []
+    prompt_tokens = 0
+    for _ in range(runs):
+        start = time.perf_counter()
+        first = None
+        async for chunk in llm.astream(prompt):
+            if first is None and chunk.content:
+                first = time.perf_counter() - start
+            metadata = getattr(chunk, "response_metadata", None) or {}
+            prompt_tokens = metadata.get("prompt_eval_count", prompt_tokens)
+        ttfts.append(first or 0.0)
+    return statistics.median(ttfts), prompt_tokens
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=float, default=60.0, help="합성 주행 길이")
+    parser.add_argument("--budget", type=int, default=48, help="요약 토큰 예산")
+    parser.add_argument("--ollama", help="TTFT를 측정할 Ollama 모델 (예: llama3.1)")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    bus = SensorBus()
+    summarizer = SensorSummarizer(bus)
+    now_ns = make_drive(bus, args.seconds, time.monotonic_ns() - int(args.seconds * 1e9))
+
+    start = time.perf_counter()
+    summarizer.update(now_ns)
+    update_ms = (time.perf_counter() - start) * 1e3
+
+    repeats = 1000
+    start = time.perf_counter()
+    for _ in range(repeats):
+        summary = summarizer.encode(args.budget, now_ns)
+    encode_us = (time.perf_counter() - start) / repeats * 1e6
+
+    prompts = {"raw lists": build_prompt(raw_context(bus)), "summary": build_prompt(summary)}
+    print(f"update ({int(args.seconds * RATE_HZ)} samples/channel): {update_ms:.2f} ms, encode: {encode_us:.1f} us")
+    for name, prompt in prompts.items():
+        print(f"--- {name}: {len(prompt)} chars, ~{estimate_tokens(prompt)} tokens")
+        print(prompt)
+
+    raw_tokens, summary_tokens = (estimate_tokens(p) for p in prompts.values())
+    print(f"estimated prompt tokens: {raw_tokens} -> {summary_tokens} ({1 - summary_tokens / raw_tokens:.0%} fewer)")
+    assert "hard_brake" in summary.get("Events", ""), "hard brake was not detected"
+    assert "sharp_turn" in summary.get("Events", ""), "sharp turn was not detected"
+
+    if args.ollama:
+        for name, prompt in prompts.items():
+            ttft, tokens = asyncio.run(measure_ollama(args.ollama, prompt, args.runs))
+            print(f"{name:10s}: prompt_eval_count={tokens}, TTFT p50={ttft * 1e3:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
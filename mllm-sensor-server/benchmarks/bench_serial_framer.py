@@ -0,0 +1,129 @@
+"""
+MDAQ 시리얼 패킷 리더 벤치마크 (pty loopback, 장치 불필요)
+
+pty의 master 쪽에서 패킷을 쓰고 slave 쪽을 SerialPacketReader로 읽어 패킷 수/값을 검증합니다.
+기존 방식(1바이트씩 읽기 + 패킷마다 struct/np.frombuffer)과 처리 시간을 비교합니다.
+
+    python benchmarks/bench_serial_framer.py --packets 200000 --noise 0.01
+"""
+
+import argparse
+import os
+import struct
+import threading
+import time
+import tty
+
+import numpy as np
+
+from mdaq_watcher.serial_framer import PACKET_SIZE, START_BYTE, SerialFramer, SerialPacketReader
+
+
+def make_stream(count: int, noise: float, seed: int):
+    rng = np.random.default_rng(seed)
+    packets = np.empty((count, PACKET_SIZE), dtype=np.uint8)
+    packets[:, 0] = START_BYTE
+    packets[:, 1] = rng.choice([0x42, 0x45, 0x53], size=count)
+    packets[:, 2] = rng.integers(0, 8, size=count)
+    packets[:, 3:5] = rng.integers(0, 256, size=(count, 2))
+
+    # 일부 패킷 앞에 쓰레기 바이트(0x23 제외)를 끼워 넣어 재동기화를 확인
+    chunks = []
+    noisy = rng.random(count) < noise
+    for i in range(count):
+        if noisy[i]:
+            chunks.append(bytes([0x00, 0x7F]))
+        chunks.append(packets[i].tobytes())
+    return b"".join(chunks), packets
+
+
+def legacy_parse(stream: bytes):
+    # legacy/main.py와 같은 방식 (1바이트씩 추가, buffer[1:]로 재동기화, 패킷마다 디코딩)
+    buffer = bytearray()
+    results = []
+    for i in range(len(stream)):
+        buffer += stream[i : i + 1]
+        if buffer[0] != START_BYTE:
+            buffer = buffer[1:]
+            continue
+        if len(buffer) >= PACKET_SIZE:
+            packet = buffer[:PACKET_SIZE]
+            buffer = buffer[PACKET_SIZE:]
+            _, msg_id, sub_id, high, low = packet
+            data_int = struct.unpack(">h", bytes([high, low]))[0]
+            data_fp16 = np.frombuffer(bytes([high, low]), dtype=">f2")[0]
+            results.append((msg_id, sub_id, data_int, data_fp16))
+    return results
+
+
+def bench_framer(stream: bytes, chunk_size: int):
+    framer = SerialFramer()
+    start = time.perf_counter()
+    outputs = [framer.feed(stream[i : i + chunk_size]) for i in range(0, len(stream), chunk_size)]
+    data_int = np.concatenate([packets.data_int for packets in outputs])
+    return time.perf_counter() - start, data_int
+
+
+def bench_pty(stream: bytes, expected: np.ndarray) -> None:
+    master, slave = os.openpty()
+    tty.setraw(slave)
+    reader = SerialPacketReader(os.ttyname(slave), timeout=0.5)
+
+    def write() -> None:
+        view = memoryview(stream)
+        while view:
+            written = os.write(master, view[:4096])
+            view = view[written:]
+
+    writer = threading.Thread(target=write)
+    start = time.perf_counter()
+    writer.start()
+    received = []
+    total = 0
+    while total < len(expected):
+        packets = reader.read()
+        if not len(packets):
+            break
+        received.append(packets.data_int)
+        total += len(packets)
+    elapsed = time.perf_counter() - start
+    writer.join()
+    reader.close()
+    os.close(master)
+    os.close(slave)
+
+    data_int = np.concatenate(received)
+    assert np.array_equal(data_int, expected[:, 3:5].copy().view(">i2").reshape(-1)), "pty packets differ"
+    print(
+        f"pty loopback       : {total} packets in {reader.reads} reads, {elapsed * 1e3:.1f} ms "
+        f"({total / elapsed:,.0f} packets/s, 115200 baud = {115200 / 10 / PACKET_SIZE:,.0f} packets/s)"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--packets", type=int, default=200000)
+    parser.add_argument("--noise", type=float, default=0.01, help="쓰레기 바이트를 끼워 넣을 패킷 비율")
+    parser.add_argument("--chunk", type=int, default=1024, help="SerialFramer에 한 번에 넣는 바이트 수")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    stream, packets = make_stream(args.packets, args.noise, args.seed)
+    expected_int = packets[:, 3:5].copy().view(">i2").reshape(-1)
+
+    start = time.perf_counter()
+    legacy = legacy_parse(stream)
+    legacy_time = time.perf_counter() - start
+    assert [r[2] for r in legacy] == expected_int.tolist()
+
+    framer_time, data_int = bench_framer(stream, args.chunk)
+    assert np.array_equal(data_int, expected_int)
+
+    print(f"packets={args.packets}, bytes={len(stream)}, noise={args.noise}")
+    print(f"legacy byte loop   : {legacy_time / args.packets * 1e6:8.2f} us/packet")
+    print(f"SerialFramer       : {framer_time / args.packets * 1e6:8.2f} us/packet ({legacy_time / framer_time:.0f}x)")
+    bench_pty(stream, packets)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+세션 목록 조회 벤치마크 (체크포인트 전체 스캔 vs 세션 인덱스 페이지)
+
+--sessions개 세션에 세션마다 --checkpoints개의 체크포인트를 쓴 뒤
+  - scan: 기존 /sessions 방식. alist(None)로 모든 체크포인트를 읽어 thread_id 집합을 만듦
+  - page: session_index에서 최근 활동 순으로 --limit개 (첫 페이지)
+  - page N: cursor를 따라 --pages번째 페이지까지 이동했을 때 한 페이지의 평균 시간
+을 비교합니다.
+
+    python benchmarks/bench_session_listing.py
+    python benchmarks/bench_session_listing.py --sessions 20000 --checkpoints 10
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from typing import Dict
+
+from langgraph.checkpoint.base import empty_checkpoint
+from langgraph.checkpoint.base.id import uuid6
+
+from mllm_server.checkpoint_store import PooledSqliteSaver, open_checkpointer
+
+
+async def populate(saver: PooledSqliteSaver, sessions: int, checkpoints: int) -> None:
+    for i in range(sessions):
+        parent = None
+        for step in range(checkpoints):
+            checkpoint = empty_checkpoint()
+            checkpoint["id"] = str(uuid6())
+            checkpoint["channel_values"] = {"messages": [f"message {n}" for n in range(step + 1)]}
+            config = {"configurable": {"thread_id": f"session-{i}", "checkpoint_ns": "", "checkpoint_id": parent}}
+            source = "input" if step % 5 == 0 else "loop"
+            result = await saver.aput(config, checkpoint, {"source": source, "step": step}, {})
+            parent = result["configurable"]["checkpoint_id"]
+    await saver.flush_sessions()
+
+
+async def timed(coro_factory, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await coro_factory()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1e3
+
+
+async def run(args: argparse.Namespace) -> Dict[str, float]:
+    path = os.path.join(args.dir or tempfile.mkdtemp(prefix="bench_sessions-"), "checkpoint.sqlite")
+    # keep=0: 정리하지 않은 DB (모든 체크포인트가 남아 있음)
+    async with open_checkpointer(path, keep=0) as saver:
+        start = time.perf_counter()
+        await populate(saver, args.sessions, args.checkpoints)
+        print(f"populated {args.sessions} sessions x {args.checkpoints} checkpoints in {time.perf_counter() - start:.1f} s")
+
+        async def scan() -> None:
+            sessions = set()
+            async for item in saver.alist(None):
+                sessions.add(item.config["configurable"]["thread_id"])
+
+        async def first_page() -> None:
+            await saver.list_sessions(args.limit)
+
+        cursors = [None]
+        for _ in range(args.pages - 1):
+            _, cursor = await saver.list_sessions(args.limit, cursors[-1])
+            cursors.append(cursor)
+
+        async def deep_page() -> None:
+            await saver.list_sessions(args.limit, cursors[-1])
+
+        return {
+            "scan": await timed(scan, args.repeat),
+            "page": await timed(first_page, args.repeat * 10),
+            f"page {args.pages}": await timed(deep_page, args.repeat * 10),
+        }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=5000)
+    parser.add_argument("--checkpoints", type=int, default=20, help="세션당 체크포인트 수")
+    parser.add_argument("--limit", type=int, default=50, help="페이지 크기")
+    parser.add_argument("--pages", type=int, default=50, help="cursor로 이동할 페이지 수")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--dir", default=None, help="DB를 만들 디렉터리 (기본: 임시 디렉터리)")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args))
+    print(f"{'query':<10}{'ms':>12}")
+    for name, ms in result.items():
+        print(f"{name:<10}{ms:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
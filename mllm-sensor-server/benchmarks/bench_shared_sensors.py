@@ -0,0 +1,160 @@
+"""
+여러 프로세스에서의 센서 창 조회 벤치마크 (공유 메모리 직접 조회 vs 수신 프로세스에 IPC 요청)
+
+수신 프로세스 하나가 --channels개 채널에 --rate Hz로 샘플을 기록하는 동안 --readers개 reader 프로세스가
+--duration초 동안 "모든 채널의 최근 --window초 평균"을 반복해서 계산합니다.
+  - shm: SharedSensorStore에 연결해 링 버퍼를 복사 없이 읽고 is_intact()로 확인 (API 워커의 SENSOR_SHM 모드)
+  - pipe: 요청마다 multiprocessing Pipe로 수신 프로세스에 창을 요청하고 복사본을 받음 (IPC 왕복)
+reader 전체의 초당 조회 수와 조회 지연(p50/p99)을 출력합니다. 멀티 코어에서의 확장은 코어 수에 따라 다르므로
+--readers를 코어 수까지 늘려 비교하세요.
+
+    python benchmarks/bench_shared_sensors.py
+    python benchmarks/bench_shared_sensors.py --readers 1 2 4 --channels 64 --window 30
+"""
+
+import argparse
+import multiprocessing as mp
+import os
+import time
+from multiprocessing.connection import Connection, wait
+from typing import Dict, List
+
+import numpy as np
+
+from mllm_server.channels import ChannelSpec
+from mllm_server.shared_sensors import SharedSensorStore
+from mllm_server.timeseries import TimeSeriesRing, capacity_for
+
+SHM_NAME = f"bench_sensors_{os.getpid()}"
+
+
+def make_specs(channels: int) -> List[ChannelSpec]:
+    return [ChannelSpec(channel_id=i, name=f"ch{i}") for i in range(channels)]
+
+
+def write_samples(rings: Dict[str, TimeSeriesRing], rate: float, tick: int) -> None:
+    now = time.monotonic_ns()
+    for i, ring in enumerate(rings.values()):
+        ring.append(np.sin(tick / rate + i), now)
+
+
+def shm_writer(args: argparse.Namespace, ready: mp.Event, stop: mp.Event) -> None:
+    store = SharedSensorStore.create(SHM_NAME, make_specs(args.channels), capacity_for(minutes=10, rate_hz=args.rate))
+    tick = 0
+    # 조회 창이 가득 차도록 미리 기록
+    for tick in range(int(args.window * args.rate)):
+        write_samples(store.rings, args.rate, tick)
+    ready.set()
+    next_time = time.perf_counter()
+    while not stop.is_set():
+        tick += 1
+        write_samples(store.rings, args.rate, tick)
+        next_time += 1 / args.rate
+        time.sleep(max(0.0, next_time - time.perf_counter()))
+    store.close()
+    store.unlink()
+
+
+def pipe_writer(args: argparse.Namespace, ready: mp.Event, stop: mp.Event, conns: List[Connection]) -> None:
+    capacity = capacity_for(minutes=10, rate_hz=args.rate)
+    rings = {spec.name: TimeSeriesRing(capacity) for spec in make_specs(args.channels)}
+    tick = 0
+    for tick in range(int(args.window * args.rate)):
+        write_samples(rings, args.rate, tick)
+    ready.set()
+    next_time = time.perf_counter()
+    while not stop.is_set():
+        # 다음 기록 시각까지는 요청에 응답
+        for conn in wait(conns, timeout=max(0.0, next_time - time.perf_counter())):
+            try:
+                seconds = conn.recv()
+            except EOFError:
+                conns.remove(conn)
+                continue
+            conn.send({name: ring.snapshot_seconds(seconds) for name, ring in rings.items()})
+        if time.perf_counter() >= next_time:
+            tick += 1
+            write_samples(rings, args.rate, tick)
+            next_time += 1 / args.rate
+
+
+def shm_reader(args: argparse.Namespace, start: mp.Event, results: mp.Queue) -> None:
+    store = SharedSensorStore.attach(SHM_NAME)
+    rings = list(store.rings.values())
+    latencies = []
+    start.wait()
+    deadline = time.perf_counter() + args.duration
+    while time.perf_counter() < deadline:
+        t0 = time.perf_counter_ns()
+        for ring in rings:
+            while True:
+                window = ring.window_seconds(args.window)
+                window.values.mean()  # 창을 사용하는 비용 (pipe_reader와 같은 계산, 결과는 버림)
+                if ring.is_intact(window):
+                    break
+        latencies.append(time.perf_counter_ns() - t0)
+    del rings
+    store.close()
+    results.put(latencies)
+
+
+def pipe_reader(args: argparse.Namespace, start: mp.Event, results: mp.Queue, conn: Connection) -> None:
+    latencies = []
+    start.wait()
+    deadline = time.perf_counter() + args.duration
+    while time.perf_counter() < deadline:
+        t0 = time.perf_counter_ns()
+        conn.send(args.window)
+        for window in conn.recv().values():
+            window.values.mean()
+        latencies.append(time.perf_counter_ns() - t0)
+    conn.close()
+    results.put(latencies)
+
+
+def run(mode: str, readers: int, args: argparse.Namespace) -> Dict[str, float]:
+    ready, start, stop = mp.Event(), mp.Event(), mp.Event()
+    results = mp.Queue()
+    if mode == "shm":
+        writer = mp.Process(target=shm_writer, args=(args, ready, stop))
+        writer.start()
+        ready.wait()
+        procs = [mp.Process(target=shm_reader, args=(args, start, results)) for _ in range(readers)]
+    else:
+        pipes = [mp.Pipe() for _ in range(readers)]
+        writer = mp.Process(target=pipe_writer, args=(args, ready, stop, [a for a, _ in pipes]))
+        writer.start()
+        ready.wait()
+        procs = [mp.Process(target=pipe_reader, args=(args, start, results, b)) for _, b in pipes]
+    for proc in procs:
+        proc.start()
+    time.sleep(0.5)  # reader 프로세스 시작/연결 대기
+    start.set()
+    latencies = np.concatenate([np.asarray(results.get(), dtype=np.float64) for _ in procs]) / 1e3
+    for proc in procs:
+        proc.join()
+    stop.set()
+    writer.join()
+    p50, p99 = np.percentile(latencies, [50, 99])
+    return {"reads/s": len(latencies) / args.duration, "p50 us": p50, "p99 us": p99}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--readers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--channels", type=int, default=16)
+    parser.add_argument("--rate", type=float, default=100.0, help="채널당 기록 주기 (Hz)")
+    parser.add_argument("--window", type=float, default=10.0, help="조회할 최근 구간 (초)")
+    parser.add_argument("--duration", type=float, default=3.0)
+    args = parser.parse_args()
+
+    print(f"cpus={os.cpu_count()} channels={args.channels} window={args.window}s ({int(args.window * args.rate)} samples)")
+    print(f"{'mode':<8}{'readers':>8}{'reads/s':>12}{'p50 us':>12}{'p99 us':>12}")
+    for readers in args.readers:
+        for mode in ("shm", "pipe"):
+            result = run(mode, readers, args)
+            print(f"{mode:<8}{readers:>8}" + "".join(f"{value:>12.1f}" for value in result.values()))
+
+
+if __name__ == "__main__":
+    main()
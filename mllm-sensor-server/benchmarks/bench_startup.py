@@ -0,0 +1,92 @@
+"""
+서버 시작 시간 벤치마크
+
+  - import 시간: 새 인터프리터에서 `import mllm_server.server`
+  - 첫 200 응답까지의 시간: uvicorn 프로세스 시작 ~ GET / 가 200을 반환할 때까지
+  - /chatbot/state-graph: 첫 요청(렌더링 또는 디스크 캐시), 두 번째 요청, If-None-Match(304)
+
+    python benchmarks/bench_startup.py --runs 5
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+HOST = "127.0.0.1"
+
+
+def measure_import(runs: int) -> float:
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "import mllm_server.server"], check=True, capture_output=True)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def wait_ok(client: httpx.Client, url: str, deadline: float) -> bool:
+    while time.perf_counter() < deadline:
+        try:
+            if client.get(url).status_code == 200:
+                return True
+        except httpx.TransportError:
+            pass
+        time.sleep(0.01)
+    return False
+
+
+def measure_first_200(port: int, env: dict, timeout: float) -> dict:
+    command = [sys.executable, "-m", "uvicorn", "mllm_server.server:fastapi_app", "--host", HOST, "--port", str(port)]
+    start = time.perf_counter()
+    server = subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    result = {}
+    try:
+        with httpx.Client(base_url=f"http://{HOST}:{port}") as client:
+            if not wait_ok(client, "/", start + timeout):
+                raise RuntimeError("Server did not answer in time")
+            result["first 200 ms"] = (time.perf_counter() - start) * 1e3
+
+            for name in ("state-graph 1st ms", "state-graph 2nd ms"):
+                t = time.perf_counter()
+                response = client.get("/chatbot/state-graph")
+                result[name] = (time.perf_counter() - t) * 1e3
+                result["state-graph status"] = response.status_code
+            etag = response.headers.get("etag")
+            if etag:
+                t = time.perf_counter()
+                response = client.get("/chatbot/state-graph", headers={"If-None-Match": etag})
+                result["state-graph 304 ms"] = (time.perf_counter() - t) * 1e3
+                assert response.status_code == 304, response.status_code
+    finally:
+        server.terminate()
+        server.wait()
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--port", type=int, default=18123)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    args = parser.parse_args()
+
+    # 실제 SCANeR 주소 대신 로컬 주소에 바인딩
+    env = dict(os.environ, SCANER_FILTER_ADDRESS=os.environ.get("SCANER_FILTER_ADDRESS", f"{HOST}:46912"))
+    print(f"import mllm_server.server: {measure_import(args.runs) * 1e3:.0f} ms (median of {args.runs})")
+
+    results = [measure_first_200(args.port, env, args.timeout) for _ in range(args.runs)]
+    for key in results[0]:
+        values = [r[key] for r in results if key in r]
+        if key.endswith("status"):
+            print(f"{key}: {values}")
+        else:
+            print(f"{key}: median {statistics.median(values):.1f}, min {min(values):.1f}, max {max(values):.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 import mdaq_watcher.udp_server as udp_server
 
-udp_server.open_server()
+udp_server.main()
 
-# 이 코드는 MADQ 프로그램 서버와 통신하기 위한 UDP 서버 예시
\ No newline at end of file
+# 이 코드는 MADQ 프로그램 서버와 통신하기 위한 UDP 서버 예시
+# 로컬 대역으로 실행: python -m mdaq_watcher --stand-in --port 13232
@@ -0,0 +1,102 @@
+import struct
+import time
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+from mllm_server.telemetry_log import RECORD_HEADER, SOURCE_MDAQ, TelemetryLog
+
+# MDAQ 응답 프레임 (little-endian, 248바이트)
+#   시작 값(i32, 9) + float 9개 + 구분 값(i32) + int 51개
+MDAQ_FRAME = struct.Struct("<i9f52i")
+MDAQ_DTYPE = np.dtype(
+    [
+        ("start", "<i4"),
+        ("floats", "<f4", (9,)),
+        ("separator", "<i4"),
+        ("ints", "<i4", (51,)),
+    ]
+)
+assert MDAQ_DTYPE.itemsize == MDAQ_FRAME.size and MDAQ_DTYPE.itemsize % 8 == 0
+FRAME_HISTORY_SIZE = 4096
+
+
+def decode_frames(buffer) -> np.ndarray:
+    """
+    이어 붙인 MDAQ 프레임들을 np.frombuffer 한 번으로 구조화 배열 뷰로 읽습니다. (복사 없음)
+    """
+    return np.frombuffer(buffer, dtype=MDAQ_DTYPE, count=len(buffer) // MDAQ_DTYPE.itemsize)
+
+
+class MdaqCapture(NamedTuple):
+    timestamps: np.ndarray  # 수신 시각 (time.monotonic_ns())
+    frames: np.ndarray  # MDAQ_DTYPE
+
+
+def decode_capture(log: TelemetryLog) -> MdaqCapture:
+    """
+    기록한 텔레메트리 로그에서 MDAQ 프레임 전체를 한 번에 읽습니다.
+
+    로그의 레코드 헤더와 페이로드를 로그 버퍼 위의 워드 뷰에서 인덱스 배열로 모으므로
+    레코드 수와 관계없이 Python 루프를 돌지 않습니다. 길이가 프레임 크기와 다른 레코드는 건너뜁니다.
+    """
+    # 레코드와 페이로드는 8바이트 단위로 정렬되어 있으므로 8바이트 워드 단위로 모음
+    words = np.frombuffer(log.buffer, dtype="<u8", count=len(log.buffer) // 8)
+    offsets = log.index["offset"].astype(np.int64) // 8
+    # 레코드 헤더: receive_ns(i64) length(u32) source(u32) -> 두 번째 워드
+    header = words[offsets + 1]
+    lengths, sources = header & 0xFFFFFFFF, header >> 32
+    selected = (sources == SOURCE_MDAQ) & (lengths == MDAQ_DTYPE.itemsize)
+
+    first = offsets[selected] + RECORD_HEADER.size // 8
+    frames = words[first[:, None] + np.arange(MDAQ_DTYPE.itemsize // 8)].view(MDAQ_DTYPE).reshape(-1)
+    return MdaqCapture(log.index["timestamp_ns"][selected].copy(), frames)
+
+
+class MdaqFrameRing:
+    """
+    최근 MDAQ 프레임을 보관하는 미리 할당한 구조화 배열 링 버퍼입니다.
+    프레임은 파싱 없이 바이트 그대로 슬롯에 복사되며, 필드는 슬롯의 뷰로 읽습니다.
+    """
+
+    def __init__(self, capacity: int = FRAME_HISTORY_SIZE) -> None:
+        if capacity <= 0:
+            raise ValueError(f"Invalid capacity: {capacity}")
+        self.capacity = capacity
+        self.frames = np.zeros(capacity, dtype=MDAQ_DTYPE)
+        self.timestamps = np.zeros(capacity, dtype=np.int64)
+        self._raw = memoryview(self.frames.view(np.uint8))
+        self._count = 0
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    def __len__(self) -> int:
+        return min(self._count, self.capacity)
+
+    def append(self, data: bytes, timestamp_ns: Optional[int] = None) -> np.void:
+        if len(data) != MDAQ_DTYPE.itemsize:
+            raise struct.error(f"MDAQ frame must be {MDAQ_DTYPE.itemsize} bytes, got {len(data)}")
+        if timestamp_ns is None:
+            timestamp_ns = time.monotonic_ns()
+        idx = self._count % self.capacity
+        offset = idx * MDAQ_DTYPE.itemsize
+        self._raw[offset : offset + MDAQ_DTYPE.itemsize] = data
+        self.timestamps[idx] = timestamp_ns
+        self._count += 1
+        return self.frames[idx]
+
+    def latest(self) -> Optional[np.void]:
+        if self._count == 0:
+            return None
+        return self.frames[(self._count - 1) % self.capacity]
+
+    def snapshot(self, n: Optional[int] = None) -> MdaqCapture:
+        """
+        최근 n개 프레임(기본: 전체)을 오래된 순서로 복사합니다.
+        """
+        available = len(self)
+        n = available if n is None else max(0, min(n, available))
+        order = np.arange(self._count - n, self._count) % self.capacity
+        return MdaqCapture(self.timestamps[order], self.frames[order])
@@ -1,21 +1,47 @@
+import asyncio
 import socket
 import struct
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 import threading
 import time
 
+import numpy as np
+
+from mllm_server.sensor_bus import SensorBus
+from mllm_server.telemetry_log import SOURCE_MDAQ, TelemetryRecorder
+from mllm_server.timeseries import TimeSeriesRing
+
+from mdaq_watcher.frames import FRAME_HISTORY_SIZE, MdaqFrameRing
+
 MDAQ_SERVER_IP = "192.168.1.2"
 MDAQ_SERVER_PORT = 3232
 REQUEST_MESSAGE = b"\x00\x00\x00\x00\x00\x00\x00\x00"
 DATA_VALUE_SIZE = 4  # 32-bit float
 FLOAT_SIZE = 9
+RTT_HISTORY_SIZE = 4096
 
 
 class MdaqClient:
-    def __init__(self, ip_address: str, port: int, buffer_size=1024) -> None:
+    def __init__(
+        self,
+        ip_address: str,
+        port: int,
+        buffer_size=1024,
+        recorder: Optional[TelemetryRecorder] = None,
+        frame_capacity: int = FRAME_HISTORY_SIZE,
+        bus: Optional[SensorBus] = None,
+        bus_prefix: str = "mdaq",
+    ) -> None:
         self.ip_address = ip_address
         self.port = port
         self.buffer_size = buffer_size
+        self.recorder = recorder
+        self.frames = MdaqFrameRing(frame_capacity)
+        # 버스에는 float 값들만 "<bus_prefix>.float<i>" 채널로 발행
+        self.bus = bus
+        self.bus_rings = []
+        if bus is not None:
+            self.bus_rings = [bus.register(f"{bus_prefix}.float{i}", "mdaq") for i in range(FLOAT_SIZE)]
         self.is_active = False
         self.udp_socket: Optional[socket.socket] = None
         self.udp_thread: Optional[threading.Thread] = None
@@ -33,22 +59,27 @@ class MdaqClient:
             self._send_message(REQUEST_MESSAGE)
             try:
                 data, _ = self.udp_socket.recvfrom(self.buffer_size)
-                _, float_values, _, int_values = self._parse_data(data)
-                self.update(float_values, int_values)
+                receive_ns = time.monotonic_ns()
+                if self.recorder is not None:
+                    self.recorder.append(data, SOURCE_MDAQ, receive_ns)
+                self.feed(data, receive_ns)
             except socket.timeout:
                 print("(Timeout) Waiting for messages...")
                 continue
             time.sleep(0.25)
         print("Socket closed")
 
-    def _parse_data(self, data: bytes):
-        result = struct.unpack("<i9f52i", data)
-        start_byte = result[0]
-        float_values = result[1:10]
-        seperator = result[10]
-        int_values = result[11:]
-
-        return start_byte, float_values, seperator, int_values
+    def feed(self, data: bytes, receive_ns: Optional[int] = None) -> None:
+        # 소켓을 거치지 않고 응답 데이터를 직접 처리 (로그 재생 등)
+        # 프레임은 링 버퍼 슬롯에 그대로 복사되며, update()에는 슬롯의 float32/int32 뷰가 전달됨
+        # (슬롯은 capacity개 프레임 뒤에 덮어써지므로 update()에서 값을 보관하려면 복사해야 함)
+        frame = self.frames.append(data, receive_ns)
+        if self.bus_rings:
+            timestamp_ns = int(self.frames.timestamps[(self.frames.count - 1) % self.frames.capacity])
+            for ring, value in zip(self.bus_rings, frame["floats"].tolist()):
+                ring.append(value, timestamp_ns)
+            self.bus.notify()
+        self.update(frame["floats"], frame["ints"])
 
     def _send_message(self, message: bytes) -> None:
         self.udp_socket.sendto(message, (self.ip_address, self.port))
@@ -76,4 +107,160 @@ class MdaqClient:
         #     print(f"Int [{idx}]:", dat)
         
         raise NotImplementedError("This method should be implemented in a subclass.")
-        
+
+
+class _MdaqSlot(asyncio.DatagramProtocol):
+    """
+    요청 하나를 담당하는 UDP 엔드포인트. 슬롯마다 로컬 포트가 달라 응답을 요청과 정확히 대응시킬 수 있습니다.
+    """
+
+    def __init__(self, client: "AsyncMdaqClient") -> None:
+        self.client = client
+        self.sent_ns: Optional[int] = None  # None이면 대기 중인 요청 없음
+        self.transport: Optional[asyncio.DatagramTransport] = None
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self.transport = transport
+
+    def datagram_received(self, data: bytes, addr: Tuple[str, int]) -> None:
+        self.client._on_reply(self, data)
+
+    def error_received(self, exc: Exception) -> None:
+        print(f"MDAQ UDP error: {exc}")
+
+
+class AsyncMdaqClient(MdaqClient):
+    """
+    요청을 in_flight개까지 겹쳐 보내는 asyncio 폴링 클라이언트입니다.
+
+    MDAQ 응답에는 요청 번호가 없으므로 겹쳐 보내는 요청마다 별도의 소켓(슬롯)을 사용해
+    응답을 요청과 정확히 대응시킵니다. timeout 안에 응답이 없으면 손실로 집계하고, 늦게 도착하는 응답이
+    다음 요청과 섞이지 않도록 해당 슬롯의 소켓을 새로 엽니다.
+    폴링 간격은 관측한 RTT(SRTT / in_flight)에 맞춰 min_interval ~ max_interval 사이에서 조절됩니다.
+    """
+
+    def __init__(
+        self,
+        ip_address: str,
+        port: int,
+        buffer_size=1024,
+        recorder: Optional[TelemetryRecorder] = None,
+        in_flight: int = 4,
+        min_interval: float = 0.002,
+        max_interval: float = 0.25,
+        timeout: float = 0.5,
+        bus: Optional[SensorBus] = None,
+    ) -> None:
+        super().__init__(ip_address, port, buffer_size, recorder, bus=bus)
+        if in_flight < 1:
+            raise ValueError(f"Invalid in_flight: {in_flight}")
+        self.in_flight = in_flight
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.timeout = timeout
+
+        self._slots: List[_MdaqSlot] = []
+        self._poll_task: Optional[asyncio.Task] = None
+
+        self.sent = 0
+        self.received = 0
+        self.lost = 0
+        self.srtt: Optional[float] = None  # 초
+        self.rttvar = 0.0
+        self.rtts = TimeSeriesRing(RTT_HISTORY_SIZE)
+
+    @property
+    def interval(self) -> float:
+        if self.srtt is None:
+            return self.max_interval
+        return min(self.max_interval, max(self.min_interval, self.srtt / self.in_flight))
+
+    async def _open_slot(self) -> _MdaqSlot:
+        loop = asyncio.get_running_loop()
+        _, slot = await loop.create_datagram_endpoint(
+            lambda: _MdaqSlot(self),
+            remote_addr=(self.ip_address, self.port),
+        )
+        return slot
+
+    def _on_reply(self, slot: _MdaqSlot, data: bytes) -> None:
+        now_ns = time.monotonic_ns()
+        if self.recorder is not None:
+            self.recorder.append(data, SOURCE_MDAQ, now_ns)
+        if slot.sent_ns is not None:
+            rtt = (now_ns - slot.sent_ns) / 1e9
+            slot.sent_ns = None
+            self.received += 1
+            self.rtts.append(rtt, now_ns)
+            # RFC 6298 방식의 평활 RTT
+            if self.srtt is None:
+                self.srtt, self.rttvar = rtt, rtt / 2
+            else:
+                self.rttvar = 0.75 * self.rttvar + 0.25 * abs(self.srtt - rtt)
+                self.srtt = 0.875 * self.srtt + 0.125 * rtt
+        try:
+            self.feed(data, now_ns)
+        except struct.error as e:
+            print(f"Invalid MDAQ frame ({len(data)} bytes): {e}")
+
+    async def _poll(self) -> None:
+        timeout_ns = int(self.timeout * 1e9)
+        while self.is_active:
+            now_ns = time.monotonic_ns()
+            idle = None
+            for idx, slot in enumerate(self._slots):
+                if slot.sent_ns is not None and now_ns - slot.sent_ns > timeout_ns:
+                    self.lost += 1
+                    slot.transport.close()
+                    slot = self._slots[idx] = await self._open_slot()
+                if idle is None and slot.sent_ns is None:
+                    idle = slot
+            # 모든 슬롯이 응답을 기다리는 중이면 이번 차례는 건너뜀
+            if idle is not None:
+                idle.sent_ns = time.monotonic_ns()
+                idle.transport.sendto(REQUEST_MESSAGE)
+                self.sent += 1
+            await asyncio.sleep(self.interval)
+
+    async def start(self) -> None:
+        print(f"Activating async client for server[{self.ip_address}:{self.port}]...")
+        self._slots = [await self._open_slot() for _ in range(self.in_flight)]
+        self.is_active = True
+        self._poll_task = asyncio.create_task(self._poll())
+        print("Activating complete!")
+
+    async def stop(self) -> None:
+        self.is_active = False
+        if self._poll_task is not None:
+            self._poll_task.cancel()
+            try:
+                await self._poll_task
+            except asyncio.CancelledError:
+                pass
+            self._poll_task = None
+        for slot in self._slots:
+            slot.transport.close()
+        self._slots = []
+        print("Deactivating complete!")
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.stop()
+
+    def get_stats(self) -> Dict[str, Any]:
+        rtts = self.rtts.snapshot().values * 1e3
+        completed = self.received + self.lost
+        return {
+            "sent": self.sent,
+            "received": self.received,
+            "lost": self.lost,
+            "loss_rate": self.lost / completed if completed else 0.0,
+            "in_flight": sum(slot.sent_ns is not None for slot in self._slots),
+            "poll_interval_ms": self.interval * 1e3,
+            "srtt_ms": self.srtt * 1e3 if self.srtt is not None else None,
+            "rtt_ms_p50": float(np.percentile(rtts, 50)) if rtts.size else None,
+            "rtt_ms_p99": float(np.percentile(rtts, 99)) if rtts.size else None,
+        }
@@ -0,0 +1,171 @@
+import argparse
+import time
+from typing import List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import serial
+
+# MDAQ 시리얼 패킷: [0x23][메시지 ID][서브 ID][데이터 2바이트 (big-endian)]
+START_BYTE = 0x23
+PACKET_SIZE = 5
+BAUD_RATE = 115200
+
+
+class SerialPackets(NamedTuple):
+    msg_id: np.ndarray  # uint8
+    sub_id: np.ndarray  # uint8
+    data: np.ndarray  # 데이터 2바이트 (uint8, shape (n, 2))
+
+    def __len__(self) -> int:
+        return len(self.msg_id)
+
+    @property
+    def data_int(self) -> np.ndarray:
+        # 16비트 정수 (big-endian)
+        return self.data.view(">i2").reshape(-1)
+
+    @property
+    def data_fp16(self) -> np.ndarray:
+        # 16비트 부동소수점 (big-endian FP16)
+        return self.data.view(">f2").reshape(-1)
+
+    def select(self, mask: np.ndarray) -> "SerialPackets":
+        return SerialPackets(self.msg_id[mask], self.sub_id[mask], self.data[mask])
+
+
+def _empty_packets() -> SerialPackets:
+    return SerialPackets(
+        np.empty(0, dtype=np.uint8),
+        np.empty(0, dtype=np.uint8),
+        np.empty((0, 2), dtype=np.uint8),
+    )
+
+
+class SerialFramer:
+    """
+    바이트 스트림에서 5바이트 MDAQ 패킷을 잘라냅니다.
+
+    받은 데이터는 버퍼 끝에 붙이고, 0x23 위치는 bytearray.find로 찾습니다. 시작 위치부터 이어지는
+    패킷들은 (n, 5) 배열 한 번으로 검사/디코딩하며, 시작 바이트가 어긋난 곳에서만 다시 find로 동기화합니다.
+    처리한 바이트는 feed()마다 한 번만 버퍼에서 제거합니다.
+    """
+
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+        self.packets = 0
+        self.skipped_bytes = 0  # 동기화 과정에서 버린 바이트 수
+
+    @property
+    def pending(self) -> int:
+        return len(self._buffer)
+
+    def _frame(self) -> Tuple[List[np.ndarray], int]:
+        buffer = self._buffer
+        size = len(buffer)
+        blocks: List[np.ndarray] = []
+        pos = 0
+        while True:
+            start = buffer.find(START_BYTE, pos)
+            if start < 0:
+                self.skipped_bytes += size - pos
+                return blocks, size
+            self.skipped_bytes += start - pos
+            count = (size - start) // PACKET_SIZE
+            if count == 0:
+                return blocks, start
+
+            view = memoryview(buffer)[start : start + count * PACKET_SIZE]
+            block = np.frombuffer(view, dtype=np.uint8).reshape(count, PACKET_SIZE)
+            misaligned = np.flatnonzero(block[:, 0] != START_BYTE)
+            good = int(misaligned[0]) if misaligned.size else count
+            # 버퍼를 줄이기 전에 뷰를 놓아야 하므로 필요한 부분은 복사해 둠
+            if good:
+                blocks.append(block[:good].copy())
+            del block
+            view.release()
+            pos = start + good * PACKET_SIZE
+            if good == count:
+                return blocks, pos
+
+    def feed(self, data: bytes) -> SerialPackets:
+        """
+        받은 바이트를 추가하고, 완성된 패킷을 모두 반환합니다. (남은 조각은 다음 feed()까지 보관)
+        """
+        self._buffer += data
+        blocks, consumed = self._frame()
+        del self._buffer[:consumed]
+        if not blocks:
+            return _empty_packets()
+
+        packets = blocks[0] if len(blocks) == 1 else np.concatenate(blocks)
+        self.packets += len(packets)
+        return SerialPackets(packets[:, 1], packets[:, 2], packets[:, 3:5])
+
+
+class SerialPacketReader:
+    """
+    시리얼 포트에서 수신 대기 중인 데이터를 한 번에 읽어 SerialFramer로 패킷을 만듭니다.
+    port는 pyserial이 열 수 있는 이름이면 되므로 실제 장치 없이 pty로도 사용할 수 있습니다.
+    """
+
+    def __init__(self, port: str, baudrate: int = BAUD_RATE, timeout: Optional[float] = 1) -> None:
+        self.serial = serial.Serial(port, baudrate, timeout=timeout)
+        self.framer = SerialFramer()
+        self.bytes_read = 0
+        self.reads = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def read(self) -> SerialPackets:
+        """
+        대기 중인 바이트 전체를 읽습니다. 대기 중인 데이터가 없으면 timeout까지 첫 데이터를 기다립니다.
+        """
+        waiting = self.serial.in_waiting
+        if waiting:
+            data = self.serial.read(waiting)
+        else:
+            # read(n)은 timeout까지 n바이트를 채우려 하므로 첫 바이트만 기다린 뒤 나머지를 읽음
+            data = self.serial.read(1)
+            if data and self.serial.in_waiting:
+                data += self.serial.read(self.serial.in_waiting)
+        self.bytes_read += len(data)
+        self.reads += 1
+        return self.framer.feed(data)
+
+    def close(self) -> None:
+        self.serial.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="MDAQ serial packet reader")
+    parser.add_argument("port", help="예: COM4, /dev/ttyUSB0, /dev/pts/3")
+    parser.add_argument("--baudrate", type=int, default=BAUD_RATE)
+    args = parser.parse_args()
+
+    start = time.monotonic()
+    with SerialPacketReader(args.port, args.baudrate) as reader:
+        try:
+            while True:
+                packets = reader.read()
+                for msg_id, sub_id, (high, low), data_int, data_fp16 in zip(
+                    packets.msg_id.tolist(),
+                    packets.sub_id.tolist(),
+                    packets.data.tolist(),
+                    packets.data_int.tolist(),
+                    packets.data_fp16.tolist(),
+                ):
+                    print(f"{msg_id:02X}-{sub_id:02X}: {high:02X} {low:02X}, {data_int}, {data_fp16}")
+        except KeyboardInterrupt:
+            elapsed = time.monotonic() - start
+            print(
+                f"{reader.framer.packets} packets, {reader.bytes_read} bytes in {reader.reads} reads "
+                f"({elapsed:.1f} s), skipped {reader.framer.skipped_bytes} bytes"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,329 @@
+import argparse
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import matplotlib
+import numpy as np
+
+from mdaq_watcher.serial_framer import BAUD_RATE, PACKET_SIZE, START_BYTE, SerialPacketReader
+from mllm_server.sensor_bus import SensorBus
+from mllm_server.timeseries import TimeSeriesRing
+
+PLOT_WINDOW_SIZE = 1000  # 그래프에 표시할 데이터 포인트 수 (시리즈별)
+FRAME_INTERVAL_MS = 50
+
+SeriesKey = Tuple[int, int]  # (메시지 ID, 서브 ID)
+
+
+class SerialSeries:
+    def __init__(self, key: SeriesKey, capacity: int) -> None:
+        self.key = key
+        self.data_int = TimeSeriesRing(capacity)
+        self.data_fp16 = TimeSeriesRing(capacity)
+
+    @property
+    def label(self) -> str:
+        return f"ID:{self.key[0]:02X}-{self.key[1]:02X}"
+
+
+class SerialAcquisition:
+    """
+    별도 스레드에서 시리얼 패킷을 읽어 (메시지 ID, 서브 ID)별 고정 크기 링 버퍼에 채웁니다.
+    렌더링과 분리되어 있으므로 그래프 갱신이 느려도 수신이 밀리지 않습니다.
+    """
+
+    def __init__(
+        self,
+        reader: SerialPacketReader,
+        capacity: int = PLOT_WINDOW_SIZE,
+        msg_id: Optional[int] = None,
+        bus: Optional[SensorBus] = None,
+    ) -> None:
+        self.reader = reader
+        self.capacity = capacity
+        self.msg_id = msg_id  # 지정하면 해당 메시지 ID만 저장
+        self.bus = bus  # 시리즈를 "serial.<ID>-<서브 ID>.int/.fp16" 채널로 연결
+        self.series: Dict[SeriesKey, SerialSeries] = {}
+        self.packets = 0
+        self.is_active = False
+        self._thread: Optional[threading.Thread] = None
+
+    def _store(self, msg_ids: np.ndarray, sub_ids: np.ndarray, data_int, data_fp16, now_ns: int) -> None:
+        keys = msg_ids.astype(np.uint16) << 8 | sub_ids
+        unique, inverse = np.unique(keys, return_inverse=True)
+        timestamps = np.full(len(keys), now_ns, dtype=np.int64)
+        for slot, key in enumerate(unique.tolist()):
+            series = self.series.get((key >> 8, key & 0xFF))
+            if series is None:
+                series = SerialSeries((key >> 8, key & 0xFF), self.capacity)
+                if self.bus is not None:
+                    name = f"serial.{series.key[0]:02X}-{series.key[1]:02X}"
+                    self.bus.register(f"{name}.int", "serial", series.data_int)
+                    self.bus.register(f"{name}.fp16", "serial", series.data_fp16)
+                self.series[series.key] = series
+            mask = inverse == slot
+            series.data_int.extend(data_int[mask], timestamps[mask])
+            series.data_fp16.extend(data_fp16[mask], timestamps[mask])
+        if self.bus is not None:
+            self.bus.notify()
+
+    def _run(self) -> None:
+        while self.is_active:
+            packets = self.reader.read()
+            if not len(packets):
+                continue
+            self.packets += len(packets)
+            if self.msg_id is not None:
+                packets = packets.select(packets.msg_id == self.msg_id)
+            if len(packets):
+                self._store(
+                    packets.msg_id,
+                    packets.sub_id,
+                    packets.data_int.astype(np.float64),
+                    packets.data_fp16.astype(np.float64),
+                    time.monotonic_ns(),
+                )
+
+    def start(self) -> None:
+        self.is_active = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self.is_active = False
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def snapshot(self) -> List[Tuple[SerialSeries, np.ndarray, np.ndarray]]:
+        # 수신 스레드가 새 시리즈를 추가할 수 있으므로 목록을 먼저 복사
+        return [
+            (series, series.data_int.snapshot().values, series.data_fp16.snapshot().values)
+            for series in list(self.series.values())
+        ]
+
+
+class LivePlotter:
+    """
+    SerialAcquisition의 버퍼를 blitting으로 그립니다.
+
+    매 프레임 선 데이터만 set_data로 바꾸고 배경은 캐시에서 복원합니다. 새 시리즈가 생기거나
+    값이 축 범위를 벗어날 때만 전체를 다시 그립니다.
+    """
+
+    def __init__(self, acquisition: SerialAcquisition, figure=None) -> None:
+        import matplotlib.pyplot as plt
+
+        self.acquisition = acquisition
+        self.fig = figure or plt.figure(figsize=(10, 8))
+        self.axs = self.fig.subplots(2, 1)
+        title = "" if acquisition.msg_id is None else f" (Message ID: {acquisition.msg_id:02X})"
+        self.axs[0].set_title(f"16-bit int{title}")
+        self.axs[1].set_title(f"16-bit FP16{title}")
+        for ax in self.axs:
+            ax.set_xlim(0, acquisition.capacity)
+            ax.set_ylim(-1, 1)
+        self.fig.tight_layout()
+
+        self.lines: Dict[SeriesKey, Tuple] = {}
+        self.frames = 0
+        self.full_draws = 0
+        self._x = np.arange(acquisition.capacity)
+        self._background = None
+        self.fig.canvas.mpl_connect("draw_event", self._on_draw)
+
+    def _on_draw(self, event) -> None:
+        # 창 크기 변경 등으로 전체를 다시 그린 뒤 배경을 새로 캐시 (선은 animated라 배경에 포함되지 않음)
+        self._background = self.fig.canvas.copy_from_bbox(self.fig.bbox)
+
+    def _full_draw(self) -> None:
+        self.full_draws += 1
+        self.fig.canvas.draw()
+
+    def _fit(self, ax, values: np.ndarray) -> bool:
+        low, high = ax.get_ylim()
+        if values.size == 0 or (values.min() >= low and values.max() <= high):
+            return False
+        margin = max(1.0, (values.max() - values.min()) * 0.1)
+        ax.set_ylim(min(low, values.min() - margin), max(high, values.max() + margin))
+        return True
+
+    def update(self) -> None:
+        snapshot = self.acquisition.snapshot()
+        redraw = self._background is None
+        for series, data_int, data_fp16 in snapshot:
+            if series.key not in self.lines:
+                self.lines[series.key] = (
+                    self.axs[0].plot([], [], label=series.label, animated=True)[0],
+                    self.axs[1].plot([], [], label=series.label, animated=True)[0],
+                )
+                for ax in self.axs:
+                    ax.legend(loc="upper left")
+                redraw = True
+            finite = data_fp16[np.isfinite(data_fp16)]
+            redraw |= self._fit(self.axs[0], data_int)
+            redraw |= self._fit(self.axs[1], finite)
+
+            line_int, line_fp16 = self.lines[series.key]
+            line_int.set_data(self._x[: len(data_int)], data_int)
+            line_fp16.set_data(self._x[: len(data_fp16)], data_fp16)
+
+        if redraw:
+            self._full_draw()
+        canvas = self.fig.canvas
+        canvas.restore_region(self._background)
+        for lines in self.lines.values():
+            for line in lines:
+                self.fig.draw_artist(line)
+        canvas.blit(self.fig.bbox)
+        canvas.flush_events()
+        self.frames += 1
+
+    def show(self, interval_ms: int = FRAME_INTERVAL_MS) -> None:
+        import matplotlib.pyplot as plt
+
+        timer = self.fig.canvas.new_timer(interval=interval_ms)
+        timer.add_callback(self.update)
+        timer.start()
+        plt.show()
+
+
+def simulate_serial(count: Optional[int] = None, baudrate: int = BAUD_RATE, seed: int = 0):
+    """
+    pty에 실제 baud rate 속도로 MDAQ 패킷을 쓰는 스레드를 시작하고 (slave 이름, 상태)를 반환합니다.
+    상태의 "bytes"는 쓴 바이트 수이며 "stop"을 True로 바꾸면 멈춥니다.
+    """
+    import tty  # Unix 전용
+
+    master, slave = os.openpty()
+    tty.setraw(slave)
+    state = {"bytes": 0, "packets": 0, "stop": False}
+    bytes_per_second = baudrate / 10  # 8N1
+
+    def write() -> None:
+        rng = np.random.default_rng(seed)
+        start = time.monotonic()
+        t = 0.0
+        while not state["stop"] and (count is None or state["packets"] < count):
+            # 지금까지 보냈어야 하는 만큼 한 번에 씀
+            due = int((time.monotonic() - start) * bytes_per_second / PACKET_SIZE) - state["packets"]
+            if count is not None:
+                due = min(due, count - state["packets"])
+            if due <= 0:
+                time.sleep(0.002)
+                continue
+            packets = np.empty((due, PACKET_SIZE), dtype=np.uint8)
+            packets[:, 0] = START_BYTE
+            packets[:, 1] = rng.choice([0x42, 0x45, 0x53], size=due)
+            packets[:, 2] = rng.integers(0, 4, size=due)
+            phase = t + np.arange(due) / 100
+            values = (np.sin(phase + packets[:, 2]) * 1000).astype(">i2")
+            packets[:, 3:5] = values.view(np.uint8).reshape(due, 2)
+            t = phase[-1]
+            view = memoryview(packets.tobytes())
+            while view:
+                written = os.write(master, view)
+                view = view[written:]
+            state["packets"] += due
+            state["bytes"] += due * PACKET_SIZE
+
+    state["thread"] = threading.Thread(target=write, daemon=True)
+    state["thread"].start()
+    state["fds"] = (master, slave)
+    return os.ttyname(slave), state
+
+
+def run_headless(acquisition: SerialAcquisition, duration: float, interval_ms: int) -> Dict[str, float]:
+    """
+    화면 없이(Agg) 같은 렌더링 경로를 duration초 동안 실행하고 프레임/수신 속도를 반환합니다.
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    figure = Figure(figsize=(10, 8))
+    FigureCanvasAgg(figure)
+    plotter = LivePlotter(acquisition, figure)
+    reader = acquisition.reader
+
+    start = time.monotonic()
+    end = start + duration
+    next_frame = start
+    while time.monotonic() < end:
+        plotter.update()
+        next_frame += interval_ms / 1e3
+        delay = next_frame - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+    elapsed = time.monotonic() - start
+    return {
+        "fps": plotter.frames / elapsed,
+        "full_draws": plotter.full_draws,
+        "packets/s": acquisition.packets / elapsed,
+        "bytes/s": reader.bytes_read / elapsed,
+        "reads/s": reader.reads / elapsed,
+        "skipped_bytes": reader.framer.skipped_bytes,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="MDAQ serial live viewer")
+    parser.add_argument("port", nargs="?", help="예: COM4, /dev/ttyUSB0 (--simulate이면 생략)")
+    parser.add_argument("--baudrate", type=int, default=BAUD_RATE)
+    parser.add_argument("--msg-id", type=lambda v: int(v, 16), help="표시할 메시지 ID (16진수, 예: 53)")
+    parser.add_argument("--window", type=int, default=PLOT_WINDOW_SIZE)
+    parser.add_argument("--interval", type=int, default=FRAME_INTERVAL_MS, help="프레임 간격 (ms)")
+    parser.add_argument("--headless", action="store_true", help="화면 없이 프레임/수신 속도만 측정")
+    parser.add_argument("--duration", type=float, default=10.0, help="headless 측정 시간 (초)")
+    parser.add_argument("--simulate", action="store_true", help="pty로 full baud MDAQ 패킷을 흘려 보냄")
+    args = parser.parse_args()
+
+    simulator = None
+    port = args.port
+    if args.simulate:
+        port, simulator = simulate_serial(baudrate=args.baudrate)
+    elif port is None:
+        parser.error("port is required without --simulate")
+    if args.headless:
+        matplotlib.use("Agg")
+
+    reader = SerialPacketReader(port, args.baudrate, timeout=0.1)
+    acquisition = SerialAcquisition(reader, args.window, args.msg_id)
+    acquisition.start()
+    stats = None
+    try:
+        if args.headless:
+            stats = run_headless(acquisition, args.duration, args.interval)
+        else:
+            LivePlotter(acquisition).show(args.interval)
+    except KeyboardInterrupt:
+        print("프로그램을 종료합니다.")
+    finally:
+        if simulator is not None:
+            simulator["stop"] = True
+            simulator["thread"].join()
+            # 보낸 데이터를 모두 읽을 시간을 준 뒤 수신 스레드를 멈춤
+            time.sleep(0.2)
+        acquisition.stop()
+        reader.close()
+        if simulator is not None:
+            for fd in simulator["fds"]:
+                os.close(fd)
+
+    if stats is not None:
+        print(
+            f"frames: {stats['fps']:.1f} fps ({stats['full_draws']} full draws), "
+            f"acquisition: {stats['packets/s']:,.0f} packets/s, {stats['bytes/s']:,.0f} bytes/s "
+            f"in {stats['reads/s']:.0f} reads/s, skipped {stats['skipped_bytes']} bytes"
+        )
+    if simulator is not None:
+        dropped = simulator["bytes"] - reader.bytes_read
+        print(
+            f"simulated {args.baudrate} baud: sent {simulator['bytes']} bytes, "
+            f"read {reader.bytes_read} bytes, dropped {dropped} bytes"
+        )
+
+
+if __name__ == "__main__":
+    main()
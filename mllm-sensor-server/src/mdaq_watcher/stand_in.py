@@ -0,0 +1,81 @@
+import argparse
+import asyncio
+import math
+import random
+import time
+from typing import Optional, Tuple
+
+from mdaq_watcher.frames import MDAQ_FRAME
+
+START_BYTE = 9  # 실제 MDAQ 응답의 첫 값 (legacy/udp_side.py 참고)
+
+
+class MdaqStandIn(asyncio.DatagramProtocol):
+    """
+    MDAQ 대역: 요청 데이터그램마다 '<i9f52i' 형식의 응답을 보냅니다.
+    latency(초) 만큼 늦게 응답하고, loss 확률로 응답을 보내지 않습니다.
+    """
+
+    def __init__(self, latency: float = 0.001, jitter: float = 0.0, loss: float = 0.0) -> None:
+        self.latency = latency
+        self.jitter = jitter
+        self.loss = loss
+        self.requests = 0
+        self.transport: Optional[asyncio.DatagramTransport] = None
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self.transport = transport
+
+    def make_frame(self) -> bytes:
+        t = time.monotonic()
+        floats = [math.sin(2 * math.pi * 0.1 * t + i) for i in range(9)]
+        ints = [(self.requests >> i) & 1 for i in range(51)]
+        return MDAQ_FRAME.pack(START_BYTE, *floats, 0, *ints)
+
+    def datagram_received(self, data: bytes, addr: Tuple[str, int]) -> None:
+        self.requests += 1
+        if random.random() < self.loss:
+            return
+        delay = max(0.0, self.latency + random.uniform(-self.jitter, self.jitter))
+        frame = self.make_frame()
+        asyncio.get_running_loop().call_later(delay, self.transport.sendto, frame, addr)
+
+
+async def serve(
+    host: str = "127.0.0.1",
+    port: int = 3232,
+    latency: float = 0.001,
+    jitter: float = 0.0,
+    loss: float = 0.0,
+) -> Tuple[asyncio.DatagramTransport, MdaqStandIn]:
+    loop = asyncio.get_running_loop()
+    return await loop.create_datagram_endpoint(
+        lambda: MdaqStandIn(latency, jitter, loss),
+        local_addr=(host, port),
+    )
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    transport, _ = await serve(args.host, args.port, args.latency, args.jitter, args.loss)
+    print(f"MDAQ stand-in listening on {args.host}:{args.port}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        transport.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local MDAQ UDP stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=3232)
+    parser.add_argument("--latency", type=float, default=0.001, help="seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="seconds")
+    parser.add_argument("--loss", type=float, default=0.0, help="0 ~ 1")
+    try:
+        asyncio.run(main_async(parser.parse_args()))
+    except KeyboardInterrupt:
+        print("Exiting...")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,8 @@
-import socket
-import struct
-from typing import Optional
-import threading
-import time
+import argparse
+import asyncio
+import numpy as np
 import mdaq_watcher.mdaq as mdaq
+import mdaq_watcher.stand_in as stand_in
 
 MDAQ_SERVER_IP = "192.168.1.2"
 MDAQ_SERVER_PORT = 3232
@@ -13,17 +12,66 @@ REQUEST_MESSAGE = b"\x00\x00\x00\x00\x00\x00\x00\x00"
 # 핸들의 Force-feedback과 연관이 있는 것으로 보이나 확실하지 않음
 DATA_VALUE_SIZE = 4  # 32-bit float
 FLOAT_SIZE = 9
+REPORT_INTERVAL = 1.0
 
 
-def open_server():
-    with mdaq.MdaqClient() as mdaq_client:
+class MdaqWatcher(mdaq.AsyncMdaqClient):
+    def update(self, float_values: np.ndarray, int_values: np.ndarray) -> None:
+        # 전달되는 값은 링 버퍼 슬롯의 뷰이므로 이후 프레임에 덮어써짐. 보관할 때는 복사
+        self.float_values = float_values.copy()
+        self.int_values = int_values.copy()
+
+
+async def watch(ip_address: str, port: int, in_flight: int) -> None:
+    async with MdaqWatcher(ip_address, port, in_flight=in_flight) as client:
         while True:
-            try:
-                time.sleep(0.25)
-            except KeyboardInterrupt:
-                print("Exiting...")
-                break
+            await asyncio.sleep(REPORT_INTERVAL)
+            stats = client.get_stats()
+            print(
+                f"sent={stats['sent']} received={stats['received']} lost={stats['lost']} "
+                f"srtt={stats['srtt_ms'] or 0:.2f}ms p99={stats['rtt_ms_p99'] or 0:.2f}ms "
+                f"interval={stats['poll_interval_ms']:.2f}ms"
+            )
+            if client.received:
+                print(f"  floats={['%.3f' % v for v in client.float_values]}")
+
+
+async def watch_stand_in(port: int, in_flight: int, latency: float, loss: float) -> None:
+    transport, _ = await stand_in.serve("127.0.0.1", port, latency=latency, loss=loss)
+    try:
+        await watch("127.0.0.1", port, in_flight)
+    finally:
+        transport.close()
+
+
+def open_server(
+    ip_address: str = MDAQ_SERVER_IP,
+    port: int = MDAQ_SERVER_PORT,
+    in_flight: int = 4,
+    use_stand_in: bool = False,
+    latency: float = 0.005,
+    loss: float = 0.0,
+):
+    try:
+        if use_stand_in:
+            asyncio.run(watch_stand_in(port, in_flight, latency, loss))
+        else:
+            asyncio.run(watch(ip_address, port, in_flight))
+    except KeyboardInterrupt:
+        print("Exiting...")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MDAQ watcher")
+    parser.add_argument("--ip", default=MDAQ_SERVER_IP)
+    parser.add_argument("--port", type=int, default=MDAQ_SERVER_PORT)
+    parser.add_argument("--in-flight", type=int, default=4)
+    parser.add_argument("--stand-in", action="store_true", help="로컬 MDAQ 대역을 함께 실행")
+    parser.add_argument("--latency", type=float, default=0.005, help="대역의 응답 지연 (초)")
+    parser.add_argument("--loss", type=float, default=0.0, help="대역의 응답 손실 확률")
+    args = parser.parse_args()
+    open_server(args.ip, args.port, args.in_flight, args.stand_in, args.latency, args.loss)
 
 
 if __name__ == "__main__":
-    open_server()
+    main()
@@ -1,3 +1,62 @@
+import argparse
+import logging
+import os
+import subprocess
+import sys
+import time
+
 import uvicorn
 
-uvicorn.run("mllm_server.server:fastapi_app", reload=True)
\ No newline at end of file
+from .shared_sensors import SENSOR_SHM_NAME, SharedSensorStore
+
+logger = logging.getLogger(__name__)
+
+INGEST_START_TIMEOUT_S = 10.0
+
+
+def wait_for_ingest(process: subprocess.Popen, name: str, timeout_s: float = INGEST_START_TIMEOUT_S) -> None:
+    deadline = time.monotonic() + timeout_s
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Sensor ingest process exited with code {process.returncode}")
+        try:
+            SharedSensorStore.attach(name).close()
+            return
+        except (FileNotFoundError, ValueError):
+            time.sleep(0.1)
+    raise RuntimeError(f"Sensor shared memory {name} was not created within {timeout_s} s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="MLLM AiCar server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="API 워커 수. 2 이상이면 SCANeR 수신은 전용 프로세스가 맡고 워커는 공유 메모리로 센서를 조회",
+    )
+    args = parser.parse_args()
+
+    if args.workers <= 1:
+        uvicorn.run("mllm_server.server:fastapi_app", host=args.host, port=args.port, reload=True)
+        return
+
+    # 워커마다 같은 UDP 포트를 열 수 없으므로 수신 프로세스 하나가 소켓을 소유 (워커는 SENSOR_SHM으로 연결)
+    name = os.environ.get("SENSOR_SHM", SENSOR_SHM_NAME)
+    ingest = subprocess.Popen([sys.executable, "-m", "mllm_server.sensor_ingest", "--shm", name])
+    try:
+        wait_for_ingest(ingest, name)
+        os.environ["SENSOR_SHM"] = name
+        logger.info(f"Starting {args.workers} API workers on sensor shared memory {name}")
+        uvicorn.run("mllm_server.server:fastapi_app", host=args.host, port=args.port, workers=args.workers)
+    finally:
+        ingest.terminate()
+        try:
+            ingest.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            ingest.kill()
+
+
+main()
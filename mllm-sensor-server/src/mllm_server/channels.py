@@ -0,0 +1,195 @@
+import json
+import logging
+import math
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from .timeseries import TimeSeriesRing
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ChannelSpec:
+    channel_id: int  # SCANeR 필터 채널 ID
+    name: str  # get_sensor_data() 등에서 사용하는 키
+    label: str = ""  # 프롬프트 등에 표시할 이름
+    unit: str = ""
+    decimation: int = 1  # N개 중 1개만 저장/집계
+
+    @property
+    def display_name(self) -> str:
+        return self.label or self.name
+
+
+DEFAULT_CHANNELS = [
+    ChannelSpec(167, "steering", "Steering Angle"),
+    ChannelSpec(120, "speed", "Speed"),
+]
+
+
+def load_channel_specs(path: Optional[str] = None) -> List[ChannelSpec]:
+    """
+    JSON 파일에서 구독할 채널 목록을 읽습니다. 경로가 없으면 기본 채널(조향각, 속도)을 사용합니다.
+
+    예: [{"channel_id": 167, "name": "steering", "label": "Steering Angle", "unit": "deg", "decimation": 1}]
+    """
+    if not path:
+        return list(DEFAULT_CHANNELS)
+
+    with open(path, "r", encoding="utf-8") as f:
+        try:
+            items = json.load(f)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid SCANeR channel file {path}: {e}") from e
+    if not isinstance(items, list):
+        raise ValueError(f"Invalid SCANeR channel file {path}: expected a list of channels")
+    specs = [_parse_channel_spec(path, i, item) for i, item in enumerate(items)]
+
+    # 수신기를 시작한 뒤가 아니라 읽을 때 잘못된 설정을 알림
+    for key in ("name", "channel_id"):
+        values = [getattr(spec, key) for spec in specs]
+        duplicated = sorted({value for value in values if values.count(value) > 1}, key=str)
+        if duplicated:
+            raise ValueError(f"Invalid SCANeR channel file {path}: duplicated {key} {duplicated}")
+    logger.info(f"Loaded {len(specs)} SCANeR channels from {path}")
+    return specs
+
+
+def _parse_channel_spec(path: str, i: int, item: Any) -> ChannelSpec:
+    if not isinstance(item, dict):
+        raise ValueError(f"Invalid SCANeR channel file {path}: channel {i} is not an object")
+    try:
+        spec = ChannelSpec(**item)
+    except TypeError as e:
+        raise ValueError(f"Invalid SCANeR channel file {path}: channel {i}: {e}") from e
+    types = {"channel_id": int, "name": str, "label": str, "unit": str, "decimation": int}
+    for key, expected in types.items():
+        value = getattr(spec, key)
+        if not isinstance(value, expected) or isinstance(value, bool):
+            raise ValueError(f"Invalid SCANeR channel file {path}: channel {i} {key} must be {expected.__name__}")
+    if not spec.name or spec.decimation < 1:
+        raise ValueError(f"Invalid SCANeR channel file {path}: channel {i} needs a name and decimation >= 1")
+    return spec
+
+
+class RunningStats:
+    """
+    샘플마다 O(1)로 갱신되는 누적 통계 (Welford 평균/분산, 최소/최대, 변화율)
+    """
+
+    __slots__ = ("count", "mean", "_m2", "min", "max", "last", "last_ns", "rate")
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.last = math.nan
+        self.last_ns = 0
+        self.rate = 0.0  # 단위/초
+
+    def update(self, value: float, timestamp_ns: int) -> None:
+        if self.count and timestamp_ns > self.last_ns:
+            self.rate = (value - self.last) * 1e9 / (timestamp_ns - self.last_ns)
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.last = value
+        self.last_ns = timestamp_ns
+
+    @property
+    def variance(self) -> float:
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        if not self.count:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "last": self.last,
+            "min": self.min,
+            "max": self.max,
+            "mean": self.mean,
+            "variance": self.variance,
+            "rate": self.rate,
+        }
+
+
+class Channel:
+    def __init__(self, spec: ChannelSpec, history_capacity: int, history: Optional[TimeSeriesRing] = None) -> None:
+        if spec.decimation < 1:
+            raise ValueError(f"Invalid decimation for channel {spec.name}: {spec.decimation}")
+        self.spec = spec
+        # history: 미리 만든 링 버퍼 (예: 공유 메모리 위의 링)
+        self.history = history if history is not None else TimeSeriesRing(history_capacity)
+        self.stats = RunningStats()
+        self._skipped = 0
+
+    def append(self, value: float, timestamp_ns: int) -> None:
+        if self.spec.decimation > 1:
+            self._skipped += 1
+            if self._skipped < self.spec.decimation:
+                return
+            self._skipped = 0
+        self.history.append(value, timestamp_ns)
+        self.stats.update(value, timestamp_ns)
+
+
+class ChannelRegistry:
+    """
+    배포 환경에서 선언한 SCANeR 채널의 목록입니다. 채널마다 시계열과 누적 통계를 관리합니다.
+    """
+
+    def __init__(
+        self,
+        specs: Sequence[ChannelSpec],
+        history_capacity: int,
+        rings: Optional[Mapping[str, TimeSeriesRing]] = None,
+    ) -> None:
+        names = [spec.name for spec in specs]
+        ids = [spec.channel_id for spec in specs]
+        if len(set(names)) != len(names) or len(set(ids)) != len(ids):
+            raise ValueError(f"Duplicated channel names or ids: {specs}")
+
+        rings = rings or {}
+        self._channels = [Channel(spec, history_capacity, rings.get(spec.name)) for spec in specs]
+        self._by_name = {channel.spec.name: channel for channel in self._channels}
+        self.channel_ids = ids
+
+    def __iter__(self) -> Iterator[Channel]:
+        return iter(self._channels)
+
+    def __len__(self) -> int:
+        return len(self._channels)
+
+    def __getitem__(self, name: str) -> Channel:
+        return self._by_name[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._by_name
+
+    def update(self, values: np.ndarray, present: np.ndarray, timestamp_ns: int) -> None:
+        # values/present는 ScanerDatagramDecoder.decode() 결과 (채널 선언 순서)
+        for slot in np.flatnonzero(present).tolist():
+            self._channels[slot].append(float(values[slot]), timestamp_ns)
+
+    def update_from_dict(self, data: Mapping[int, float], timestamp_ns: int) -> None:
+        for channel in self._channels:
+            value = data.get(channel.spec.channel_id)
+            if value is not None:
+                channel.append(value, timestamp_ns)
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        return {channel.spec.name: channel.stats.as_dict() for channel in self._channels}
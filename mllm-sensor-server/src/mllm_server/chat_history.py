@@ -0,0 +1,148 @@
+import logging
+from typing import Any, Dict, List, Optional, Sequence
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import BaseMessage, HumanMessage, RemoveMessage, SystemMessage
+
+from .utils import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+HISTORY_TURNS = 6  # 그대로 남기는 최근 턴 수 (턴: 사용자 메시지와 그에 대한 응답)
+HISTORY_TOKENS = 1024  # 그대로 남기는 대화 기록의 토큰 예산 (0이면 창을 쓰지 않고 전체 기록을 보냄)
+HISTORY_SUMMARY_TOKENS = 256  # 누적 요약의 토큰 예산
+HISTORY_FOLD_TURNS = 4  # 창 밖으로 밀려난 턴이 이만큼 쌓이면 한 번에 요약 (예산을 넘으면 바로 요약)
+SUMMARY_TAG = "chat_history_summary"  # 요약 생성 호출에 붙이는 태그 (추적/콜백에서 답변 생성과 구분)
+
+SUMMARY_PROMPT = (
+    "You keep a running summary of a conversation between a driver and an in-car assistant.\n"
+    "Current summary:\n{summary}\n\n"
+    "New conversation lines:\n{lines}\n\n"
+    "Rewrite the summary so that it also covers the new lines. Keep what the driver said about themselves, "
+    "their requests, preferences and anything still unresolved. Drop small talk. "
+    "Answer with the summary only, in at most {words} words."
+)
+
+
+def message_tokens(message: BaseMessage) -> int:
+    return estimate_tokens(str(message.content)) + 4  # 역할/구분 토큰
+
+
+def split_turns(messages: Sequence[BaseMessage]) -> List[List[BaseMessage]]:
+    """
+    사용자 메시지마다 새 턴을 시작합니다. 첫 사용자 메시지 이전의 메시지는 첫 턴에 포함합니다.
+    """
+    turns: List[List[BaseMessage]] = []
+    for message in messages:
+        if isinstance(message, HumanMessage) or not turns:
+            turns.append([])
+        turns[-1].append(message)
+    return turns
+
+
+class HistoryWindow:
+    """
+    최근 max_turns개 턴을 budget_tokens 안에서 그대로 남기고, 창에서 밀려난 턴은 누적 요약(summary)에 합칩니다.
+    요약은 이전 요약 + 새로 밀려난 턴만 모델에 보내 갱신하므로 턴마다 전체 기록을 다시 요약하지 않습니다.
+    요약 호출을 줄이기 위해 밀려난 턴이 fold_turns개 쌓일 때 한 번에 합칩니다. (그 사이에는 창보다 최대
+    fold_turns - 1개 턴이 더 남음) 기록이 budget_tokens를 넘으면 바로 합칩니다.
+
+    마지막 턴은 예산을 넘어도 항상 남깁니다. budget_tokens가 0이면 사용하지 않습니다. (전체 기록을 그대로 보냄)
+    """
+
+    def __init__(
+        self,
+        max_turns: int = HISTORY_TURNS,
+        budget_tokens: int = HISTORY_TOKENS,
+        summary_tokens: int = HISTORY_SUMMARY_TOKENS,
+        fold_turns: int = HISTORY_FOLD_TURNS,
+    ) -> None:
+        self.max_turns = max(1, max_turns)
+        self.budget_tokens = budget_tokens
+        self.summary_tokens = summary_tokens
+        self.fold_turns = max(1, fold_turns)
+        self.stats: Dict[str, int] = {"folds": 0, "folded_messages": 0, "summary_failures": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.budget_tokens > 0
+
+    def window_start(self, messages: Sequence[BaseMessage]) -> int:
+        """
+        그대로 남길 창의 시작 위치. (이전 메시지는 요약에 합칠 대상)
+        """
+        turns = split_turns(messages)
+        start, tokens = len(messages), 0
+        for count, turn in enumerate(reversed(turns)):
+            turn_tokens = sum(message_tokens(message) for message in turn)
+            if count and (count >= self.max_turns or tokens + turn_tokens > self.budget_tokens):
+                break
+            tokens += turn_tokens
+            start -= len(turn)
+        return start
+
+    def window(self, messages: Sequence[BaseMessage]) -> List[BaseMessage]:
+        """
+        프롬프트에 그대로 넣을 최근 메시지. 요약이 늦어지거나 실패해도 프롬프트가 창을 넘지 않도록 보낼 때마다 자릅니다.
+        """
+        if not self.enabled:
+            return list(messages)
+        return list(messages[self.window_start(messages) :])
+
+    def fold_start(self, messages: Sequence[BaseMessage]) -> int:
+        """
+        지금 요약에 합칠 메시지 수. 0이면 아직 합칠 필요가 없습니다. (모델 호출 전에 슬롯이 필요한지 판단)
+        """
+        if not self.enabled:
+            return 0
+        start = self.window_start(messages)
+        if start == 0:
+            return 0
+        over_budget = sum(message_tokens(message) for message in messages) > self.budget_tokens
+        if not over_budget and len(split_turns(messages[:start])) < self.fold_turns:
+            return 0
+        return start
+
+    def prompt(self, summary: Optional[str], messages: Sequence[BaseMessage]) -> List[BaseMessage]:
+        # 요약은 시스템 메시지로 대화 기록 앞에 둠
+        if not summary:
+            return list(messages)
+        return [SystemMessage(content=f"Summary of the earlier conversation:\n{summary}"), *messages]
+
+    async def update(self, llm: BaseChatModel, summary: Optional[str], messages: Sequence[BaseMessage]) -> Dict[str, Any]:
+        """
+        창에서 밀려난 메시지를 요약에 합치고 상태에서 지우는 갱신을 반환합니다. 요약에 실패하면 아무것도 지우지 않고
+        다음 턴에 다시 시도합니다.
+        """
+        start = self.fold_start(messages)
+        if start == 0:
+            return {}
+        folded = messages[:start]
+        lines = "\n".join(f"{message.type}: {message.content}" for message in folded)
+        request = SUMMARY_PROMPT.format(
+            summary=summary or "(empty)",
+            lines=lines,
+            words=int(self.summary_tokens * 0.75),
+        )
+        try:
+            result = await llm.with_config(tags=[SUMMARY_TAG]).ainvoke([HumanMessage(content=request)])
+        except Exception:
+            logger.exception("History summary failed, keeping the messages for the next turn")
+            self.stats["summary_failures"] += 1
+            return {}
+        self.stats["folds"] += 1
+        self.stats["folded_messages"] += len(folded)
+        return {
+            "summary": str(result.content).strip(),
+            "messages": [RemoveMessage(id=message.id) for message in folded],
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "max_turns": self.max_turns,
+            "budget_tokens": self.budget_tokens,
+            "summary_tokens": self.summary_tokens,
+            "fold_turns": self.fold_turns,
+            **self.stats,
+        }
@@ -0,0 +1,185 @@
+import asyncio
+import itertools
+import logging
+import time
+import uuid
+from collections import deque
+from typing import AsyncIterable, AsyncIterator, Callable, Deque, Dict, Optional, Tuple
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+CHAT_RUN_GRACE_S = 60.0  # 구독자가 모두 끊긴 뒤 생성/버퍼를 유지하는 시간
+CHAT_RUN_BUFFER_EVENTS = 4096  # 실행별로 보관하는 최근 이벤트 수
+
+
+class ChatRun:
+    """
+    하나의 채팅 생성 실행. 이벤트마다 순번(SSE id)을 붙여 SSE 프레임으로 한 번만 인코딩하고,
+    최근 buffer_size개를 보관해 재접속한 클라이언트가 놓친 이벤트만 다시 받을 수 있게 합니다.
+    """
+
+    def __init__(self, run_id: str, buffer_size: int = CHAT_RUN_BUFFER_EVENTS) -> None:
+        self.run_id = run_id
+        self.frames: Deque[Tuple[int, bytes]] = deque(maxlen=buffer_size)
+        self.sequence = 0
+        self.done = False
+        self.subscribers = 0
+        self.created = time.monotonic()
+        self.task: Optional[asyncio.Task] = None
+        self._changed = asyncio.Event()
+        self._expiry: Optional[asyncio.TimerHandle] = None
+
+    def push(self, data: bytes, event: Optional[str] = None) -> None:
+        self.sequence += 1
+        frame = b"id: %d\n" % self.sequence
+        if event is not None:
+            frame += b"event: " + event.encode() + b"\n"
+        frame += b"data: " + data.rstrip(b"\n") + b"\n\n"
+        self.frames.append((self.sequence, frame))
+        self._changed.set()
+
+    def finish(self) -> None:
+        self.done = True
+        self._changed.set()
+
+    async def frames_after(self, last_sequence: int) -> AsyncIterator[bytes]:
+        """
+        last_sequence 이후의 프레임을 보내고, 실행이 끝날 때까지 새 프레임을 기다립니다.
+        """
+        sent = last_sequence
+        while True:
+            if self.frames and self.frames[0][0] > sent + 1:
+                first = self.frames[0][0]
+                # 버퍼에서 밀려나 다시 보낼 수 없는 구간 (id 없음)
+                yield b"event: gap\ndata: " + orjson.dumps({"from": sent + 1, "to": first - 1}) + b"\n\n"
+                sent = first - 1
+            if sent < self.sequence:
+                # 순번은 연속이므로 버퍼 안의 위치를 바로 계산
+                start = sent + 1 - self.frames[0][0]
+                pending = list(itertools.islice(self.frames, start, None))
+                for sequence, frame in pending:
+                    yield frame
+                    sent = sequence
+                continue
+            if self.done:
+                return
+            self._changed.clear()
+            await self._changed.wait()
+
+
+class ChatRunManager:
+    """
+    생성은 백그라운드 작업으로 실행하고 클라이언트 연결과 분리합니다. 연결이 끊겨도 생성은 계속되며,
+    grace_s 동안 다시 구독하는 클라이언트가 없을 때만 생성을 취소하고 버퍼를 버립니다. (완료된 실행도 같음)
+    """
+
+    def __init__(self, grace_s: float = CHAT_RUN_GRACE_S, buffer_size: int = CHAT_RUN_BUFFER_EVENTS) -> None:
+        self.grace_s = grace_s
+        self.buffer_size = buffer_size
+        self.runs: Dict[str, ChatRun] = {}
+        self.stats: Dict[str, int] = {
+            "started": 0,
+            "completed": 0,
+            "failed": 0,
+            "cancelled": 0,  # 유예 시간 동안 아무도 다시 구독하지 않아 취소한 생성
+            "resumed": 0,
+            "replayed_events": 0,
+            "gaps": 0,  # 재접속했지만 버퍼에서 밀려나 보내지 못한 구간 수
+        }
+
+    def get(self, run_id: str) -> Optional[ChatRun]:
+        return self.runs.get(run_id)
+
+    def start(self, stream: AsyncIterable[bytes], on_done: Optional[Callable[[], None]] = None) -> ChatRun:
+        """
+        stream(NDJSON 한 줄씩)을 백그라운드에서 소비하며 실행 버퍼에 쌓습니다. on_done은 생성이 끝나거나
+        취소되면 호출됩니다. (LLM 슬롯 반환 등)
+        """
+        run = ChatRun(uuid.uuid4().hex, self.buffer_size)
+        run.push(orjson.dumps({"run_id": run.run_id}), event="run")
+        run.task = asyncio.create_task(self._generate(run, stream, on_done))
+        self.runs[run.run_id] = run
+        self.stats["started"] += 1
+        # 첫 바이트 전에 클라이언트가 끊어 아무도 구독하지 않은 실행도 유예 시간 뒤에 취소 (subscribe()에서 해제)
+        self._schedule_expiry(run)
+        return run
+
+    async def _generate(
+        self,
+        run: ChatRun,
+        stream: AsyncIterable[bytes],
+        on_done: Optional[Callable[[], None]],
+    ) -> None:
+        try:
+            async for data in stream:
+                run.push(data)
+            run.push(orjson.dumps({"run_id": run.run_id}), event="end")
+            self.stats["completed"] += 1
+        except asyncio.CancelledError:
+            self.stats["cancelled"] += 1
+            raise
+        except Exception as e:
+            logger.exception(f"Chat run {run.run_id} failed")
+            run.push(orjson.dumps({"run_id": run.run_id, "error": str(e)}), event="error")
+            self.stats["failed"] += 1
+        finally:
+            run.finish()
+            if on_done is not None:
+                on_done()
+            if run.subscribers == 0:
+                self._schedule_expiry(run)
+
+    async def subscribe(self, run: ChatRun, last_sequence: int = 0) -> AsyncIterator[bytes]:
+        """
+        SSE 본문. 연결이 끊기면(제너레이터 종료) 구독만 해제되고 생성은 계속됩니다.
+        """
+        if last_sequence:
+            self.stats["resumed"] += 1
+            self.stats["replayed_events"] += max(0, run.sequence - last_sequence)
+        run.subscribers += 1
+        if run._expiry is not None:
+            run._expiry.cancel()
+            run._expiry = None
+        try:
+            async for frame in run.frames_after(last_sequence):
+                if frame.startswith(b"event: gap"):
+                    self.stats["gaps"] += 1
+                yield frame
+        finally:
+            run.subscribers -= 1
+            if run.subscribers == 0:
+                self._schedule_expiry(run)
+
+    def _schedule_expiry(self, run: ChatRun) -> None:
+        if run._expiry is not None:
+            run._expiry.cancel()
+        run._expiry = asyncio.get_running_loop().call_later(self.grace_s, self._expire, run)
+
+    def _expire(self, run: ChatRun) -> None:
+        run._expiry = None
+        if run.subscribers:
+            return
+        self.runs.pop(run.run_id, None)
+        if run.task is not None and not run.task.done():
+            logger.info(f"Chat run {run.run_id} abandoned for {self.grace_s} s, cancelling generation")
+            run.task.cancel()
+
+    async def close(self) -> None:
+        runs, self.runs = list(self.runs.values()), {}
+        for run in runs:
+            if run._expiry is not None:
+                run._expiry.cancel()
+            if run.task is not None:
+                run.task.cancel()
+        await asyncio.gather(*(run.task for run in runs if run.task is not None), return_exceptions=True)
+
+    def get_stats(self) -> Dict[str, int]:
+        runs = list(self.runs.values())
+        return {
+            **self.stats,
+            "active": sum(not run.done for run in runs),
+            "buffered": len(runs),
+            "subscribers": sum(run.subscribers for run in runs),
+        }
@@ -0,0 +1,353 @@
+import asyncio
+import base64
+import logging
+import time
+from contextlib import asynccontextmanager, nullcontext
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Set, Tuple
+
+import aiosqlite
+import orjson
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import ChannelVersions, Checkpoint, CheckpointMetadata, CheckpointTuple
+from langgraph.checkpoint.base.id import UUID
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_READERS = 4  # 읽기 전용 연결 수
+CHECKPOINT_KEEP = 10  # thread_id별로 남기는 최근 체크포인트 수 (0이면 정리하지 않음)
+COMPACT_INTERVAL_S = 30.0
+COMPACT_BATCH = 32  # 한 트랜잭션에서 정리하는 스레드 수 (쓰기 락을 오래 잡지 않도록)
+SESSIONS_PAGE_SIZE = 50
+SESSIONS_MAX_PAGE_SIZE = 500
+UUID_EPOCH_OFFSET = 0x01B21DD213814000  # 1582-10-15 ~ 1970-01-01 (100ns 단위)
+
+# 쓰기 연결. WAL에서는 synchronous=NORMAL이어도 DB가 깨지지 않음 (전원 차단 시 마지막 커밋만 잃을 수 있음)
+WRITER_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-65536",  # 64 MiB
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA busy_timeout=5000",
+)
+READER_PRAGMAS = (
+    "PRAGMA query_only=ON",
+    "PRAGMA cache_size=-16384",  # 16 MiB
+    "PRAGMA mmap_size=268435456",  # 256 MiB
+    "PRAGMA busy_timeout=5000",
+)
+
+# 세션 인덱스. 체크포인트를 쓸 때 갱신하며, 최근 활동 순 목록은 (last_active, thread_id) 인덱스로 페이지 단위 조회
+SESSION_INDEX_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS session_index ("
+    "thread_id TEXT PRIMARY KEY, created REAL NOT NULL, last_active REAL NOT NULL, turns INTEGER NOT NULL DEFAULT 0)",
+    "CREATE INDEX IF NOT EXISTS session_index_recent ON session_index (last_active DESC, thread_id DESC)",
+)
+
+
+def checkpoint_time(checkpoint_id: str) -> float:
+    # 체크포인트 id는 uuid6 (시간 순 정렬)이므로 생성 시각을 복원할 수 있음
+    try:
+        return (UUID(checkpoint_id).time - UUID_EPOCH_OFFSET) / 1e7
+    except ValueError:
+        return time.time()
+
+
+def encode_cursor(last_active: float, thread_id: str) -> str:
+    return base64.urlsafe_b64encode(orjson.dumps([last_active, thread_id])).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[float, str]:
+    try:
+        last_active, thread_id = orjson.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return float(last_active), str(thread_id)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+async def _connect(path: str, pragmas: Sequence[str], read_only: bool = False) -> aiosqlite.Connection:
+    if read_only:
+        conn = await aiosqlite.connect(f"file:{path}?mode=ro", uri=True)
+    else:
+        conn = await aiosqlite.connect(path)
+    for pragma in pragmas:
+        await conn.execute(pragma)
+    return conn
+
+
+class PooledSqliteSaver(AsyncSqliteSaver):
+    """
+    쓰기는 하나의 연결(AsyncSqliteSaver)로, 조회(aget_tuple/alist)는 읽기 전용 연결 풀로 처리하는 체크포인터입니다.
+    WAL 모드이므로 조회가 쓰기를 기다리지 않고, 커밋된 체크포인트는 바로 읽을 수 있습니다.
+
+    SQL은 AsyncSqliteSaver를 그대로 사용합니다. 읽기 연결마다 AsyncSqliteSaver를 하나씩 만들어 두고 빌려 씁니다.
+    체크포인트를 쓴 스레드를 기록해 두었다가 compact()에서 스레드별로 최근 keep개만 남깁니다.
+
+    세션 인덱스(session_index)는 aput()에서 메모리에 모아 두었다가 flush_sessions()에서 한 트랜잭션으로 반영합니다.
+    (체크포인트 쓰기마다 커밋을 추가하지 않음) list_sessions()는 반영한 뒤 조회하므로 항상 최신입니다.
+    """
+
+    def __init__(self, conn: aiosqlite.Connection, keep: int = CHECKPOINT_KEEP, **kwargs: Any) -> None:
+        super().__init__(conn, **kwargs)
+        self.keep = keep
+        self._readers: "asyncio.Queue[AsyncSqliteSaver]" = asyncio.Queue()
+        self._reader_conns: List[aiosqlite.Connection] = []
+        self._dirty: Set[Tuple[str, str]] = set()  # 마지막 compact() 이후 체크포인트를 쓴 (thread_id, checkpoint_ns)
+        self._touched: Dict[str, List] = {}  # 세션 인덱스에 반영할 thread_id -> [처음, 마지막 시각, 추가 턴 수]
+        self.stats: Dict[str, int] = {"compactions": 0, "pruned_checkpoints": 0, "pruned_writes": 0}
+
+    async def open_readers(self, path: str, count: int = CHECKPOINT_READERS) -> None:
+        await self.setup()  # 읽기 전용 연결로는 테이블을 만들 수 없으므로 먼저 생성
+        await self.setup_session_index()
+        for _ in range(count):
+            conn = await _connect(path, READER_PRAGMAS, read_only=True)
+            reader = AsyncSqliteSaver(conn, serde=self.serde)
+            reader.is_setup = True
+            self._reader_conns.append(conn)
+            self._readers.put_nowait(reader)
+
+    async def close_readers(self) -> None:
+        for conn in self._reader_conns:
+            await conn.close()
+        self._reader_conns = []
+        self._readers = asyncio.Queue()
+
+    @asynccontextmanager
+    async def _borrow_reader(self) -> AsyncIterator[AsyncSqliteSaver]:
+        if not self._reader_conns:
+            yield self
+            return
+        reader = await self._readers.get()
+        try:
+            yield reader
+        finally:
+            self._readers.put_nowait(reader)
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        if not self._reader_conns:
+            return await super().aget_tuple(config)
+        async with self._borrow_reader() as reader:
+            return await reader.aget_tuple(config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        if not self._reader_conns:
+            async for item in super().alist(config, filter=filter, before=before, limit=limit):
+                yield item
+            return
+        async with self._borrow_reader() as reader:
+            async for item in reader.alist(config, filter=filter, before=before, limit=limit):
+                yield item
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        result = await super().aput(config, checkpoint, metadata, new_versions)
+        configurable = result["configurable"]
+        thread_id = str(configurable["thread_id"])
+        self._dirty.add((thread_id, configurable["checkpoint_ns"]))
+        if not configurable["checkpoint_ns"]:  # 서브그래프 체크포인트는 세션 인덱스에서 제외
+            now = time.time()
+            entry = self._touched.setdefault(thread_id, [now, now, 0])
+            entry[1] = now
+            entry[2] += metadata.get("source") == "input"  # 사용자 입력마다 입력 체크포인트가 하나 생김
+        return result
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await super().adelete_thread(thread_id)
+        self._touched.pop(str(thread_id), None)
+        async with self.lock:
+            await self.conn.execute("DELETE FROM session_index WHERE thread_id = ?", (str(thread_id),))
+            await self.conn.commit()
+
+    async def setup_session_index(self) -> None:
+        """
+        세션 인덱스 테이블을 만들고, 인덱스가 없던 DB라면 기존 체크포인트로 한 번 채웁니다.
+        (정리된 체크포인트의 턴은 셀 수 없으므로 이 경우 turns는 남아 있는 체크포인트 기준)
+        """
+        async with self.lock:
+            for statement in SESSION_INDEX_SCHEMA:
+                await self.conn.execute(statement)
+            async with self.conn.execute("SELECT 1 FROM session_index LIMIT 1") as cur:
+                indexed = await cur.fetchone() is not None
+            rows = []
+            if not indexed:
+                async with self.conn.execute(
+                    "SELECT thread_id, MIN(checkpoint_id), MAX(checkpoint_id), "
+                    "SUM(json_extract(CAST(metadata AS TEXT), '$.source') = 'input') "
+                    "FROM checkpoints WHERE checkpoint_ns = '' GROUP BY thread_id"
+                ) as cur:
+                    rows = [
+                        (thread_id, checkpoint_time(first), checkpoint_time(last), turns or 0)
+                        async for thread_id, first, last, turns in cur
+                    ]
+                await self.conn.executemany(
+                    "INSERT INTO session_index (thread_id, created, last_active, turns) VALUES (?, ?, ?, ?)", rows
+                )
+            await self.conn.commit()
+        if rows:
+            logger.info(f"Session index built from existing checkpoints: {len(rows)} sessions")
+
+    async def flush_sessions(self) -> None:
+        if not self._touched:
+            return
+        async with self.lock:
+            touched, self._touched = self._touched, {}
+            await self.conn.executemany(
+                "INSERT INTO session_index (thread_id, created, last_active, turns) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (thread_id) DO UPDATE SET "
+                "last_active = MAX(last_active, excluded.last_active), turns = turns + excluded.turns",
+                [(thread_id, *entry) for thread_id, entry in touched.items()],
+            )
+            await self.conn.commit()
+
+    async def list_sessions(
+        self,
+        limit: int = SESSIONS_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        active_since: Optional[float] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        최근 활동 순으로 세션을 limit개 반환합니다. cursor는 이전 페이지가 돌려준 next_cursor이며,
+        active_since(unix 시각)를 주면 그 이후에 활동한 세션만 반환합니다. 다음 페이지가 없으면 next_cursor는 None.
+        """
+        limit = max(1, min(limit, SESSIONS_MAX_PAGE_SIZE))
+        await self.flush_sessions()
+        wheres, params = [], []
+        if active_since is not None:
+            wheres.append("last_active >= ?")
+            params.append(active_since)
+        if cursor:
+            wheres.append("(last_active, thread_id) < (?, ?)")
+            params.extend(decode_cursor(cursor))
+        query = "SELECT thread_id, created, last_active, turns FROM session_index"
+        if wheres:
+            query += " WHERE " + " AND ".join(wheres)
+        query += " ORDER BY last_active DESC, thread_id DESC LIMIT ?"
+        async with self._borrow_reader() as reader:
+            async with reader.conn.execute(query, (*params, limit + 1)) as cur:
+                rows = await cur.fetchall()
+        sessions = [
+            {"thread_id": thread_id, "created": created, "last_active": last_active, "turns": turns}
+            for thread_id, created, last_active, turns in rows[:limit]
+        ]
+        next_cursor = None
+        if len(rows) > limit:
+            next_cursor = encode_cursor(sessions[-1]["last_active"], sessions[-1]["thread_id"])
+        return sessions, next_cursor
+
+    async def compact(self) -> int:
+        """
+        체크포인트를 쓴 스레드마다 최근 keep개만 남기고, 지운 체크포인트의 pending writes도 지웁니다.
+        지운 체크포인트 수를 반환합니다.
+        """
+        if self.keep <= 0 or not self._dirty:
+            return 0
+        dirty, self._dirty = list(self._dirty), set()
+        pruned = 0
+        for i in range(0, len(dirty), COMPACT_BATCH):
+            async with self.lock, self.conn.cursor() as cur:
+                for thread_id, checkpoint_ns in dirty[i : i + COMPACT_BATCH]:
+                    # keep번째로 최근인 체크포인트보다 오래된 것을 삭제 (기본 키 인덱스 사용)
+                    await cur.execute(
+                        "SELECT checkpoint_id FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? "
+                        "ORDER BY checkpoint_id DESC LIMIT 1 OFFSET ?",
+                        (thread_id, checkpoint_ns, self.keep - 1),
+                    )
+                    row = await cur.fetchone()
+                    if row is None:
+                        continue
+                    params = (thread_id, checkpoint_ns, row[0])
+                    await cur.execute(
+                        "DELETE FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id < ?", params
+                    )
+                    pruned += cur.rowcount
+                    await cur.execute(
+                        "DELETE FROM writes WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id < ?", params
+                    )
+                    self.stats["pruned_writes"] += cur.rowcount
+                await self.conn.commit()
+        self.stats["compactions"] += 1
+        self.stats["pruned_checkpoints"] += pruned
+        return pruned
+
+    async def run_compactor(self, interval: float = COMPACT_INTERVAL_S) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.flush_sessions()
+                pruned = await self.compact()
+                if pruned:
+                    logger.info(f"Checkpoint compactor pruned {pruned} checkpoints")
+            except Exception:
+                logger.exception("Checkpoint compaction failed")
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            **self.stats,
+            "keep": self.keep,
+            "readers": len(self._reader_conns),
+            "dirty_threads": len(self._dirty),
+            "unindexed_sessions": len(self._touched),
+        }
+
+
+async def list_thread_ids(
+    saver: AsyncSqliteSaver, limit: int = SESSIONS_PAGE_SIZE, after: Optional[str] = None
+) -> Tuple[List[str], Optional[str]]:
+    """
+    세션 인덱스가 없는 AsyncSqliteSaver용. checkpoints의 기본 키 인덱스로 thread_id 순 한 페이지를 조회합니다.
+    (after: 이전 페이지의 마지막 thread_id)
+    """
+    limit = max(1, min(limit, SESSIONS_MAX_PAGE_SIZE))
+    if not saver.is_setup:
+        await saver.setup()  # 쓰기 락을 잡으므로 이미 준비된 경우에는 호출하지 않음
+    # 읽기 연결 풀이 있으면 빌려 쓰고, 없으면 쓰기와 같은 연결이므로 저장소의 락을 잡고 조회
+    borrow = saver._borrow_reader() if isinstance(saver, PooledSqliteSaver) else nullcontext(saver)
+    async with borrow as reader, reader.lock, reader.conn.execute(
+        "SELECT DISTINCT thread_id FROM checkpoints WHERE thread_id > ? ORDER BY thread_id LIMIT ?",
+        (after or "", limit + 1),
+    ) as cur:
+        thread_ids = [row[0] for row in await cur.fetchall()]
+    return thread_ids[:limit], thread_ids[limit - 1] if len(thread_ids) > limit else None
+
+
+@asynccontextmanager
+async def open_checkpointer(
+    path: str,
+    readers: int = CHECKPOINT_READERS,
+    keep: int = CHECKPOINT_KEEP,
+    compact_interval_s: float = COMPACT_INTERVAL_S,
+) -> AsyncIterator[PooledSqliteSaver]:
+    """
+    WAL/pragma를 적용한 쓰기 연결, 읽기 연결 풀, 백그라운드 정리 작업을 갖춘 체크포인터를 엽니다.
+    """
+    conn = await _connect(path, WRITER_PRAGMAS)
+    saver = PooledSqliteSaver(conn, keep=keep)
+    compactor: Optional[asyncio.Task] = None
+    try:
+        await saver.open_readers(path, readers)
+        if keep > 0:
+            compactor = asyncio.create_task(saver.run_compactor(compact_interval_s))
+        yield saver
+    finally:
+        if compactor is not None:
+            compactor.cancel()
+            try:
+                await compactor
+            except asyncio.CancelledError:
+                pass
+            await saver.compact()
+        await saver.flush_sessions()
+        await saver.close_readers()
+        await conn.close()
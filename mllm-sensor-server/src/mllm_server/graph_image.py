@@ -0,0 +1,88 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from typing import Literal, Optional
+
+from fastapi import HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+
+def graph_structure_hash(graph) -> str:
+    """
+    컴파일한 그래프의 노드/엣지 구조 해시 (구조가 같으면 같은 이미지)
+    """
+    drawable = graph.get_graph()
+    structure = {
+        "nodes": sorted(drawable.nodes),
+        "edges": sorted(
+            (edge.source, edge.target, bool(edge.conditional), str(edge.data or "")) for edge in drawable.edges
+        ),
+    }
+    return hashlib.sha256(json.dumps(structure, sort_keys=True).encode()).hexdigest()[:16]
+
+
+class GraphImageCache:
+    """
+    LangGraph 상태 그래프 이미지를 처음 요청될 때 한 번만 그리고, 구조 해시를 파일 이름과 ETag로 사용합니다.
+    같은 구조의 이미지가 이미 있으면 재시작/리로드 후에도 다시 그리지 않습니다.
+
+    renderer="png"는 pygraphviz, "mermaid"는 mermaid.ink(네트워크)를 사용합니다.
+    """
+
+    def __init__(self, directory: str, renderer: Literal["png", "mermaid"] = "png") -> None:
+        self.directory = directory
+        self.renderer = renderer
+        self._lock = threading.Lock()
+        self._graph = None
+        self._etag: Optional[str] = None
+        self._image: Optional[bytes] = None
+
+    def set_graph(self, graph) -> None:
+        with self._lock:
+            self._graph = graph
+            self._etag = graph_structure_hash(graph)
+            self._image = None
+
+    def _path(self) -> str:
+        return os.path.join(self.directory, f"state_graph-{self._etag}.png")
+
+    def _render(self) -> bytes:
+        with self._lock:
+            if self._image is not None:
+                return self._image
+            if self._graph is None:
+                raise HTTPException(status_code=503, detail="The graph is not initialized yet.")
+
+            path = self._path()
+            if not os.path.exists(path):
+                os.makedirs(self.directory, exist_ok=True)
+                logger.info(f"Rendering state graph to {path}")
+                drawable = self._graph.get_graph()
+                try:
+                    if self.renderer == "png":
+                        drawable.draw_png(output_file_path=path)
+                    else:
+                        drawable.draw_mermaid_png(output_file_path=path)
+                except Exception as e:
+                    # 일부만 쓰인 파일이 남으면 다음 요청부터 그 파일을 캐시로 사용하게 되므로 지움
+                    if os.path.exists(path):
+                        os.remove(path)
+                    raise HTTPException(status_code=503, detail=f"Graph rendering is not available: {e}")
+            with open(path, "rb") as f:
+                self._image = f.read()
+            return self._image
+
+    async def response(self, request: Request) -> Response:
+        if self._etag is None:
+            raise HTTPException(status_code=503, detail="The graph is not initialized yet.")
+        # ETag는 이미지를 얻은 뒤에만 붙임 (그리기에 실패하면 503만 반환하고 304로 응답하지 않음)
+        image = self._image if self._image is not None else await run_in_threadpool(self._render)
+        etag = f'"{self._etag}"'
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers=headers)
+        return Response(content=image, media_type="image/png", headers=headers)
@@ -0,0 +1,21 @@
+import os
+
+from langchain_ollama import ChatOllama
+
+from .llm_scheduler import DEFAULT_QUEUE_SIZE, DEFAULT_QUEUE_TIMEOUT_S, LLMScheduler, parse_limits
+
+LLM_MODEL = "llama3.1"
+
+# 모든 라우터가 공유하는 모델 (Ollama 인스턴스는 하나)
+llm_llama = ChatOllama(model=LLM_MODEL)
+
+# 생성 요청 승인 제어 (요청마다 llm_scheduler.acquire()로 슬롯을 얻은 뒤 생성)
+# LLM_CONCURRENCY: 모델별 동시 생성 수 (예: "llama3.1=2" 또는 "2")
+# LLM_QUEUE_SIZE, LLM_QUEUE_TIMEOUT_S: 모델별 대기열 길이와 최대 대기 시간
+llm_limits, llm_default_limit = parse_limits(os.environ.get("LLM_CONCURRENCY", ""))
+llm_scheduler = LLMScheduler(
+    llm_limits,
+    llm_default_limit,
+    queue_size=int(os.environ.get("LLM_QUEUE_SIZE", DEFAULT_QUEUE_SIZE)),
+    queue_timeout_s=float(os.environ.get("LLM_QUEUE_TIMEOUT_S", DEFAULT_QUEUE_TIMEOUT_S)),
+)
@@ -0,0 +1,244 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import math
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterable, AsyncIterator, Dict, List, Literal, Optional, Tuple, TypeVar
+
+import numpy as np
+from fastapi import HTTPException
+
+from .timeseries import TimeSeriesRing
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+Priority = Literal["interactive", "batch"]
+PRIORITY_ORDER: Dict[str, int] = {"interactive": 0, "batch": 1}  # 작을수록 먼저 처리
+
+DEFAULT_CONCURRENCY = 1  # 모델별 동시 생성 수 (Ollama의 OLLAMA_NUM_PARALLEL에 맞춤)
+DEFAULT_QUEUE_SIZE = 32  # 모델별 대기열 길이
+DEFAULT_QUEUE_TIMEOUT_S = 30.0  # 대기열에서 기다리는 최대 시간
+WAIT_HISTORY = 1024  # 대기 시간 백분위를 계산하는 최근 요청 수
+
+
+class AdmissionRejected(HTTPException):
+    """
+    대기열이 가득 찼거나 대기 시간이 기한을 넘은 요청. FastAPI가 429와 Retry-After로 응답합니다.
+    """
+
+    def __init__(self, model: str, reason: Literal["queue_full", "deadline"], retry_after: int) -> None:
+        self.model = model
+        self.reason = reason
+        self.retry_after = retry_after
+        super().__init__(
+            status_code=429,
+            detail=f"LLM {model} is busy ({reason}), retry after {retry_after} s",
+            headers={"Retry-After": str(retry_after)},
+        )
+
+
+@dataclass
+class ModelQueueStats:
+    admitted: int = 0
+    completed: int = 0
+    rejected_queue_full: int = 0
+    rejected_deadline: int = 0
+    max_queue_depth: int = 0
+    service_time_s: float = 0.0  # 생성 시간의 지수 이동 평균 (Retry-After 추정에 사용)
+
+
+@dataclass
+class _ModelQueue:
+    model: str
+    limit: int
+    running: int = 0
+    # (우선순위, 도착 순서, future) 힙. 취소/만료된 항목은 그 자리에서 제거
+    waiters: List[Tuple[int, int, asyncio.Future]] = field(default_factory=list)
+    waiting: int = 0
+    stats: ModelQueueStats = field(default_factory=ModelQueueStats)
+    wait_times: TimeSeriesRing = field(default_factory=lambda: TimeSeriesRing(WAIT_HISTORY))  # ms
+
+
+class LLMSlot:
+    """
+    LLMScheduler.acquire()로 얻은 생성 슬롯. release()는 여러 번 호출해도 한 번만 반영됩니다.
+    """
+
+    def __init__(self, scheduler: "LLMScheduler", model: str, priority: str, wait_s: float) -> None:
+        self.scheduler = scheduler
+        self.model = model
+        self.priority = priority
+        self.wait_s = wait_s
+        self._started = time.monotonic()
+        self._released = False
+
+    def release(self) -> None:
+        if not self._released:
+            self._released = True
+            self.scheduler._release(self.model, time.monotonic() - self._started)
+
+
+class LLMScheduler:
+    """
+    로컬 Ollama 앞에서 모델별 동시 생성 수를 제한하는 승인 제어기입니다.
+
+    슬롯이 없으면 우선순위(interactive > batch), 도착 순서로 대기열에 넣고, 대기열이 가득 차면 바로,
+    기한(queue_timeout_s) 안에 슬롯을 얻지 못하면 그때 AdmissionRejected(429)를 발생시킵니다.
+    Retry-After는 최근 생성 시간과 대기열 길이로 추정합니다.
+    """
+
+    def __init__(
+        self,
+        limits: Optional[Dict[str, int]] = None,
+        default_limit: int = DEFAULT_CONCURRENCY,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        queue_timeout_s: float = DEFAULT_QUEUE_TIMEOUT_S,
+    ) -> None:
+        self.limits = dict(limits or {})
+        self.default_limit = default_limit
+        self.queue_size = queue_size
+        self.queue_timeout_s = queue_timeout_s
+        self._queues: Dict[str, _ModelQueue] = {}
+        self._sequence = itertools.count()
+
+    def _queue(self, model: str) -> _ModelQueue:
+        queue = self._queues.get(model)
+        if queue is None:
+            queue = _ModelQueue(model, max(1, self.limits.get(model, self.default_limit)))
+            self._queues[model] = queue
+        return queue
+
+    def _retry_after(self, queue: _ModelQueue) -> int:
+        # 앞선 요청이 모두 끝날 때까지의 예상 시간 (생성 시간을 아직 모르면 1초)
+        service_time = queue.stats.service_time_s or 1.0
+        return max(1, math.ceil(service_time * (queue.waiting + 1) / queue.limit))
+
+    def _admit(self, queue: _ModelQueue, priority: str, wait_s: float) -> LLMSlot:
+        queue.running += 1
+        queue.stats.admitted += 1
+        queue.wait_times.append(wait_s * 1e3)
+        return LLMSlot(self, queue.model, priority, wait_s)
+
+    async def acquire(
+        self,
+        model: str,
+        priority: Priority = "interactive",
+        timeout_s: Optional[float] = None,
+    ) -> LLMSlot:
+        """
+        생성 슬롯을 얻을 때까지 기다립니다. 사용이 끝나면 반드시 LLMSlot.release()를 호출해야 합니다.
+        """
+        queue = self._queue(model)
+        if queue.running < queue.limit and queue.waiting == 0:
+            return self._admit(queue, priority, 0.0)
+        if queue.waiting >= self.queue_size:
+            queue.stats.rejected_queue_full += 1
+            raise AdmissionRejected(model, "queue_full", self._retry_after(queue))
+
+        start = time.monotonic()
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(queue.waiters, (PRIORITY_ORDER[priority], next(self._sequence), future))
+        queue.waiting += 1
+        queue.stats.max_queue_depth = max(queue.stats.max_queue_depth, queue.waiting)
+        try:
+            await asyncio.wait_for(asyncio.shield(future), self.queue_timeout_s if timeout_s is None else timeout_s)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if future.done() and not future.cancelled():
+                # 슬롯을 넘겨받은 직후에 만료/취소됨 -> 다음 대기자에게 넘김
+                queue.running -= 1
+                self._wake(queue)
+            else:
+                future.cancel()
+                queue.waiting -= 1
+                self._discard(queue, future)
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            queue.stats.rejected_deadline += 1
+            raise AdmissionRejected(model, "deadline", self._retry_after(queue))
+        queue.running -= 1  # _wake()에서 미리 잡아 둔 슬롯을 _admit()에서 다시 셈
+        return self._admit(queue, priority, time.monotonic() - start)
+
+    def _discard(self, queue: _ModelQueue, future: asyncio.Future) -> None:
+        # 대기를 그만둔 요청의 항목을 힙에서 제거 (슬롯이 계속 사용 중이어도 취소된 항목이 쌓이지 않음)
+        for index, (_, _, waiter) in enumerate(queue.waiters):
+            if waiter is future:
+                queue.waiters[index] = queue.waiters[-1]
+                queue.waiters.pop()
+                heapq.heapify(queue.waiters)
+                return
+
+    def _wake(self, queue: _ModelQueue) -> None:
+        while queue.running < queue.limit and queue.waiters:
+            _, _, future = heapq.heappop(queue.waiters)
+            if future.cancelled():
+                continue
+            queue.waiting -= 1
+            queue.running += 1
+            future.set_result(None)
+
+    def _release(self, model: str, service_s: float) -> None:
+        queue = self._queues[model]
+        queue.running -= 1
+        queue.stats.completed += 1
+        stats = queue.stats
+        stats.service_time_s = service_s if not stats.service_time_s else 0.8 * stats.service_time_s + 0.2 * service_s
+        self._wake(queue)
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        model: str,
+        priority: Priority = "interactive",
+        timeout_s: Optional[float] = None,
+    ) -> AsyncIterator[LLMSlot]:
+        slot = await self.acquire(model, priority, timeout_s)
+        try:
+            yield slot
+        finally:
+            slot.release()
+
+    def get_stats(self) -> Dict[str, Any]:
+        result = {}
+        for model, queue in list(self._queues.items()):
+            stats = vars(queue.stats).copy()
+            stats.update(limit=queue.limit, running=queue.running, queue_depth=queue.waiting)
+            wait_times = queue.wait_times.snapshot().values
+            if wait_times.size:
+                p50, p95, p99 = np.percentile(wait_times, [50, 95, 99])
+                stats.update(wait_ms_p50=float(p50), wait_ms_p95=float(p95), wait_ms_p99=float(p99))
+            result[model] = stats
+        return result
+
+
+def parse_limits(spec: str) -> Tuple[Dict[str, int], int]:
+    """
+    "llama3.1=2,qwen2.5=1,4" 형식 -> ({"llama3.1": 2, "qwen2.5": 1}, 4). 숫자만 있는 항목은 기본값
+    """
+    limits: Dict[str, int] = {}
+    default = DEFAULT_CONCURRENCY
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        if "=" in item:
+            model, limit = item.rsplit("=", 1)
+            limits[model.strip()] = int(limit)
+        else:
+            default = int(item)
+    return limits, default
+
+
+async def release_after(stream: AsyncIterable[T], slot: LLMSlot) -> AsyncIterator[T]:
+    """
+    스트림이 끝나거나 클라이언트가 끊으면 슬롯을 반환합니다. (StreamingResponse 본문용)
+    """
+    try:
+        async for item in stream:
+            yield item
+    finally:
+        slot.release()
@@ -0,0 +1,188 @@
+import hashlib
+import json
+import logging
+import re
+import time
+import unicodedata
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import aiosqlite
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+
+logger = logging.getLogger(__name__)
+
+RESPONSE_CACHE_TTL_S = 600.0
+RESPONSE_CACHE_DISK_CAPACITY = 4096
+HISTORY_TURNS = 4  # 키에 포함하는 직전 대화 메시지 수
+# 키에 쓰는 차량 상태의 양자화 단위 (없는 채널은 유효숫자 2자리)
+DEFAULT_QUANTIZATION_STEPS = {"speed": 5.0, "steering": 10.0}
+
+
+def normalize_text(text: str) -> str:
+    # 대소문자, 구두점, 공백 차이를 무시 ("Am I speeding?" == "am i  speeding")
+    text = unicodedata.normalize("NFKC", text).casefold()
+    return " ".join(re.sub(r"[^\w\s]", " ", text).split())
+
+
+def history_hash(messages: Sequence[BaseMessage], turns: int = HISTORY_TURNS) -> str:
+    digest = hashlib.sha256()
+    for message in messages[-turns:] if turns else ():
+        digest.update(f"{message.type}\0{normalize_text(str(message.content))}\0".encode())
+    return digest.hexdigest()[:16]
+
+
+def response_cache_key(text: str, history: Sequence[BaseMessage], signature: str) -> str:
+    """
+    정규화한 사용자 질의 + 직전 대화 해시 + 양자화한 차량 상태 서명
+    """
+    key = json.dumps([normalize_text(text), history_hash(history), signature], ensure_ascii=False)
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+class ResponseCache:
+    """
+    채팅 응답 캐시. 메모리 계층(LRU + TTL)을 먼저 조회하고, path가 있으면 sqlite 계층을 조회해
+    찾은 항목을 메모리로 올립니다. capacity가 0이면 사용하지 않습니다.
+
+    sqlite 계층은 open()/close()로 연결을 관리하며 disk_capacity를 넘으면 오래 사용하지 않은 항목부터 지웁니다.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 0,
+        ttl_s: float = RESPONSE_CACHE_TTL_S,
+        path: Optional[str] = None,
+        disk_capacity: int = RESPONSE_CACHE_DISK_CAPACITY,
+    ) -> None:
+        self.capacity = capacity
+        self.ttl_s = ttl_s
+        self.path = path
+        self.disk_capacity = disk_capacity
+        self._memory: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()  # 키 -> (만료 monotonic, 응답)
+        self._db: Optional[aiosqlite.Connection] = None
+        self.stats: Dict[str, int] = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "evictions": 0,
+            "expirations": 0,
+        }
+
+    @property
+    def enabled(self) -> bool:
+        return self.capacity > 0
+
+    async def open(self) -> None:
+        if not self.enabled or not self.path or self._db is not None:
+            return
+        self._db = await aiosqlite.connect(self.path)
+        await self._db.execute(
+            "CREATE TABLE IF NOT EXISTS response_cache "
+            "(key TEXT PRIMARY KEY, answer TEXT NOT NULL, expires REAL NOT NULL, used REAL NOT NULL)"
+        )
+        await self._db.execute("DELETE FROM response_cache WHERE expires <= ?", (time.time(),))
+        await self._db.commit()
+        logger.info(f"Response cache sqlite tier opened: {self.path}")
+
+    async def close(self) -> None:
+        if self._db is not None:
+            await self._db.close()
+            self._db = None
+
+    def _remember(self, key: str, answer: str, ttl_s: float) -> None:
+        self._memory[key] = (time.monotonic() + ttl_s, answer)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.capacity:
+            self._memory.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    async def get(self, key: str) -> Optional[str]:
+        if not self.enabled:
+            return None
+        entry = self._memory.get(key)
+        if entry is not None:
+            if entry[0] > time.monotonic():
+                self._memory.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                return entry[1]
+            del self._memory[key]
+            self.stats["expirations"] += 1
+
+        if self._db is not None:
+            now = time.time()
+            async with self._db.execute("SELECT answer, expires FROM response_cache WHERE key = ?", (key,)) as cursor:
+                row = await cursor.fetchone()
+            if row is not None:
+                answer, expires = row
+                if expires > now:
+                    await self._db.execute("UPDATE response_cache SET used = ? WHERE key = ?", (now, key))
+                    await self._db.commit()
+                    self._remember(key, answer, expires - now)
+                    self.stats["disk_hits"] += 1
+                    return answer
+                await self._db.execute("DELETE FROM response_cache WHERE key = ?", (key,))
+                await self._db.commit()
+                self.stats["expirations"] += 1
+
+        self.stats["misses"] += 1
+        return None
+
+    async def put(self, key: str, answer: str) -> None:
+        if not self.enabled or not answer:
+            return
+        self._remember(key, answer, self.ttl_s)
+        self.stats["stores"] += 1
+        if self._db is not None:
+            now = time.time()
+            await self._db.execute(
+                "INSERT OR REPLACE INTO response_cache (key, answer, expires, used) VALUES (?, ?, ?, ?)",
+                (key, answer, now + self.ttl_s, now),
+            )
+            await self._db.execute("DELETE FROM response_cache WHERE expires <= ?", (now,))
+            await self._db.execute(
+                "DELETE FROM response_cache WHERE key IN "
+                "(SELECT key FROM response_cache ORDER BY used DESC LIMIT -1 OFFSET ?)",
+                (self.disk_capacity,),
+            )
+            await self._db.commit()
+
+    def get_stats(self) -> Dict[str, Any]:
+        hits = self.stats["memory_hits"] + self.stats["disk_hits"]
+        total = hits + self.stats["misses"]
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._memory),
+            "capacity": self.capacity,
+            "ttl_s": self.ttl_s,
+            "sqlite": self.path if self._db is not None else None,
+            **self.stats,
+            "hit_rate": hits / total if total else None,
+        }
+
+
+def replay_events(
+    answer: str,
+    parent_ids: List[str],
+    metadata: Dict[str, Any],
+    name: str = "response_cache",
+) -> Iterator[Dict[str, Any]]:
+    """
+    캐시한 응답을 astream_events(v2)의 채팅 모델 이벤트(start -> stream -> end)로 다시 만듭니다.
+    클라이언트는 실제 생성과 같은 on_chat_model_stream 이벤트로 응답을 받습니다.
+    """
+    run_id = str(uuid.uuid4())
+    base = {
+        "name": name,
+        "run_id": run_id,
+        "parent_ids": parent_ids,
+        "tags": ["cached"],
+        "metadata": {**metadata, "cached": True},
+    }
+    yield {**base, "event": "on_chat_model_start", "data": {}}
+    # 단어(뒤따르는 공백 포함) 단위로 나눠 스트리밍
+    for piece in re.findall(r"\S+\s*|\s+", answer):
+        yield {**base, "event": "on_chat_model_stream", "data": {"chunk": AIMessageChunk(content=piece, id=run_id)}}
+    yield {**base, "event": "on_chat_model_end", "data": {"output": AIMessage(content=answer, id=run_id)}}
@@ -1 +1 @@
-from .router import chatbot_router
\ No newline at end of file
+from .router import chatbot_lifespan, chatbot_router
\ No newline at end of file
@@ -1,31 +1,76 @@
-import json
+import asyncio
 import logging
 import os
-from typing import Annotated, AsyncIterable, Dict, List, Optional, Union
-
-import aiosqlite
-from fastapi import APIRouter
-from fastapi.responses import FileResponse, StreamingResponse
-from langchain_core.messages import BaseMessage, HumanMessage
-from langchain_core.runnables.schema import StreamEvent
-from langchain_ollama import ChatOllama
-from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+from contextlib import asynccontextmanager
+from typing import Annotated, AsyncIterable, AsyncIterator, Dict, List, Optional, Tuple, Union
+
+from fastapi import APIRouter, Header, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage, HumanMessage, message_chunk_to_message
+from langchain_core.runnables import RunnableConfig
 from langgraph.graph import END, START, StateGraph
 from langgraph.graph.message import add_messages
+from langgraph.graph.state import CompiledStateGraph
 from typing_extensions import TypedDict
 
-from ...scaner_udp import ScanerFilterServer
-from ...types import AssistantMessage, ChatRequest, UserMessage
-from ...utils import convert_serializable
+from ...chat_history import (
+    HISTORY_FOLD_TURNS,
+    HISTORY_SUMMARY_TOKENS,
+    HISTORY_TOKENS,
+    HISTORY_TURNS,
+    HistoryWindow,
+)
+from ...chat_runs import CHAT_RUN_BUFFER_EVENTS, CHAT_RUN_GRACE_S, ChatRunManager
+from ...checkpoint_store import (
+    CHECKPOINT_KEEP,
+    CHECKPOINT_READERS,
+    SESSIONS_MAX_PAGE_SIZE,
+    SESSIONS_PAGE_SIZE,
+    PooledSqliteSaver,
+    open_checkpointer,
+)
+from ...graph_image import GraphImageCache
+from ...llm import LLM_MODEL, llm_llama, llm_scheduler
+from ...llm_scheduler import release_after
+from ...response_cache import (
+    DEFAULT_QUANTIZATION_STEPS,
+    RESPONSE_CACHE_TTL_S,
+    ResponseCache,
+    replay_events,
+    response_cache_key,
+)
+from ...sensor_summary import SENSOR_CONTEXT_TOKENS
+from ...sensors import sensor_context_cache, sensor_summarizer
+from ...types import AssistantMessage, ChatRequest, EventFilter, UserMessage
+from ...utils import encode_event
 
 logger = logging.getLogger(__name__)
 
-os.makedirs("assets/chatbot", exist_ok=True)
+CHATBOT_ASSETS_DIR = "assets/chatbot"
+CHECKPOINT_PATH = os.path.join(CHATBOT_ASSETS_DIR, "checkpoint.sqlite")
 
-llm_llama = ChatOllama(model="llama3.1")
-
-sensor_server = ScanerFilterServer()
-sensor_server.activate()
+# 프롬프트에 넣는 차량 상태 요약의 토큰 예산
+sensor_context_tokens = int(os.environ.get("SENSOR_CONTEXT_TOKENS", SENSOR_CONTEXT_TOKENS))
+# 응답 캐시 (RESPONSE_CACHE_SIZE가 0이면 사용하지 않음, RESPONSE_CACHE_FILE이 있으면 sqlite 계층 추가)
+response_cache = ResponseCache(
+    int(os.environ.get("RESPONSE_CACHE_SIZE", 0)),
+    float(os.environ.get("RESPONSE_CACHE_TTL_S", RESPONSE_CACHE_TTL_S)),
+    os.environ.get("RESPONSE_CACHE_FILE"),
+)
+# 대화 기록 창 (HISTORY_TURNS개 턴을 HISTORY_TOKENS 안에서 그대로 보내고 나머지는 누적 요약, HISTORY_TOKENS=0이면 전체 기록)
+# HISTORY_FOLD_TURNS: 밀려난 턴을 이만큼 모아 한 번에 요약
+history_window = HistoryWindow(
+    int(os.environ.get("HISTORY_TURNS", HISTORY_TURNS)),
+    int(os.environ.get("HISTORY_TOKENS", HISTORY_TOKENS)),
+    int(os.environ.get("HISTORY_SUMMARY_TOKENS", HISTORY_SUMMARY_TOKENS)),
+    int(os.environ.get("HISTORY_FOLD_TURNS", HISTORY_FOLD_TURNS)),
+)
+# 재개 가능한 SSE 실행 (CHAT_RUN_GRACE_S: 연결이 모두 끊긴 뒤 생성을 유지하는 시간)
+chat_runs = ChatRunManager(
+    float(os.environ.get("CHAT_RUN_GRACE_S", CHAT_RUN_GRACE_S)),
+    int(os.environ.get("CHAT_RUN_BUFFER_EVENTS", CHAT_RUN_BUFFER_EVENTS)),
+)
 
 
 chatbot_router = APIRouter(prefix="/chatbot", tags=["chatbot"])
@@ -34,19 +79,49 @@ chatbot_router = APIRouter(prefix="/chatbot", tags=["chatbot"])
 class State(TypedDict):
     messages: Annotated[List, add_messages]
     contexts: Dict[str, str]
+    cache_key: Optional[str]  # 캐시에 없던 질의의 키 (생성 후 저장)
+    summary: Optional[str]  # 창에서 밀려난 대화의 누적 요약
+
+
+def cache_key_for(question: BaseMessage, history: List[BaseMessage]) -> str:
+    signature = sensor_summarizer.signature(DEFAULT_QUANTIZATION_STEPS)
+    return response_cache_key(str(question.content), history, signature)
+
+
+async def node_response_cache_lookup(state: State, config: RunnableConfig):
+    if not response_cache.enabled:
+        return {"cache_key": None}
+    # 엔드포인트가 슬롯을 얻기 전에 조회한 결과가 있으면 그대로 사용 (prefetch_cached_answer)
+    lookup: Optional[Tuple[str, Optional[str]]] = config["configurable"].get("response_cache_lookup")
+    if lookup is not None:
+        key, answer = lookup
+    else:
+        messages: List[BaseMessage] = state["messages"]
+        key = cache_key_for(messages[-1], messages[:-1])
+        answer = await response_cache.get(key)
+    if answer is None:
+        return {"cache_key": key}
+    # 캐시 적중: 응답을 그대로 대화에 추가하고 생성을 건너뜀 (스트림에서는 replay_events()로 재생)
+    return {"cache_key": None, "messages": [AIMessage(content=answer, response_metadata={"cached": True})]}
+
+
+def route_after_cache_lookup(state: State) -> str:
+    return END if isinstance(state["messages"][-1], AIMessage) else "vehicle_context"
+
 
+async def node_response_cache_store(state: State):
+    if state.get("cache_key") and state["messages"][-1].content:
+        await response_cache.put(state["cache_key"], str(state["messages"][-1].content))
+    return {"cache_key": None}
 
-def node_vehicle_context_fetch(state: State):
-    sensor_data = sensor_server.get_sensor_data()
-    sensor_context = {
-        "Steering Angle": str(sensor_data.get("steering", [])),
-        "Speed": str(sensor_data.get("speed", [])),
-    }
-    state["contexts"] = sensor_context
+
+async def node_vehicle_context_fetch(state: State):
+    # 수신 시점에 갱신해 둔 특징(현재 값, 추세, 범위, 이벤트)의 요약. 같은 버전이면 캐시를 공유
+    state["contexts"] = sensor_context_cache.get(sensor_context_tokens)
     return state
 
 
-def node_llama_chatbot(state: State):
+async def node_llama_chatbot(state: State):
     # 프롬프트를 통해 차량의 상태는 사용자가 질문하기 전까지는 언급하지 않도록 하는 것이 필요할 수 있음
     # 차량의 상태를 사용자의 질의를 생성
     user_query: HumanMessage = state["messages"][-1]
@@ -55,36 +130,78 @@ def node_llama_chatbot(state: State):
     for key, value in state["contexts"].items():
         user_query_message += f"{key}: {value}\n"
 
-    # 차량의 상태를 포함한 질의를 LLM에 주입
-    query: List[BaseMessage] = state["messages"]
-    query[-1].content = user_query_message
+    # 차량의 상태를 포함한 질의를 LLM에 주입 (대화 기록의 메시지는 바꾸지 않음)
+    # 누적 요약 + 창 안의 최근 기록을 보냄. 저장된 기록은 fold_history()가 응답 뒤에 줄이지만, 요약이 실패하거나
+    # 예약되지 않아도 프롬프트가 커지지 않도록 여기서 창 크기로 자름
+    recent: List[BaseMessage] = history_window.window(state["messages"])
+    query: List[BaseMessage] = history_window.prompt(
+        state.get("summary"), recent[:-1] + [HumanMessage(content=user_query_message)]
+    )
 
-    result = llm_llama.invoke(query)
-    return {"messages": [result]}
+    # 이벤트 루프를 막지 않고 토큰 단위로 생성 (astream_events의 on_chat_model_stream으로 바로 전달됨)
+    result: Optional[AIMessageChunk] = None
+    async for chunk in llm_llama.astream(query):
+        result = chunk if result is None else result + chunk
+    if result is None:
+        # 모델이 청크 없이 스트림을 끝낸 경우 (빈 응답은 캐시하지 않음)
+        logger.warning("The LLM stream ended without any chunk")
+        return {"messages": [AIMessage(content="")]}
+    return {"messages": [message_chunk_to_message(result)]}
 
 
 graph_builder = StateGraph(State)
 # Add Nodes
 graph_builder.add_node("chatbot", node_llama_chatbot)
 graph_builder.add_node("vehicle_context", node_vehicle_context_fetch)
+graph_builder.add_node("response_cache", node_response_cache_lookup)
+graph_builder.add_node("response_cache_store", node_response_cache_store)
 # Add Edges
-graph_builder.add_edge(START, "vehicle_context")
+graph_builder.add_edge(START, "response_cache")
+graph_builder.add_conditional_edges("response_cache", route_after_cache_lookup, ["vehicle_context", END])
 graph_builder.add_edge("vehicle_context", "chatbot")
-graph_builder.add_edge("chatbot", END)
-# Compile the graph
-sqlite_conn = aiosqlite.connect("assets/chatbot/checkpoint.sqlite")
-memory = AsyncSqliteSaver(sqlite_conn)
-simple_chat_graph = graph_builder.compile(
-    checkpointer=memory,
-)
-simple_chat_graph.get_graph().draw_png(
-    output_file_path="assets/chatbot/state_graph.png",
-)
+graph_builder.add_edge("chatbot", "response_cache_store")
+graph_builder.add_edge("response_cache_store", END)
+
+# 체크포인터 연결과 그래프 컴파일은 chatbot_lifespan()에서 수행 (import 시 부수 효과 없음)
+memory: Optional[PooledSqliteSaver] = None
+simple_chat_graph: Optional[CompiledStateGraph] = None
+graph_image = GraphImageCache(CHATBOT_ASSETS_DIR)
+# 응답 뒤에 실행 중인 대화 기록 요약 작업 (thread_id -> 작업)
+history_folds: Dict[str, asyncio.Task] = {}
+
+
+@asynccontextmanager
+async def chatbot_lifespan() -> AsyncIterator[None]:
+    global memory, simple_chat_graph
+
+    os.makedirs(CHATBOT_ASSETS_DIR, exist_ok=True)
+    # CHECKPOINT_KEEP: 세션별로 남기는 최근 체크포인트 수 (0이면 정리하지 않음), CHECKPOINT_READERS: 읽기 연결 수
+    async with open_checkpointer(
+        CHECKPOINT_PATH,
+        readers=int(os.environ.get("CHECKPOINT_READERS", CHECKPOINT_READERS)),
+        keep=int(os.environ.get("CHECKPOINT_KEEP", CHECKPOINT_KEEP)),
+    ) as checkpointer:
+        memory = checkpointer
+        simple_chat_graph = graph_builder.compile(checkpointer=memory)
+        # 그래프 이미지는 /state-graph가 처음 요청될 때 그림
+        graph_image.set_graph(simple_chat_graph)
+        await response_cache.open()
+        try:
+            yield
+        finally:
+            await chat_runs.close()
+            folds = list(history_folds.values())
+            for task in folds:
+                task.cancel()
+            await asyncio.gather(*folds, return_exceptions=True)
+            await response_cache.close()
+            simple_chat_graph = None
+            memory = None
 
 
 @chatbot_router.get("/state-graph")
-def get_chat_graph_image() -> FileResponse:
-    return FileResponse("assets/chatbot/state_graph.png")
+async def get_chat_graph_image(request: Request) -> Response:
+    return await graph_image.response(request)
 
 
 @chatbot_router.post("/")
@@ -92,45 +209,223 @@ async def chat_endpoint(chat_req: ChatRequest) -> StreamingResponse:
     if not chat_req.messages:
         return {"error": "No messages provided."}
 
-    return StreamingResponse(stream_events(chat_req.messages, session=chat_req.session))
+    # 캐시에 있는 응답은 LLM을 쓰지 않으므로 슬롯을 얻기 전에 조회
+    question = user_input_messages(chat_req.messages)
+    lookup = await prefetch_cached_answer(question, chat_req.session)
+    events = fold_history_after(
+        stream_events(chat_req.messages, chat_req.session, chat_req.event_filter, lookup), chat_req.session
+    )
+    if lookup is not None and lookup[1] is not None:
+        return StreamingResponse(events)
+
+    # 스트림을 시작하기 전에 슬롯을 얻어야 대기열이 가득 찼을 때 429로 응답할 수 있음
+    slot = await llm_scheduler.acquire(LLM_MODEL, chat_req.priority)
+    return StreamingResponse(
+        release_after(events, slot),
+        # 본문이 한 번도 시작되지 않은 경우에도 슬롯을 반환 (release()는 한 번만 반영됨)
+        background=BackgroundTask(slot.release),
+    )
+
+
+@chatbot_router.post("/runs")
+async def start_chat_run(chat_req: ChatRequest) -> StreamingResponse:
+    """
+    /chatbot/과 같은 이벤트를 SSE로 보냅니다. 이벤트마다 id(순번)가 붙으며, 연결이 끊기면
+    GET /chatbot/runs/{run_id}/events에 Last-Event-ID를 보내 놓친 이벤트부터 이어 받습니다.
+    """
+    if not chat_req.messages:
+        raise HTTPException(status_code=400, detail="No messages provided.")
+
+    question = user_input_messages(chat_req.messages)
+    lookup = await prefetch_cached_answer(question, chat_req.session)
+    events = fold_history_after(
+        stream_events(chat_req.messages, chat_req.session, chat_req.event_filter, lookup), chat_req.session
+    )
+    if lookup is not None and lookup[1] is not None:
+        run = chat_runs.start(events)
+    else:
+        slot = await llm_scheduler.acquire(LLM_MODEL, chat_req.priority)
+        # 생성은 연결과 분리된 백그라운드 작업이 소유하며, 끝나면 슬롯을 반환
+        run = chat_runs.start(events, slot.release)
+    return sse_response(run.run_id, 0)
+
+
+@chatbot_router.get("/runs/{run_id}/events")
+async def resume_chat_run(
+    run_id: str,
+    last_event_id: Optional[str] = Header(default=None),
+) -> StreamingResponse:
+    run = chat_runs.get(run_id)
+    if run is None:
+        raise HTTPException(status_code=404, detail=f"Unknown or expired run: {run_id}")
+    try:
+        last_sequence = int(last_event_id) if last_event_id else 0
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid Last-Event-ID: {last_event_id}")
+    # 아직 보내지 않은 순번을 받으면 구독이 그 순번까지 아무것도 받지 못하고 멈춤
+    if not 0 <= last_sequence <= run.sequence:
+        raise HTTPException(
+            status_code=400, detail=f"Last-Event-ID {last_sequence} is outside the run (0..{run.sequence})"
+        )
+    return sse_response(run_id, last_sequence)
+
+
+def sse_response(run_id: str, last_sequence: int) -> StreamingResponse:
+    return StreamingResponse(
+        chat_runs.subscribe(chat_runs.get(run_id), last_sequence),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Run-Id": run_id,
+            "Content-Location": f"{chatbot_router.prefix}/runs/{run_id}/events",
+        },
+    )
+
+
+@chatbot_router.get("/runs")
+def get_chat_run_stats():
+    return chat_runs.get_stats()
+
+
+@chatbot_router.get("/checkpoints")
+def get_checkpoint_stats():
+    return memory.get_stats() if memory is not None else {}
+
+
+@chatbot_router.get("/scheduler")
+def get_scheduler_stats():
+    return llm_scheduler.get_stats()
+
+
+@chatbot_router.get("/history")
+def get_history_window_stats():
+    return history_window.get_stats()
+
+
+@chatbot_router.get("/response-cache")
+def get_response_cache_stats():
+    return response_cache.get_stats()
 
 
 @chatbot_router.get("/sessions")
-def list_sessions():
-    sessions = set()
-    for session in memory.list(None):
-        sessions.add(session.config["configurable"]["thread_id"])
-    return {"sessions": list(sessions)}
+async def list_sessions(
+    limit: int = Query(default=SESSIONS_PAGE_SIZE, ge=1, le=SESSIONS_MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    active_since: Optional[float] = Query(default=None, description="이 시각(unix 초) 이후에 활동한 세션만"),
+):
+    """
+    세션 인덱스에서 최근 활동 순으로 한 페이지를 반환합니다. 다음 페이지는 next_cursor를 cursor로 넘겨 조회합니다.
+    sessions는 thread_id 목록, items는 생성/마지막 활동 시각과 턴 수입니다.
+    """
+    if memory is None:
+        raise HTTPException(status_code=503, detail="Checkpointer is not open yet")
+    try:
+        items, next_cursor = await memory.list_sessions(limit, cursor, active_since)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"sessions": [item["thread_id"] for item in items], "items": items, "next_cursor": next_cursor}
 
 
-async def stream_events(
-    messages: List[Union[UserMessage, AssistantMessage]],
-    session: Optional[str] = None,
-) -> AsyncIterable[str]:
+def user_input_messages(messages: List[Union[UserMessage, AssistantMessage]]) -> List[HumanMessage]:
     user_input = []
     for message in reversed(messages):
         # 현재는 Text Content만 지원
         if message.role == "user":
             if type(message.content) == str:
-                user_input.append((message.role, message.content))
+                user_input.append(HumanMessage(content=message.content))
                 break
             else:
                 content_type = type(message.content).__name__
-                user_input.append((message.role, f"(Unknown Content: {content_type})"))
+                user_input.append(HumanMessage(content=f"(Unknown Content: {content_type})"))
+    return user_input
 
-    langgraph_input = {"messages": user_input}
-    config = {
-        "configurable": {"thread_id": session if session is not None else "default"}
-    }
+
+def thread_config(session: Optional[str]) -> RunnableConfig:
+    return {"configurable": {"thread_id": session if session is not None else "default"}}
+
+
+async def prefetch_cached_answer(
+    user_input: List[HumanMessage], session: Optional[str]
+) -> Optional[Tuple[str, Optional[str]]]:
+    """
+    그래프를 시작하기 전에 응답 캐시를 조회합니다. 키는 response_cache 노드와 같이 저장된 대화 기록으로 만들며,
+    (키, 응답 또는 None)을 stream_events()에 넘기면 노드가 다시 조회하지 않습니다.
+    """
+    if not response_cache.enabled or not user_input:
+        return None
+    snapshot = await simple_chat_graph.aget_state(thread_config(session))
+    history = list(snapshot.values.get("messages", [])) + user_input[:-1]
+    key = cache_key_for(user_input[-1], history)
+    return key, await response_cache.get(key)
+
+
+async def stream_events(
+    messages: List[Union[UserMessage, AssistantMessage]],
+    session: Optional[str] = None,
+    event_filter: Optional[EventFilter] = None,
+    cache_lookup: Optional[Tuple[str, Optional[str]]] = None,
+) -> AsyncIterable[bytes]:
+    langgraph_input = {"messages": user_input_messages(messages)}
+    config = thread_config(session)
+    if cache_lookup is not None:
+        config["configurable"]["response_cache_lookup"] = cache_lookup
     async for event in simple_chat_graph.astream_events(
         langgraph_input,
         config=config,
         version="v2",
     ):
-        response = generate_event_response(event)
-        yield response + "\n"  # ndjson 형식으로 반환
+        # 필터에 맞지 않는 이벤트는 직렬화하지 않음
+        if event_filter is None or event_filter.matches(event):
+            yield encode_event(event)  # ndjson 형식으로 반환
+        if event["event"] == "on_chain_end" and event["name"] == "response_cache":
+            for message in event["data"].get("output", {}).get("messages", []):
+                # 캐시한 응답을 실제 생성과 같은 on_chat_model_stream 이벤트로 재생
+                # (이름은 모델과 같게 두어 names 필터에도 똑같이 걸리도록 함)
+                replayed_events = replay_events(
+                    str(message.content), [event["run_id"]], event["metadata"], name=llm_llama.get_name()
+                )
+                for replayed in replayed_events:
+                    if event_filter is None or event_filter.matches(replayed):
+                        yield encode_event(replayed)
+
+
+async def fold_history(session: Optional[str]) -> None:
+    """
+    창에서 밀려난 턴을 누적 요약에 합칩니다. 응답을 보낸 뒤 호출되며, 답변 생성 슬롯과 별도로 batch 우선순위 슬롯을
+    얻으므로 요약이 대기 중인 대화 요청보다 먼저 실행되지 않습니다.
+    """
+    config = thread_config(session)
+    snapshot = await simple_chat_graph.aget_state(config)
+    messages = snapshot.values.get("messages", [])
+    if not history_window.fold_start(messages):
+        return
+    async with llm_scheduler.slot(LLM_MODEL, "batch"):
+        update = await history_window.update(llm_llama, snapshot.values.get("summary"), messages)
+    if update:
+        await simple_chat_graph.aupdate_state(config, update, as_node="response_cache_store")
+
+
+async def _run_history_fold(session: Optional[str]) -> None:
+    try:
+        await fold_history(session)
+    except Exception:
+        # 요약하지 못한 메시지는 남아 있으므로 다음 응답 뒤에 다시 시도
+        logger.exception(f"History summary failed for session {session}")
+
+
+def schedule_history_fold(session: Optional[str]) -> None:
+    thread_id = thread_config(session)["configurable"]["thread_id"]
+    if thread_id in history_folds:
+        return  # 같은 세션의 요약이 진행 중 (남은 턴은 다음 응답 뒤에 확인)
+    task = asyncio.create_task(_run_history_fold(session))
+    history_folds[thread_id] = task
+    task.add_done_callback(lambda _: history_folds.pop(thread_id, None))
 
 
-def generate_event_response(event: StreamEvent) -> str:
-    event["data"] = convert_serializable(event["data"])
-    return json.dumps(event)
+async def fold_history_after(stream: AsyncIterable[bytes], session: Optional[str]) -> AsyncIterator[bytes]:
+    """
+    스트림을 끝까지 전달한 뒤 대화 기록 요약을 예약합니다. (요약은 첫 토큰 지연과 답변 슬롯에 영향 없음)
+    """
+    async for item in stream:
+        yield item
+    schedule_history_fold(session)
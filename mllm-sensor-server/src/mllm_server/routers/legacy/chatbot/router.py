@@ -1,20 +1,27 @@
 import json
 import logging
 import os
-from typing import Annotated, AsyncIterable, List, Union
+from contextlib import asynccontextmanager
+from typing import Annotated, AsyncIterable, AsyncIterator, List, Union
 
-from fastapi import APIRouter
-from fastapi.responses import FileResponse, StreamingResponse
+from fastapi import APIRouter, Request, Response
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 from langchain_core.runnables.schema import StreamEvent
-from langchain_ollama import ChatOllama
 from langgraph.graph import END, START, StateGraph
 from langgraph.graph.message import add_messages
 from typing_extensions import TypedDict
 
 from ....types import AssistantMessage, ChatRequest, UserMessage
+from ....graph_image import GraphImageCache
+from ....llm import LLM_MODEL, llm_llama, llm_scheduler
+from ....llm_scheduler import release_after
 from ....utils import convert_serializable
 
 logger = logging.getLogger(__name__)
+
+CHATBOT_ASSETS_DIR = "assets/chatbot"
+
 chatbot_router = APIRouter(prefix="/service/chatbot", tags=["chatbot"])
 
 
@@ -22,9 +29,7 @@ class State(TypedDict):
     messages: Annotated[list, add_messages]
 
 
-os.makedirs("assets/chatbot", exist_ok=True)
 graph_builder = StateGraph(State)
-llm_llama = ChatOllama(model="llama3.1")
 
 
 def node_llama_chatbot(state: State):
@@ -35,14 +40,21 @@ graph_builder.add_node("chatbot", node_llama_chatbot)
 graph_builder.add_edge(START, "chatbot")
 graph_builder.add_edge("chatbot", END)
 simple_chat_graph = graph_builder.compile()
-simple_chat_graph.get_graph().draw_mermaid_png(
-    output_file_path="assets/chatbot/state_graph.png"
-)
+# 그래프 이미지는 /state-graph가 처음 요청될 때 그림 (mermaid.ink 사용)
+graph_image = GraphImageCache(CHATBOT_ASSETS_DIR, renderer="mermaid")
+
+
+@asynccontextmanager
+async def chatbot_lifespan() -> AsyncIterator[None]:
+    # 이미지 디렉터리 생성은 앱 시작 시 수행 (import 시 부수 효과 없음)
+    os.makedirs(CHATBOT_ASSETS_DIR, exist_ok=True)
+    graph_image.set_graph(simple_chat_graph)
+    yield
 
 
 @chatbot_router.get("/state-graph")
-def get_chat_graph_image() -> FileResponse:
-    return FileResponse("assets/chatbot/state_graph.png")
+async def get_chat_graph_image(request: Request) -> Response:
+    return await graph_image.response(request)
 
 
 @chatbot_router.post("/")
@@ -50,7 +62,11 @@ async def chat_endpoint(chat_req: ChatRequest) -> StreamingResponse:
     if not chat_req.messages:
         return {"error": "No messages provided."}
 
-    return StreamingResponse(stream_events(chat_req.messages))
+    slot = await llm_scheduler.acquire(LLM_MODEL, chat_req.priority)
+    return StreamingResponse(
+        release_after(stream_events(chat_req.messages), slot),
+        background=BackgroundTask(slot.release),
+    )
 
 
 async def stream_events(
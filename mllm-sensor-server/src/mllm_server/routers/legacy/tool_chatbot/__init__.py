@@ -1 +1 @@
-from .router import tool_chatbot_router
\ No newline at end of file
+from .router import tool_chatbot_lifespan, tool_chatbot_router
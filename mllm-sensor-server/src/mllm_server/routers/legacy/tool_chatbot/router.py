@@ -1,25 +1,32 @@
 import json
 import logging
 import os
-from typing import Annotated, AsyncIterable, List, Optional, Union
+from contextlib import asynccontextmanager
+from typing import Annotated, AsyncIterable, AsyncIterator, List, Optional, Union
 
-from fastapi import APIRouter
-from fastapi.responses import FileResponse, StreamingResponse
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 from langchain_community.tools.tavily_search import TavilySearchResults
 from langchain_core.runnables.schema import StreamEvent
-from langchain_ollama import ChatOllama
 from langchain_openai import ChatOpenAI
 from langgraph.graph import StateGraph
+from langgraph.graph.state import CompiledStateGraph
 from langgraph.graph.message import add_messages
 from typing_extensions import TypedDict
 from langgraph.prebuilt import ToolNode, tools_condition
 from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
 import aiosqlite
 
+from ....checkpoint_store import SESSIONS_MAX_PAGE_SIZE, SESSIONS_PAGE_SIZE, list_thread_ids
 from ....types import AssistantMessage, ChatRequest, UserMessage
+from ....graph_image import GraphImageCache
+from ....llm import LLM_MODEL, llm_llama, llm_scheduler
+from ....llm_scheduler import release_after
 from ....utils import convert_serializable
 
 logger = logging.getLogger(__name__)
+TOOL_CHATBOT_ASSETS_DIR = "assets/tool-chatbot"
 tool_chatbot_router = APIRouter(prefix="/service/tool-chatbot", tags=["chatbot"])
 
 
@@ -27,13 +34,9 @@ class State(TypedDict):
     messages: Annotated[list, add_messages]
 
 
-os.makedirs("assets/tool-chatbot", exist_ok=True)
-
-
 tavily_tool = TavilySearchResults(max_results=2)
 tools = [tavily_tool]
 
-llm_llama = ChatOllama(model="llama3.1")
 tools_llm = llm_llama.bind_tools(tools)
 # llm_gpt = ChatOpenAI(model="gpt-4o-mini")
 # tools_llm = llm_gpt.bind_tools(tools)
@@ -44,9 +47,6 @@ def node_llama_chatbot(state: State):
     # return {"messages": [tools_llm_gpt.invoke(state["messages"])]}
 
 
-sqlite_conn = aiosqlite.connect("assets/tool-chatbot/checkpoint.sqlite")
-memory = AsyncSqliteSaver(sqlite_conn)
-
 graph_builder = StateGraph(State)
 # Add Nodes
 graph_builder.add_node("chatbot", node_llama_chatbot)
@@ -56,18 +56,41 @@ graph_builder.add_conditional_edges("chatbot", tools_condition)
 graph_builder.add_edge("tools", "chatbot")
 graph_builder.set_entry_point("chatbot")
 
-simple_chat_graph = graph_builder.compile(
-    checkpointer=memory,
-    # interrupt_before=["tools"],
-)
-simple_chat_graph.get_graph().draw_mermaid_png(
-    output_file_path="assets/tool-chatbot/state_graph.png"
-)
+# SQLite 연결과 그래프 컴파일은 tool_chatbot_lifespan()에서 수행 (import 시 부수 효과 없음)
+memory: Optional[AsyncSqliteSaver] = None
+simple_chat_graph: Optional[CompiledStateGraph] = None
+# 그래프 이미지는 /state-graph가 처음 요청될 때 그림 (mermaid.ink 사용)
+graph_image = GraphImageCache(TOOL_CHATBOT_ASSETS_DIR, renderer="mermaid")
+
+
+@asynccontextmanager
+async def tool_chatbot_lifespan() -> AsyncIterator[None]:
+    global memory, simple_chat_graph
+
+    os.makedirs(TOOL_CHATBOT_ASSETS_DIR, exist_ok=True)
+    async with aiosqlite.connect(os.path.join(TOOL_CHATBOT_ASSETS_DIR, "checkpoint.sqlite")) as sqlite_conn:
+        memory = AsyncSqliteSaver(sqlite_conn)
+        simple_chat_graph = graph_builder.compile(
+            checkpointer=memory,
+            # interrupt_before=["tools"],
+        )
+        graph_image.set_graph(simple_chat_graph)
+        try:
+            yield
+        finally:
+            simple_chat_graph = None
+            memory = None
+
+
+def _require_graph() -> CompiledStateGraph:
+    if simple_chat_graph is None:
+        raise HTTPException(status_code=503, detail="The chatbot is not initialized yet.")
+    return simple_chat_graph
 
 
 @tool_chatbot_router.get("/state-graph")
-def get_chat_graph_image() -> FileResponse:
-    return FileResponse("assets/tool-chatbot/state_graph.png")
+async def get_chat_graph_image(request: Request) -> Response:
+    return await graph_image.response(request)
 
 
 @tool_chatbot_router.post("/")
@@ -75,18 +98,27 @@ async def chat_endpoint(chat_req: ChatRequest) -> StreamingResponse:
     if not chat_req.messages:
         return {"error": "No messages provided."}
 
-    return StreamingResponse(stream_events(chat_req.messages, session=chat_req.session))
+    graph = _require_graph()
+    slot = await llm_scheduler.acquire(LLM_MODEL, chat_req.priority)
+    return StreamingResponse(
+        release_after(stream_events(graph, chat_req.messages, session=chat_req.session), slot),
+        background=BackgroundTask(slot.release),
+    )
 
 
 @tool_chatbot_router.get("/sessions")
-def list_sessions():
-    sessions = set()
-    for session in memory.list(None):
-        sessions.add(session.config["configurable"]["thread_id"])
-    return {"sessions": list(sessions)}
+async def list_sessions(
+    limit: int = Query(default=SESSIONS_PAGE_SIZE, ge=1, le=SESSIONS_MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+):
+    # 세션 인덱스가 없으므로 thread_id 순으로 페이지 조회 (cursor: 이전 페이지의 next_cursor)
+    _require_graph()
+    sessions, next_cursor = await list_thread_ids(memory, limit, cursor)
+    return {"sessions": sessions, "next_cursor": next_cursor}
 
 
 async def stream_events(
+    graph: CompiledStateGraph,
     messages: List[Union[UserMessage, AssistantMessage]],
     session: Optional[str] = None,
 ) -> AsyncIterable[str]:
@@ -105,7 +137,7 @@ async def stream_events(
     config = {
         "configurable": {"thread_id": session if session is not None else "default"}
     }
-    async for event in simple_chat_graph.astream_events(
+    async for event in graph.astream_events(
         langgraph_input,
         config=config,
         version="v2",
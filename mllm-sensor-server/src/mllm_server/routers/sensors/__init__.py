@@ -0,0 +1 @@
+from .router import sensors_router
\ No newline at end of file
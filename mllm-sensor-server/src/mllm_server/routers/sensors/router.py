@@ -0,0 +1,122 @@
+import asyncio
+import logging
+from typing import AsyncIterable, List, Optional
+
+from fastapi import APIRouter, HTTPException, Query, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+
+from ...sensor_stream import MAX_STREAM_RATE_HZ, SensorStreamClient
+from ...sensors import sensor_context_cache, sensor_server, sensor_stream_hub
+
+logger = logging.getLogger(__name__)
+
+sensors_router = APIRouter(prefix="/sensors", tags=["sensors"])
+
+
+def parse_channels(channels: Optional[str]) -> List[str]:
+    if not channels:
+        return [channel.spec.name for channel in sensor_server.channels]
+    return [name.strip() for name in channels.split(",") if name.strip()]
+
+
+@sensors_router.get("/")
+def get_sensors():
+    # 통계는 get_channel_stats()로 조회 (SENSOR_SHM 모드에서는 수신 프로세스가 발행한 값)
+    stats = sensor_server.get_channel_stats()
+    return {
+        "channels": [
+            {
+                "channel_id": channel.spec.channel_id,
+                "name": channel.spec.name,
+                "label": channel.spec.display_name,
+                "unit": channel.spec.unit,
+                "decimation": channel.spec.decimation,
+                "stats": stats.get(channel.spec.name, {}),
+            }
+            for channel in sensor_server.channels
+        ],
+        "ingest": sensor_server.get_ingest_stats(),
+        "stream": sensor_stream_hub.get_stats(),
+        "context_cache": sensor_context_cache.get_stats(),
+    }
+
+
+@sensors_router.get("/stream")
+async def stream_sensors_sse(
+    channels: Optional[str] = None,
+    rate: float = Query(default=10.0, gt=0, le=MAX_STREAM_RATE_HZ),
+) -> StreamingResponse:
+    """
+    Server-Sent Events로 센서 프레임을 보냅니다. 예: /sensors/stream?channels=steering,speed&rate=10
+    """
+    names = parse_channels(channels)
+    try:
+        sensor_stream_hub.check(names, rate)
+    except (KeyError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return StreamingResponse(
+        stream_frames(names, rate),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
+
+
+async def stream_frames(channels: List[str], rate: float) -> AsyncIterable[bytes]:
+    # 응답 본문이 시작될 때 구독 (본문이 시작되지 않으면 구독도 남지 않음)
+    client = sensor_stream_hub.subscribe(channels, rate)
+    try:
+        while True:
+            frame = await client.get()
+            yield b"data: " + frame + b"\n\n"
+    finally:
+        await sensor_stream_hub.unsubscribe(client)
+
+
+async def send_frames(websocket: WebSocket, client: SensorStreamClient) -> None:
+    try:
+        while True:
+            frame = await client.get()
+            # 인코딩한 bytes를 그대로 전달 (클라이언트별 재인코딩/복사 없음)
+            await websocket.send({"type": "websocket.send", "bytes": frame})
+    except WebSocketDisconnect:
+        pass
+
+
+async def wait_disconnect(websocket: WebSocket) -> None:
+    # 클라이언트가 보내는 메시지는 무시하고 연결 종료만 감지 (프레임이 없을 때도 바로 구독 해제)
+    while True:
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            return
+
+
+@sensors_router.websocket("/stream")
+async def stream_sensors_ws(
+    websocket: WebSocket,
+    channels: Optional[str] = None,
+    rate: float = Query(default=10.0, gt=0, le=MAX_STREAM_RATE_HZ),
+):
+    """
+    WebSocket으로 센서 프레임(UTF-8 JSON, binary frame)을 보냅니다.
+    """
+    names = parse_channels(channels)
+    try:
+        sensor_stream_hub.check(names, rate)
+    except (KeyError, ValueError) as e:
+        await websocket.close(code=1008, reason=str(e))
+        return
+
+    await websocket.accept()
+    client = sensor_stream_hub.subscribe(names, rate)
+    tasks = [
+        asyncio.create_task(send_frames(websocket, client)),
+        asyncio.create_task(wait_disconnect(websocket)),
+    ]
+    try:
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await sensor_stream_hub.unsubscribe(client)
@@ -0,0 +1,141 @@
+import argparse
+import logging
+import math
+import socket
+import time
+from typing import Optional, Tuple
+
+import numpy as np
+
+from .scaner_udp import SERVER_PORT, SPEED_CHANNEL_ID, STEERING_CHANNEL_ID
+
+logger = logging.getLogger(__name__)
+
+# 벤치마크용 채널 (실제 SCANeR 채널과 겹치지 않는 ID)
+SEQUENCE_CHANNEL_ID = 9000  # 패킷 번호 (드롭 계산)
+SEND_TIME_CHANNEL_ID = 9001  # 송신 시각 (time.monotonic_ns() / 1e9, 지연 계산)
+
+
+class ScanerEmulator:
+    """
+    SCANeR 필터와 같은 '<d' (channel_id, value) 쌍 형식의 데이터그램을 보내는 로컬 대역입니다.
+
+    rate_hz는 평균 송신 속도이며, burst개씩 몰아서 보내면 burst / rate_hz초마다 한 번씩 보냅니다.
+    inf_ratio만큼의 부가 채널 슬롯은 SCANeR처럼 inf 센티널로 채워집니다.
+    """
+
+    def __init__(
+        self,
+        target: Tuple[str, int] = ("127.0.0.1", SERVER_PORT),
+        channel_count: int = 100,
+        rate_hz: float = 100.0,
+        burst: int = 1,
+        inf_ratio: float = 0.0,
+        probe: bool = True,
+        seed: int = 0,
+    ) -> None:
+        fixed = [STEERING_CHANNEL_ID, SPEED_CHANNEL_ID]
+        if probe:
+            fixed += [SEQUENCE_CHANNEL_ID, SEND_TIME_CHANNEL_ID]
+        if channel_count < len(fixed):
+            raise ValueError(f"channel_count must be at least {len(fixed)}")
+        if rate_hz <= 0 or burst < 1:
+            raise ValueError(f"Invalid rate/burst: {rate_hz}/{burst}")
+
+        self.target = target
+        self.rate_hz = rate_hz
+        self.burst = burst
+        self.probe = probe
+        self.is_active = False
+        self.sent = 0
+
+        rng = np.random.default_rng(seed)
+        extra = channel_count - len(fixed)
+        extra_ids = np.arange(extra, dtype=np.float64) + 1000
+        extra_ids[rng.random(extra) < inf_ratio] = np.inf
+
+        self._pairs = np.empty((channel_count, 2), dtype="<f8")
+        self._pairs[: len(fixed), 0] = fixed
+        self._pairs[len(fixed) :, 0] = extra_ids
+        self._pairs[len(fixed) :, 1] = rng.normal(size=extra)
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def make_packet(self, sequence: int, now_ns: int) -> bytes:
+        t = now_ns / 1e9
+        values = self._pairs[:, 1]
+        values[0] = 30.0 * math.sin(2 * math.pi * 0.1 * t)  # steering
+        values[1] = 50.0 + 20.0 * math.sin(2 * math.pi * 0.02 * t)  # speed
+        if self.probe:
+            values[2] = sequence
+            values[3] = now_ns / 1e9
+        return self._pairs.tobytes()
+
+    def send(self) -> None:
+        now_ns = time.monotonic_ns()
+        self._socket.sendto(self.make_packet(self.sent, now_ns), self.target)
+        self.sent += 1
+
+    def run(self, duration: Optional[float] = None, count: Optional[int] = None) -> int:
+        """
+        duration초 동안 또는 count개를 보낼 때까지 송신합니다. (둘 다 없으면 stop()까지)
+        """
+        self.is_active = True
+        interval_ns = int(self.burst * 1e9 / self.rate_hz)
+        start_ns = next_ns = time.monotonic_ns()
+        end_ns = start_ns + int(duration * 1e9) if duration is not None else None
+        while self.is_active:
+            for _ in range(self.burst):
+                if count is not None and self.sent >= count:
+                    self.is_active = False
+                    break
+                self.send()
+            next_ns += interval_ns
+            now_ns = time.monotonic_ns()
+            if end_ns is not None and now_ns >= end_ns:
+                break
+            # sleep은 1ms 가량 늦게 깨어날 수 있으므로 남은 시간은 busy-wait
+            remaining_ns = next_ns - now_ns
+            if remaining_ns > 2_000_000:
+                time.sleep((remaining_ns - 1_000_000) / 1e9)
+            while time.monotonic_ns() < next_ns:
+                pass
+        self.is_active = False
+        return self.sent
+
+    def stop(self) -> None:
+        self.is_active = False
+
+    def close(self) -> None:
+        self._socket.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local SCANeR UDP stand-in")
+    parser.add_argument("--target", default=f"127.0.0.1:{SERVER_PORT}", help="host:port")
+    parser.add_argument("--channels", type=int, default=100)
+    parser.add_argument("--rate", type=float, default=100.0, help="packets/s")
+    parser.add_argument("--burst", type=int, default=1)
+    parser.add_argument("--inf-ratio", type=float, default=0.0)
+    parser.add_argument("--duration", type=float, help="seconds (default: until Ctrl+C)")
+    args = parser.parse_args()
+
+    host, port = args.target.rsplit(":", 1)
+    emulator = ScanerEmulator(
+        (host, int(port)),
+        channel_count=args.channels,
+        rate_hz=args.rate,
+        burst=args.burst,
+        inf_ratio=args.inf_ratio,
+    )
+    logger.info(f"Sending SCANeR datagrams to {args.target} at {args.rate} Hz...")
+    try:
+        emulator.run(duration=args.duration)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        emulator.close()
+    logger.info(f"Sent {emulator.sent} datagrams")
+
+
+if __name__ == "__main__":
+    main()
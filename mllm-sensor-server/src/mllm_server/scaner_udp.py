@@ -1,17 +1,164 @@
+import asyncio
 import logging
 import socket
 import struct
+import sys
 import threading
 import time
-from collections import deque
-from typing import Dict, List, Optional
+from dataclasses import dataclass
+from typing import Any, Dict, List, Literal, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .channels import ChannelRegistry, ChannelSpec, load_channel_specs
+from .sensor_bus import SensorBus
+from .telemetry_log import SOURCE_SCANER, TelemetryRecorder
+from .timeseries import TimeSeriesRing, TimeSeriesWindow, capacity_for
 
 SERVER_IP = "192.168.1.6"
 SERVER_PORT = 46012
 DATA_VALUE_SIZE = 8  # 64-bit double
+PAIR_SIZE = DATA_VALUE_SIZE * 2  # (channel_id, value)
+
+STEERING_CHANNEL_ID = 167
+SPEED_CHANNEL_ID = 120
+
+SENSOR_DATA_LENGTH = 20  # get_sensor_data()가 반환하는 최근 샘플 수
+HISTORY_CAPACITY = capacity_for(minutes=10, rate_hz=100)
+
+DECODE_TIME_CAPACITY = 4096  # 디코딩 시간 분포를 계산할 최근 배치 수
+
+RECEIVE_BUFFER_SIZE = 4 * 1024 * 1024
+MAX_DATAGRAM_SIZE = 65535  # UDP 데이터그램 최대 크기 (채널이 수백 개여도 잘리지 않음)
+MAX_BATCH_SIZE = 1024
+
+# Linux 전용 소켓 옵션 (Python socket 모듈에 상수가 정의되어 있지 않음)
+SO_TIMESTAMPNS = 35  # 커널 수신 시각 (struct timespec)
+SO_RXQ_OVFL = 40  # 수신 버퍼 오버플로로 버려진 누적 패킷 수 (uint32)
 
 logger = logging.getLogger(__name__)
 
+
+def decode_scaner_datagram(data: bytes, data_size: int = DATA_VALUE_SIZE) -> Dict[int, float]:
+    # '<' : little-endian, "d" : 64-bit double
+    values = struct.unpack("<" + "d" * (len(data) // data_size), data)
+    results = {}
+    key = -1
+    for idx, value in enumerate(values):
+        if idx % 2 == 0:
+            if value == float("inf") or value == float("-inf"):
+                key = -1
+            else:
+                key = int(value)
+        else:
+            if key == -1:
+                continue
+            results[key] = value
+    return results
+
+
+class ScanerDatagramDecoder:
+    """
+    SCANeR 필터 데이터그램을 복사 없이 (-1, 2) float64 배열로 보고, 구독한 채널의 값만 벡터 연산으로 추출합니다.
+
+    channel_id -> 구독 슬롯 인덱스를 미리 계산해 두고, 직전 패킷과 채널 배치가 같으면 행 위치까지 재사용합니다.
+    """
+
+    def __init__(self, channel_ids: Sequence[int]) -> None:
+        self.channel_ids = np.asarray(channel_ids, dtype=np.int64)
+        if self.channel_ids.size == 0 or (self.channel_ids < 0).any():
+            raise ValueError(f"Invalid channel ids: {channel_ids}")
+
+        # channel_id -> 구독 슬롯 (-1: 구독하지 않음)
+        self._index = np.full(int(self.channel_ids.max()) + 1, -1, dtype=np.intp)
+        self._index[self.channel_ids] = np.arange(self.channel_ids.size)
+
+        # 직전 패킷의 채널 배치 캐시 (ID 열의 바이트 -> 값 위치, 구독 슬롯)
+        self._layout_key: Optional[bytes] = None
+        self._layout_take = np.empty(0, dtype=np.intp)
+        self._layout_slots = np.empty(0, dtype=np.intp)
+        self._layout_present = np.zeros(self.channel_ids.size, dtype=bool)
+        self._missing = np.full(self.channel_ids.size, np.nan)
+
+    @staticmethod
+    def view(data: bytes) -> np.ndarray:
+        # 짝이 맞지 않는 마지막 값은 무시 (기존 루프와 동일)
+        pair_count = len(data) // PAIR_SIZE
+        return np.frombuffer(data, dtype="<f8", count=pair_count * 2).reshape(-1, 2)
+
+    def _update_layout(self, ids: np.ndarray, key: bytes) -> None:
+        # inf 센티널과 범위 밖 채널은 비교 결과가 False가 되어 제외됨
+        in_range = (ids >= 0) & (ids < self._index.size)
+        rows = np.flatnonzero(in_range)
+        slots = self._index[ids[rows].astype(np.intp)]
+        subscribed = slots >= 0
+        self._layout_key = key
+        self._layout_take = rows[subscribed] * 2 + 1
+        self._layout_slots = slots[subscribed]
+        self._layout_present = np.zeros(self.channel_ids.size, dtype=bool)
+        self._layout_present[self._layout_slots] = True
+
+    def decode(self, data: bytes) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        구독 채널 순서대로 (값, 수신 여부) 배열을 반환합니다. 수신되지 않은 채널의 값은 NaN입니다.
+        """
+        pairs = self.view(data)
+        ids = pairs[:, 0]
+        key = ids.tobytes()
+        if key != self._layout_key:
+            self._update_layout(ids, key)
+
+        values = self._missing.copy()
+        values[self._layout_slots] = pairs.ravel().take(self._layout_take)
+        return values, self._layout_present.copy()
+
+    def decode_all(self, data: bytes) -> Dict[int, float]:
+        pairs = self.view(data)
+        ids = pairs[:, 0]
+        valid = np.isfinite(ids)
+        keys = ids[valid].astype(np.int64)
+        values = pairs[valid, 1]
+        keep = keys != -1
+        return dict(zip(keys[keep].tolist(), values[keep].tolist()))
+
+
+@dataclass
+class ScanerIngestStats:
+    packets_received: int = 0
+    packets_decoded: int = 0
+    packets_coalesced: int = 0
+    packets_truncated: int = 0  # buffer_size보다 커서 잘린 데이터그램 (recvmsg의 MSG_TRUNC)
+    batches: int = 0
+    max_batch: int = 0
+    kernel_drops: Optional[int] = None  # SO_RXQ_OVFL을 지원하지 않으면 None
+    decode_time_ns: int = 0
+    last_receive_ns: int = 0  # time.monotonic_ns()
+    last_queue_delay_ns: Optional[int] = None  # 커널 수신 ~ 애플리케이션 수신 지연
+    max_queue_delay_ns: Optional[int] = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        now_ns = time.monotonic_ns()
+        return {
+            "packets_received": self.packets_received,
+            "packets_decoded": self.packets_decoded,
+            "packets_coalesced": self.packets_coalesced,
+            "packets_truncated": self.packets_truncated,
+            "batches": self.batches,
+            "max_batch": self.max_batch,
+            "kernel_drops": self.kernel_drops,
+            "decode_time_us_avg": (
+                self.decode_time_ns / self.packets_decoded / 1e3 if self.packets_decoded else None
+            ),
+            "sample_age_s": (now_ns - self.last_receive_ns) / 1e9 if self.last_receive_ns else None,
+            "queue_delay_ms": (
+                self.last_queue_delay_ns / 1e6 if self.last_queue_delay_ns is not None else None
+            ),
+            "max_queue_delay_ms": (
+                self.max_queue_delay_ns / 1e6 if self.max_queue_delay_ns is not None else None
+            ),
+        }
+
+
 class ScanerFilterServer:
     def __init__(
         self,
@@ -19,68 +166,188 @@ class ScanerFilterServer:
         filter_port: int = SERVER_PORT,
         data_size: int = DATA_VALUE_SIZE,
         timeout: float = 5,
-        buffer_size: int = 2048,
+        buffer_size: int = MAX_DATAGRAM_SIZE,
+        decoder: Literal["numpy", "struct"] = "numpy",
+        batch: bool = True,
+        max_batch: int = MAX_BATCH_SIZE,
+        keep_history: bool = True,
+        receive_buffer_size: Optional[int] = RECEIVE_BUFFER_SIZE,
+        history_capacity: int = HISTORY_CAPACITY,
+        channels: Optional[Sequence[ChannelSpec]] = None,
+        recorder: Optional[TelemetryRecorder] = None,
+        bus: Optional[SensorBus] = None,
+        history_rings: Optional[Mapping[str, TimeSeriesRing]] = None,
     ) -> None:
         logger.info(f"SCANeR Server: {filter_ip}:{filter_port}")
 
-        self.filter_udp_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        # 소켓은 activate()/start()에서 생성 (import 시 부수 효과 없음)
+        self.filter_udp_socket: Optional[socket.socket] = None
         self.filter_address = (filter_ip, filter_port)
         self.timeout = timeout
         self.buffer_size = buffer_size
         self.data_size = data_size  # 센서 데이터 단위 크기 (8바이트)
-        self.filter_udp_socket.settimeout(self.timeout)
-        
-        self._scaner_steering_angles = deque([0.0] * 20, maxlen=20)
-        self._scaner_speeds = deque([0.0] * 20, maxlen=20)
-        
+        self.receive_buffer_size = receive_buffer_size
+
+        # batch: 깨어날 때마다 대기 중인 데이터그램을 모두 읽음
+        # keep_history: False이면 배치의 마지막 데이터그램만 디코딩 (나머지는 coalesced로 집계)
+        self.batch = batch
+        self.max_batch = max_batch
+        self.keep_history = keep_history
+        self.stats = ScanerIngestStats()
+        self.decode_times = TimeSeriesRing(DECODE_TIME_CAPACITY)  # 배치별 패킷당 디코딩 시간 (ns)
+        self._ancillary_size = 0
+
+        # 구독 채널별 시계열과 통계 (수신 스레드/콜백만 기록, 조회는 락 없이)
+        # history_rings: 채널 이름 -> 미리 만든 링 버퍼 (공유 메모리에 발행하는 수신 프로세스)
+        self.channels = ChannelRegistry(
+            channels if channels is not None else load_channel_specs(), history_capacity, history_rings
+        )
+        self.decoder = decoder
+        self.recorder = recorder  # 수신한 원본 데이터그램 기록 (재생용)
+        self._datagram_decoder = ScanerDatagramDecoder(self.channels.channel_ids)
+        self.bus = bus
+        if bus is not None:
+            # 채널의 링 버퍼를 그대로 버스에 연결 (추가 복사 없음)
+            for channel in self.channels:
+                spec = channel.spec
+                bus.register(spec.name, "scaner", channel.history, spec.label, spec.unit)
+
         self.is_active = False
         self.filter_thread: Optional[threading.Thread] = None
 
+    def _open_socket(self) -> None:
+        self.filter_udp_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.filter_udp_socket.settimeout(self.timeout)
+        self._configure_socket(self.receive_buffer_size)
+        self.filter_udp_socket.bind(self.filter_address)
+
+    def _configure_socket(self, receive_buffer_size: Optional[int]) -> None:
+        if receive_buffer_size is not None:
+            self.filter_udp_socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, receive_buffer_size)
+            actual = self.filter_udp_socket.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF)
+            logger.info(f"SCANeR receive buffer: {actual} bytes (requested {receive_buffer_size})")
+
+        # 커널 드롭 수와 수신 시각은 recvmsg의 보조 데이터로 받음
+        self._ancillary_size = 0
+        if sys.platform.startswith("linux") and hasattr(self.filter_udp_socket, "recvmsg"):
+            try:
+                self.filter_udp_socket.setsockopt(socket.SOL_SOCKET, SO_RXQ_OVFL, 1)
+                self.filter_udp_socket.setsockopt(socket.SOL_SOCKET, SO_TIMESTAMPNS, 1)
+                self._ancillary_size = socket.CMSG_SPACE(4) + socket.CMSG_SPACE(16)
+                self.stats.kernel_drops = 0
+            except OSError as e:
+                logger.warning(f"Kernel drop accounting is not available: {e}")
+
+    def _receive(self) -> bytes:
+        if not self._ancillary_size:
+            return self.filter_udp_socket.recv(self.buffer_size)
+
+        data, ancdata, flags, _ = self.filter_udp_socket.recvmsg(self.buffer_size, self._ancillary_size)
+        if flags & socket.MSG_TRUNC:
+            # 잘린 데이터그램도 남은 (channel_id, value) 쌍은 그대로 처리하고 집계만 함
+            if not self.stats.packets_truncated:
+                logger.warning(f"SCANeR datagram truncated to {self.buffer_size} bytes, increase buffer_size")
+            self.stats.packets_truncated += 1
+        for level, kind, cdata in ancdata:
+            if level != socket.SOL_SOCKET:
+                continue
+            if kind == SO_RXQ_OVFL and len(cdata) >= 4:
+                self.stats.kernel_drops = struct.unpack("=I", cdata[:4])[0]
+            elif kind == SO_TIMESTAMPNS and len(cdata) >= 16:
+                sec, nsec = struct.unpack("=qq", cdata[:16])
+                delay = time.time_ns() - (sec * 1_000_000_000 + nsec)
+                self.stats.last_queue_delay_ns = delay
+                if self.stats.max_queue_delay_ns is None or delay > self.stats.max_queue_delay_ns:
+                    self.stats.max_queue_delay_ns = delay
+        return data
+
+    def _drain(self) -> List[bytes]:
+        # 블로킹 수신 이후 커널 버퍼에 남은 데이터그램을 논블로킹으로 모두 읽음
+        # (타임아웃 소켓은 MSG_DONTWAIT을 줘도 select로 대기하므로 잠시 timeout을 0으로 바꿈)
+        batch = [self._receive()]
+        if not self.batch:
+            return batch
+        self.filter_udp_socket.settimeout(0)
+        try:
+            while len(batch) < self.max_batch:
+                batch.append(self._receive())
+        except (BlockingIOError, InterruptedError):
+            pass
+        finally:
+            self.filter_udp_socket.settimeout(self.timeout)
+        return batch
+
+    def _handle_batch(self, batch: List[bytes]) -> None:
+        stats = self.stats
+        stats.batches += 1
+        stats.packets_received += len(batch)
+        stats.max_batch = max(stats.max_batch, len(batch))
+        stats.last_receive_ns = receive_ns = time.monotonic_ns()
+
+        if self.recorder is not None:
+            for data in batch:
+                self.recorder.append(data, SOURCE_SCANER, receive_ns)
+
+        if not self.keep_history:
+            stats.packets_coalesced += len(batch) - 1
+            batch = batch[-1:]
+
+        start_ns = time.perf_counter_ns()
+        for data in batch:
+            self._handle_datagram(data, receive_ns)
+        elapsed_ns = time.perf_counter_ns() - start_ns
+        stats.decode_time_ns += elapsed_ns
+        stats.packets_decoded += len(batch)
+        self.decode_times.append(elapsed_ns / len(batch), receive_ns)
+        if self.bus is not None:
+            self.bus.notify()
+
+    def feed(self, data: bytes) -> None:
+        """
+        소켓을 거치지 않고 데이터그램을 직접 처리합니다. (로그 재생 등)
+        """
+        self._handle_batch([data])
+
     def _update_scaner_data(self) -> None:
         logger.info("Updating SCANeR data via UDP...")
         data_received = False
         while self.is_active:
             try:
-                data, _ = self.filter_udp_socket.recvfrom(self.buffer_size)
-                # '<' : little-endian, "d" : 64-bit double
-                values = struct.unpack("<" + "d" * (len(data) // self.data_size), data)
-                results = {}
-                key = -1
-                for idx, value in enumerate(values):
-                    if idx % 2 == 0:
-                        if value == float("inf") or value == float("-inf"):
-                            key = -1
-                        else:
-                            key = int(value)
-                    else:
-                        if key == -1:
-                            continue
-                        results[key] = value
-                self._process_scaner_data(results)
+                batch = self._drain()
+                if not self.is_active:
+                    break  # deactivate()의 깨우기 데이터그램
+                self._handle_batch(batch)
 
                 # logger.info(f"SCANeR data received: {results}")
                 if not data_received:
                     data_received = True
-                    logger.info(f"SCANeR is running...")
+                    logger.info("SCANeR is running...")
             except socket.timeout:
-                logger.info(f"(Timeout) Waiting for messages from SCANeR...")
+                logger.info("(Timeout) Waiting for messages from SCANeR...")
                 data_received = False
                 continue
             except OSError as e:
-                logger.error(f"The socket may be closed: {e}")
+                if self.is_active:
+                    logger.error(f"The socket may be closed: {e}")
                 break
 
-    def _process_scaner_data(self, data: Dict[int, float]) -> None:
-        if 167 not in data or 120 not in data:
+    def _handle_datagram(self, data: bytes, receive_ns: Optional[int] = None) -> None:
+        if receive_ns is None:
+            receive_ns = time.monotonic_ns()
+        if self.decoder == "struct":
+            self._process_scaner_data(decode_scaner_datagram(data, self.data_size), receive_ns)
             return
-        # 167: Steering Angle, 120: Speed
-        self._scaner_steering_angles.append(data[167])
-        self._scaner_speeds.append(data[120])
+
+        values, present = self._datagram_decoder.decode(data)
+        self.channels.update(values, present, receive_ns)
+
+    def _process_scaner_data(self, data: Dict[int, float], receive_ns: int) -> None:
+        self.channels.update_from_dict(data, receive_ns)
 
     def activate(self):
         logger.info("Activating SCANeR server (UDP Receiver)...")
 
-        self.filter_udp_socket.bind(self.filter_address)
+        self._open_socket()
         self.is_active = True
         self.filter_thread = threading.Thread(target=self._update_scaner_data)
         self.filter_thread.start()
@@ -91,12 +358,25 @@ class ScanerFilterServer:
         logger.info("Deactivating SCANeR server...")
 
         self.is_active = False
-        self.filter_udp_socket.close()
+        self._wake_receiver()
         if self.filter_thread:
             self.filter_thread.join()
+        self.filter_udp_socket.close()
 
         logger.info("SCANeR server deactivated.")
 
+    def _wake_receiver(self) -> None:
+        # 블로킹 중인 수신을 타임아웃 전에 깨우기 위해 자기 주소로 빈 데이터그램을 보냄
+        # (UDP 소켓은 shutdown()으로 깨어나지 않음, 실패하면 타임아웃 후 종료)
+        host, port = self.filter_udp_socket.getsockname()[:2]
+        if host in ("0.0.0.0", ""):
+            host = "127.0.0.1"
+        try:
+            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as waker:
+                waker.sendto(b"", (host, port))
+        except OSError as e:
+            logger.warning(f"Could not wake the SCANeR receiver: {e}")
+
     def get_sensor_data(self) -> Dict[str, List[float]]:
         """
         현재 센서 데이터(최근 스티어링 각도와 속도 목록)를 반환합니다.
@@ -107,6 +387,121 @@ class ScanerFilterServer:
           }
         """
         return {
-            "steering": list(self._scaner_steering_angles),
-            "speed": list(self._scaner_speeds),
-        }
\ No newline at end of file
+            channel.spec.name: channel.history.snapshot(SENSOR_DATA_LENGTH).values.tolist()
+            for channel in self.channels
+        }
+
+    def get_sensor_window(self, seconds: float) -> Dict[str, TimeSeriesWindow]:
+        """
+        최근 seconds초 동안의 채널별 시계열을 zero-copy 뷰로 반환합니다.
+        오래 보관할 경우 TimeSeriesRing.is_intact()로 확인하거나 snapshot_seconds()를 사용하세요.
+        """
+        now_ns = time.monotonic_ns()
+        return {
+            channel.spec.name: channel.history.window_seconds(seconds, now_ns)
+            for channel in self.channels
+        }
+
+    def get_channel_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        채널별 누적 통계 (count, last, min, max, mean, variance, rate)를 반환합니다.
+        """
+        return self.channels.get_stats()
+
+    def get_ingest_stats(self) -> Dict[str, Any]:
+        """
+        수신 카운터를 반환합니다. sample_age_s와 queue_delay_ms로 LLM에 제공하는 이력이 최신인지 확인할 수 있습니다.
+        """
+        result = self.stats.as_dict()
+        decode_times = self.decode_times.snapshot().values
+        if decode_times.size:
+            p50, p99 = np.percentile(decode_times, [50, 99]) / 1e3
+            result["decode_time_us_p50"] = float(p50)
+            result["decode_time_us_p99"] = float(p99)
+        return result
+
+
+
+class _ScanerDatagramProtocol(asyncio.DatagramProtocol):
+    def __init__(self, server: "AsyncScanerFilterServer") -> None:
+        self.server = server
+
+    def datagram_received(self, data: bytes, addr: Tuple[str, int]) -> None:
+        self.server._on_readable(data)
+
+    def error_received(self, exc: Exception) -> None:
+        logger.error(f"SCANeR UDP error: {exc}")
+
+    def connection_lost(self, exc: Optional[Exception]) -> None:
+        if exc is not None:
+            logger.error(f"SCANeR UDP connection lost: {exc}")
+
+
+class AsyncScanerFilterServer(ScanerFilterServer):
+    """
+    이벤트 루프에서 직접 데이터그램을 처리하는 SCANeR 수신기입니다. (스레드 없음)
+    FastAPI lifespan에서 start()/stop()을 호출합니다.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._reader_fd: Optional[int] = None
+        self._transport: Optional[asyncio.DatagramTransport] = None
+        self._data_received = False
+
+    def _on_readable(self, data: Optional[bytes] = None) -> None:
+        # 소켓이 읽기 가능해지면 대기 중인 데이터그램을 직접 읽음
+        # (모든 데이터그램이 _receive()를 거치므로 커널 드롭/지연 집계에서 빠지는 것이 없음)
+        # data: add_reader가 없는 이벤트 루프(Windows Proactor)에서 전송 계층이 이미 읽은 데이터그램
+        batch = [] if data is None else [data]
+        try:
+            while len(batch) < (self.max_batch if self.batch else 1):
+                batch.append(self._receive())
+        except (BlockingIOError, InterruptedError):
+            pass
+        except OSError as e:
+            logger.error(f"SCANeR UDP error: {e}")
+        if not batch:
+            return
+        self._handle_batch(batch)
+        if not self._data_received:
+            self._data_received = True
+            logger.info("SCANeR is running...")
+
+    async def start(self) -> None:
+        logger.info("Activating SCANeR server (asyncio UDP Receiver)...")
+
+        loop = asyncio.get_running_loop()
+        self._open_socket()
+        self.filter_udp_socket.setblocking(False)
+        try:
+            loop.add_reader(self.filter_udp_socket.fileno(), self._on_readable)
+            self._reader_fd = self.filter_udp_socket.fileno()
+        except NotImplementedError:
+            self._transport, _ = await loop.create_datagram_endpoint(
+                lambda: _ScanerDatagramProtocol(self),
+                sock=self.filter_udp_socket,
+            )
+        self.is_active = True
+
+        logger.info("SCANeR server activated.")
+
+    async def stop(self) -> None:
+        logger.info("Deactivating SCANeR server...")
+
+        self.is_active = False
+        if self._reader_fd is not None:
+            asyncio.get_running_loop().remove_reader(self._reader_fd)
+            self._reader_fd = None
+            self.filter_udp_socket.close()
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+
+        logger.info("SCANeR server deactivated.")
+
+    def activate(self):
+        raise RuntimeError("AsyncScanerFilterServer must be started with 'await start()'")
+
+    def deactivate(self):
+        raise RuntimeError("AsyncScanerFilterServer must be stopped with 'await stop()'")
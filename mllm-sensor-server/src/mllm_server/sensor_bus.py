@@ -0,0 +1,204 @@
+import logging
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .timeseries import TimeSeriesRing, capacity_for
+
+logger = logging.getLogger(__name__)
+
+BUS_CHANNEL_CAPACITY = capacity_for(10, 100)
+
+
+@dataclass
+class BusChannel:
+    name: str  # 버스 전체에서 고유한 이름 (예: "speed", "mdaq.float0")
+    source: str  # 발행한 수신기 (예: "scaner", "mdaq", "serial")
+    ring: TimeSeriesRing  # 수신 시각은 모두 time.monotonic_ns()
+    label: str = ""
+    unit: str = ""
+
+    @property
+    def display_name(self) -> str:
+        return self.label or self.name
+
+
+class FusedSnapshot(NamedTuple):
+    timestamps: np.ndarray  # 공통 시간 격자 (monotonic ns, shape (k,))
+    channels: List[str]
+    values: np.ndarray  # shape (k, 채널 수), 격자 시각 이전 샘플이 없으면 NaN
+    sample_timestamps: np.ndarray  # 각 값의 실제 수신 시각, 없으면 0
+
+    def column(self, name: str) -> np.ndarray:
+        return self.values[:, self.channels.index(name)]
+
+    def as_dict(self) -> Dict[str, List[float]]:
+        return {name: self.values[:, i].tolist() for i, name in enumerate(self.channels)}
+
+
+def _as_of(ring: TimeSeriesRing, times_ns: np.ndarray, max_age_ns: Optional[int]) -> Tuple[np.ndarray, np.ndarray]:
+    # 격자 시각마다 그 시각 이하의 마지막 샘플 (as-of join). 읽는 도중 덮어써졌으면 다시 읽음
+    while True:
+        window = ring.window()
+        idx = np.searchsorted(window.timestamps, times_ns, side="right") - 1
+        valid = idx >= 0
+        taken = np.where(valid, idx, 0)
+        values = window.values[taken] if len(window.values) else np.zeros(len(times_ns))
+        stamps = window.timestamps[taken] if len(window.timestamps) else np.zeros(len(times_ns), np.int64)
+        if ring.is_intact(window):
+            break
+    if max_age_ns is not None:
+        valid &= times_ns - stamps <= max_age_ns
+    return np.where(valid, values, np.nan), np.where(valid, stamps, 0)
+
+
+class SensorBus:
+    """
+    모든 센서 수신기(SCANeR, MDAQ, 시리얼)가 공유하는 프로세스 내 버스입니다.
+
+    채널마다 단일 writer 링 버퍼를 두고 수신 시각은 모두 time.monotonic_ns()를 사용합니다.
+    수신기가 이미 가진 링 버퍼는 register(ring=...)로 복사 없이 연결할 수 있습니다.
+    조회는 락 없이 이루어지며, fuse()는 여러 출처의 채널을 공통 시간 격자에 as-of join으로 맞춥니다.
+    수신기는 샘플을 기록한 뒤 notify()를 호출해 add_listener()로 등록한 콜백에 알립니다.
+    """
+
+    def __init__(self, capacity: int = BUS_CHANNEL_CAPACITY) -> None:
+        self.capacity = capacity
+        self._channels: Dict[str, BusChannel] = {}
+        self._listeners: List[Callable[[], None]] = []
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._channels
+
+    def __getitem__(self, name: str) -> BusChannel:
+        return self._channels[name]
+
+    def __len__(self) -> int:
+        return len(self._channels)
+
+    @property
+    def version(self) -> int:
+        """
+        모든 채널의 누적 샘플 수. 새 샘플이 들어오거나 채널이 추가될 때 증가하며, 공유 메모리 수신 프로세스가
+        다시 시작되면(링의 generation 증가) 작아질 수 있습니다.
+        """
+        return sum(channel.ring.count for channel in list(self._channels.values()))
+
+    def register(
+        self,
+        name: str,
+        source: str,
+        ring: Optional[TimeSeriesRing] = None,
+        label: str = "",
+        unit: str = "",
+    ) -> TimeSeriesRing:
+        channel = self._channels.get(name)
+        if channel is not None:
+            if channel.source != source or (ring is not None and ring is not channel.ring):
+                raise ValueError(f"Bus channel {name} is already registered by {channel.source}")
+            return channel.ring
+        if ring is None:
+            ring = TimeSeriesRing(self.capacity)
+        channel = BusChannel(name, source, ring, label, unit)
+        self._channels[name] = channel
+        logger.info(f"Sensor bus channel registered: {name} ({source})")
+        return channel.ring
+
+    def publish(self, name: str, value: float, timestamp_ns: Optional[int] = None) -> None:
+        self._channels[name].ring.append(value, timestamp_ns)
+        self.notify()
+
+    def add_listener(self, callback: Callable[[], None]) -> None:
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[], None]) -> None:
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def notify(self) -> None:
+        """
+        새 샘플이 기록되었음을 알립니다. 수신 스레드에서 호출되므로 콜백은 짧고 스레드 안전해야 합니다.
+        """
+        for callback in list(self._listeners):
+            callback()
+
+    def channels(self, source: Optional[str] = None) -> List[BusChannel]:
+        # 수신 스레드가 채널을 추가할 수 있으므로 목록을 복사해서 반환
+        return [channel for channel in list(self._channels.values()) if source is None or channel.source == source]
+
+    def names(self, source: Optional[str] = None) -> List[str]:
+        return [channel.name for channel in self.channels(source)]
+
+    def subscribe(self, channels: Optional[Sequence[str]] = None) -> "SensorSubscription":
+        return SensorSubscription(self, channels)
+
+    def latest(self, channels: Optional[Iterable[str]] = None) -> Dict[str, Tuple[float, int]]:
+        """
+        채널별 마지막 (값, 수신 시각). 샘플이 없는 채널은 제외합니다.
+        """
+        names = self.names() if channels is None else channels
+        result = {}
+        for name in names:
+            window = self._channels[name].ring.window(1)
+            if len(window.values):
+                value, timestamp = float(window.values[0]), int(window.timestamps[0])
+                if self._channels[name].ring.is_intact(window):
+                    result[name] = (value, timestamp)
+        return result
+
+    def fuse(
+        self,
+        channels: Sequence[str],
+        times_ns: np.ndarray,
+        max_age_ns: Optional[int] = None,
+    ) -> FusedSnapshot:
+        """
+        times_ns의 각 시각에 대해 채널마다 그 시각 이하의 마지막 샘플을 고릅니다. (as-of join)
+        max_age_ns보다 오래된 샘플은 NaN으로 처리합니다.
+        """
+        times_ns = np.asarray(times_ns, dtype=np.int64)
+        values = np.full((len(times_ns), len(channels)), np.nan)
+        stamps = np.zeros((len(times_ns), len(channels)), dtype=np.int64)
+        for i, name in enumerate(channels):
+            values[:, i], stamps[:, i] = _as_of(self._channels[name].ring, times_ns, max_age_ns)
+        return FusedSnapshot(times_ns, list(channels), values, stamps)
+
+
+class SensorSubscription:
+    """
+    버스의 일부 채널(기본: 전체)에 대한 구독. poll()은 마지막 poll() 이후 새로 들어온 샘플만 반환합니다.
+    """
+
+    def __init__(self, bus: SensorBus, channels: Optional[Sequence[str]] = None) -> None:
+        self.bus = bus
+        self._channels = list(channels) if channels is not None else None
+        # 구독 시점 이후의 샘플부터 poll()로 전달 (이후 등록된 채널은 처음부터)
+        # 채널 이름 -> (링의 generation, 다음에 읽을 절대 인덱스)
+        self._cursors: Dict[str, Tuple[int, int]] = {
+            name: (bus[name].ring.generation, bus[name].ring.count) for name in self.channels
+        }
+
+    @property
+    def channels(self) -> List[str]:
+        return self._channels if self._channels is not None else self.bus.names()
+
+    def latest(self) -> Dict[str, Tuple[float, int]]:
+        return self.bus.latest(self.channels)
+
+    def poll(self) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+        """
+        채널별 새 샘플 (값, 수신 시각). 그 사이 링 버퍼 용량보다 많이 쌓였으면 남아 있는 샘플만 반환합니다.
+        """
+        result = {}
+        for name in self.channels:
+            ring = self.bus[name].ring
+            generation = ring.generation
+            cursor_generation, cursor = self._cursors.get(name, (generation, 0))
+            if cursor_generation != generation:
+                cursor = 0  # 링이 새 버퍼에 연결되어 count가 0부터 다시 시작됨
+            snapshot = ring.snapshot(ring.count - cursor)
+            self._cursors[name] = (generation, snapshot.start + len(snapshot.values))
+            if len(snapshot.values):
+                result[name] = (snapshot.values, snapshot.timestamps)
+        return result
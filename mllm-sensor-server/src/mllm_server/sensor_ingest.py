@@ -0,0 +1,115 @@
+import argparse
+import asyncio
+import logging
+import os
+import signal
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Mapping, Optional, Sequence
+
+from dotenv import load_dotenv
+
+from .channels import ChannelSpec, load_channel_specs
+from .scaner_udp import HISTORY_CAPACITY, SERVER_IP, SERVER_PORT, AsyncScanerFilterServer
+from .sensor_bus import SensorBus
+from .shared_sensors import SENSOR_SHM_NAME, STATS_INTERVAL_S, SharedSensorStore
+from .telemetry_log import SOURCE_SCANER, TelemetryLog, TelemetryRecorder, TelemetryReplayer
+from .timeseries import TimeSeriesRing
+
+logger = logging.getLogger(__name__)
+
+
+def create_scaner_server(
+    bus: Optional[SensorBus] = None,
+    history_rings: Optional[Mapping[str, TimeSeriesRing]] = None,
+    specs: Optional[Sequence[ChannelSpec]] = None,
+) -> AsyncScanerFilterServer:
+    # SCANER_FILTER_ADDRESS: 수신 주소 (예: 로컬 대역 사용 시 127.0.0.1:46012)
+    scaner_ip, scaner_port = os.environ.get("SCANER_FILTER_ADDRESS", f"{SERVER_IP}:{SERVER_PORT}").rsplit(":", 1)
+    return AsyncScanerFilterServer(
+        scaner_ip,
+        int(scaner_port),
+        channels=specs if specs is not None else load_channel_specs(os.environ.get("SCANER_CHANNELS_FILE")),
+        bus=bus,
+        history_rings=history_rings,
+    )
+
+
+@asynccontextmanager
+async def replay_scaner_log(server: AsyncScanerFilterServer, path: str, speed: float) -> AsyncIterator[None]:
+    log = TelemetryLog(path)
+    replayer = TelemetryReplayer(log, {SOURCE_SCANER: server.feed}, speed=speed or None)
+    logger.info(f"Replaying SCANeR log {path} ({len(log)} records, x{speed or 'max'})")
+    task = asyncio.create_task(replayer.replay_async())
+    try:
+        yield
+    finally:
+        replayer.stop()
+        await task
+        log.close()
+
+
+@asynccontextmanager
+async def run_scaner_ingest(server: AsyncScanerFilterServer) -> AsyncIterator[None]:
+    # SCANER_REPLAY_FILE: SCANeR 대신 기록된 로그를 재생 (SCANER_REPLAY_SPEED, 0이면 최대 속도)
+    # SCANER_RECORD_FILE: 수신한 SCANeR 데이터그램을 기록
+    replay_file = os.environ.get("SCANER_REPLAY_FILE")
+    if replay_file:
+        async with replay_scaner_log(server, replay_file, float(os.environ.get("SCANER_REPLAY_SPEED", "1"))):
+            yield
+        return
+
+    record_file = os.environ.get("SCANER_RECORD_FILE")
+    if record_file:
+        server.recorder = TelemetryRecorder(record_file)
+    await server.start()
+    try:
+        yield
+    finally:
+        await server.stop()
+        if server.recorder is not None:
+            server.recorder.close()
+            server.recorder = None
+
+
+async def run_ingest(name: str = SENSOR_SHM_NAME, interval_s: float = STATS_INTERVAL_S) -> None:
+    """
+    전용 수신 프로세스. SCANeR 소켓(또는 재생)을 혼자 소유하고 채널의 링 버퍼를 공유 메모리에 직접 기록하며,
+    interval_s마다 채널/수신 통계와 heartbeat를 발행합니다. SIGTERM/SIGINT를 받으면 세그먼트를 지우고 종료합니다.
+    """
+    specs = load_channel_specs(os.environ.get("SCANER_CHANNELS_FILE"))
+    store = SharedSensorStore.create(name, specs, HISTORY_CAPACITY)
+    stopped = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(signum, stopped.set)
+
+    server = create_scaner_server(history_rings=store.rings, specs=specs)
+    try:
+        async with run_scaner_ingest(server):
+            while not stopped.is_set():
+                ingest = server.get_ingest_stats()
+                ingest["ingest_pid"] = os.getpid()
+                store.publish_stats({"channels": server.get_channel_stats(), "ingest": ingest})
+                try:
+                    await asyncio.wait_for(stopped.wait(), interval_s)
+                except asyncio.TimeoutError:
+                    pass
+    finally:
+        del server
+        store.close()
+        store.unlink()
+        logger.info(f"Sensor shared memory {name} removed")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="SCANeR ingest process for multi-worker deployments")
+    parser.add_argument("--shm", default=os.environ.get("SENSOR_SHM", SENSOR_SHM_NAME), help="공유 메모리 이름")
+    parser.add_argument("--interval", type=float, default=STATS_INTERVAL_S, help="통계/heartbeat 발행 주기 (초)")
+    args = parser.parse_args()
+
+    load_dotenv()
+    asyncio.run(run_ingest(args.shm, args.interval))
+
+
+if __name__ == "__main__":
+    main()
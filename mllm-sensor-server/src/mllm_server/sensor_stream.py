@@ -0,0 +1,148 @@
+import asyncio
+import json
+import logging
+import math
+import time
+from collections import deque
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from .scaner_udp import ScanerFilterServer
+
+logger = logging.getLogger(__name__)
+
+MAX_STREAM_RATE_HZ = 100.0
+CLIENT_QUEUE_SIZE = 32
+
+
+class SensorStreamClient:
+    """
+    구독자별 프레임 큐. 가득 차면 가장 오래된 프레임을 버립니다. (느린 클라이언트가 다른 클라이언트를 막지 않음)
+    """
+
+    def __init__(self, key: Tuple[Tuple[str, ...], float], queue_size: int = CLIENT_QUEUE_SIZE) -> None:
+        self.key = key
+        self.frames: deque = deque(maxlen=queue_size)
+        self.dropped = 0
+        self._ready = asyncio.Event()
+
+    def push(self, frame: bytes) -> None:
+        if len(self.frames) == self.frames.maxlen:
+            self.dropped += 1
+        self.frames.append(frame)
+        self._ready.set()
+
+    async def get(self) -> bytes:
+        while not self.frames:
+            self._ready.clear()
+            await self._ready.wait()
+        return self.frames.popleft()
+
+
+class SensorStreamGroup:
+    """
+    같은 채널 / 같은 주기를 구독하는 클라이언트 묶음. 프레임은 한 번만 인코딩해 모든 클라이언트가 같은 bytes를 공유합니다.
+    """
+
+    def __init__(self, server: ScanerFilterServer, channels: Sequence[str], rate_hz: float) -> None:
+        self.server = server
+        self.channels = [server.channels[name] for name in channels]
+        self.interval = 1.0 / rate_hz
+        self.clients: Set[SensorStreamClient] = set()
+        self.sequence = 0
+        self._counts: List[Tuple[int, int]] = [(-1, -1)] * len(self.channels)  # 채널별 (generation, count)
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def encode(self) -> Optional[bytes]:
+        counts = [(channel.history.generation, channel.history.count) for channel in self.channels]
+        # 마지막 프레임 이후 새 샘플이 없으면 보내지 않음 (수신 프로세스가 다시 시작되면 generation이 바뀜)
+        if counts == self._counts:
+            return None
+        self._counts = counts
+        self.sequence += 1
+        frame = {"seq": self.sequence, "time": time.monotonic()}
+        for channel in self.channels:
+            frame[channel.spec.name] = channel.history.latest()
+        return json.dumps(frame).encode()
+
+    async def _run(self) -> None:
+        next_time = time.monotonic()
+        while True:
+            frame = self.encode()
+            if frame is not None:
+                for client in self.clients:
+                    client.push(frame)
+            next_time += self.interval
+            await asyncio.sleep(max(0.0, next_time - time.monotonic()))
+
+
+class SensorStreamHub:
+    """
+    하나의 수신 데이터를 여러 구독자에게 나눠 보냅니다. 클라이언트는 채널과 주기를 고를 수 있으며,
+    (채널, 주기)가 같은 클라이언트끼리 인코딩 결과를 공유합니다. 모든 동작은 이벤트 루프 안에서 이뤄집니다.
+    """
+
+    def __init__(
+        self,
+        server: ScanerFilterServer,
+        max_rate_hz: float = MAX_STREAM_RATE_HZ,
+        queue_size: int = CLIENT_QUEUE_SIZE,
+    ) -> None:
+        self.server = server
+        self.max_rate_hz = max_rate_hz
+        self.queue_size = queue_size
+        self.groups: Dict[Tuple[Tuple[str, ...], float], SensorStreamGroup] = {}
+
+    def check(self, channels: Sequence[str], rate_hz: float) -> None:
+        unknown = [name for name in channels if name not in self.server.channels]
+        if unknown:
+            raise KeyError(f"Unknown channels: {unknown}")
+        # nan은 비교가 모두 False이므로 주기가 nan이 되어 쉬지 않고 도는 것을 막음
+        if not math.isfinite(rate_hz) or rate_hz <= 0:
+            raise ValueError(f"Invalid rate: {rate_hz}")
+
+    def subscribe(self, channels: Sequence[str], rate_hz: float) -> SensorStreamClient:
+        self.check(channels, rate_hz)
+        key = (tuple(channels), min(rate_hz, self.max_rate_hz))
+        group = self.groups.get(key)
+        if group is None:
+            group = self.groups[key] = SensorStreamGroup(self.server, key[0], key[1])
+            group.start()
+        client = SensorStreamClient(key, self.queue_size)
+        group.clients.add(client)
+        return client
+
+    async def unsubscribe(self, client: SensorStreamClient) -> None:
+        group = self.groups.get(client.key)
+        if group is None:
+            return
+        group.clients.discard(client)
+        if client.dropped:
+            logger.info(f"Sensor stream client dropped {client.dropped} frames")
+        if not group.clients:
+            del self.groups[client.key]
+            await group.stop()
+
+    async def close(self) -> None:
+        groups, self.groups = list(self.groups.values()), {}
+        for group in groups:
+            await group.stop()
+
+    def get_stats(self) -> Dict[str, int]:
+        clients = [client for group in self.groups.values() for client in group.clients]
+        return {
+            "groups": len(self.groups),
+            "clients": len(clients),
+            "dropped_frames": sum(client.dropped for client in clients),
+        }
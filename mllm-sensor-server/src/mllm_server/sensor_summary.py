@@ -0,0 +1,343 @@
+import asyncio
+import logging
+import math
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, List, Literal, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .sensor_bus import SensorBus
+from .utils import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_INTERVAL_S = 0.1  # 수신 알림이 없을 때의 요약 갱신 주기 (알림을 보내지 않는 출처, 공유 메모리 구독)
+SUMMARY_MIN_INTERVAL_S = 0.01  # 수신 알림이 몰릴 때 요약 갱신 사이의 최소 간격
+SUMMARY_WINDOW_S = 10.0  # 최소/최대를 계산하는 구간
+TREND_WINDOW_S = 2.0  # 추세(기울기)를 계산하는 구간
+STEADY_RATIO = 0.05  # 추세 구간 동안의 변화가 최근 범위의 5% 미만이면 steady
+SENSOR_CONTEXT_TOKENS = 48  # 프롬프트에 넣는 센서 요약의 기본 토큰 예산
+
+
+@dataclass(frozen=True)
+class EventRule:
+    name: str  # 예: "sharp_turn"
+    channel: str  # 버스 채널 이름
+    threshold: float
+    on: Literal["value", "rate"] = "rate"  # 값 또는 변화율(단위/초)에 적용
+    direction: Literal["abs", "rise", "fall"] = "abs"  # abs: |x| > t, rise: x > t, fall: x < -t
+    span_s: float = 0.2  # 변화율을 계산하는 구간 (샘플 간 잡음 완화)
+
+
+DEFAULT_EVENT_RULES = [
+    EventRule("sharp_turn", "steering", 90.0),  # 조향각 변화율 90 deg/s 초과
+    EventRule("hard_brake", "speed", 15.0, direction="fall"),  # 15 km/h/s (약 0.4 g) 이상 감속
+]
+
+
+@dataclass
+class EventState:
+    rule: EventRule
+    count: int = 0
+    last_ns: Optional[int] = None  # 마지막으로 시작된 시각 (monotonic ns)
+    active: bool = False
+    # 변화율 계산을 위해 이전 배치에서 span_s 구간만큼 남겨 둔 샘플
+    _tail_values: np.ndarray = field(default_factory=lambda: np.empty(0))
+    _tail_timestamps: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.int64))
+
+    def _rate(self, values: np.ndarray, timestamps: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        span_ns = int(self.rule.span_s * 1e9)
+        values = np.concatenate((self._tail_values, values))
+        timestamps = np.concatenate((self._tail_timestamps, timestamps))
+        new = np.arange(len(self._tail_values), len(values))
+        keep = np.searchsorted(timestamps, timestamps[-1] - span_ns, side="left")
+        self._tail_values, self._tail_timestamps = values[keep:], timestamps[keep:]
+
+        # 샘플마다 span_s 이전(가장 가까운) 샘플과의 변화율. 구간의 절반도 쌓이지 않았으면 제외
+        base = np.searchsorted(timestamps, timestamps[new] - span_ns, side="left")
+        dt = timestamps[new] - timestamps[base]
+        valid = dt >= span_ns // 2
+        rate = (values[new][valid] - values[base][valid]) * 1e9 / dt[valid]
+        return rate, timestamps[new][valid]
+
+    def update(self, values: np.ndarray, timestamps: np.ndarray) -> None:
+        rule = self.rule
+        if rule.on == "rate":
+            metric, timestamps = self._rate(values, timestamps)
+        else:
+            metric = values
+        if not len(metric):
+            return
+
+        if rule.direction == "abs":
+            active = np.abs(metric) > rule.threshold
+        elif rule.direction == "rise":
+            active = metric > rule.threshold
+        else:
+            active = metric < -rule.threshold
+        onsets = active & ~np.concatenate(([self.active], active[:-1]))
+        if onsets.any():
+            self.count += int(onsets.sum())
+            self.last_ns = int(timestamps[np.flatnonzero(onsets)[-1]])
+        self.active = bool(active[-1])
+
+
+@dataclass
+class ChannelFeatures:
+    name: str
+    label: str
+    unit: str = ""
+    value: float = math.nan
+    timestamp_ns: int = 0
+    trend: float = 0.0  # 단위/초 (TREND_WINDOW_S 구간 최소제곱 기울기)
+    low: float = math.nan  # SUMMARY_WINDOW_S 구간 최소/최대
+    high: float = math.nan
+    events: List[EventState] = field(default_factory=list)
+
+    @property
+    def trend_word(self) -> str:
+        span = self.high - self.low if self.high > self.low else 1.0
+        if abs(self.trend) * TREND_WINDOW_S < STEADY_RATIO * span:
+            return "steady"
+        return "rising" if self.trend > 0 else "falling"
+
+
+def _slope(values: np.ndarray, timestamps: np.ndarray) -> float:
+    if len(values) < 2:
+        return 0.0
+    t = (timestamps - timestamps[-1]) / 1e9
+    t_centered = t - t.mean()
+    denominator = float(np.dot(t_centered, t_centered))
+    if denominator == 0:
+        return 0.0
+    return float(np.dot(t_centered, values - values.mean()) / denominator)
+
+
+def _number(value: float) -> str:
+    if math.isnan(value):
+        return "?"
+    if abs(value) >= 100:
+        return f"{value:.0f}"
+    return f"{value:.1f}"
+
+
+def _quantize(value: float, step: Optional[float]) -> str:
+    # step 단위로 반올림 (step이 없으면 유효숫자 2자리)
+    if math.isnan(value):
+        return "?"
+    if step:
+        return f"{round(value / step) * step:g}"
+    return f"{float(f'{value:.2g}'):g}"
+
+
+class SensorSummarizer:
+    """
+    버스 채널의 파생 특징(현재 값, 추세, 최근 최소/최대, 이벤트)을 수신 직후 갱신해 두고,
+    프롬프트에는 토큰 예산에 맞춘 짧은 요약만 넣습니다.
+
+    run()은 버스의 수신 알림(SensorBus.notify)으로 깨어나 갱신하며, 알림이 몰리면 min_interval 동안 모아서 한 번에 처리합니다.
+    """
+
+    def __init__(
+        self,
+        bus: SensorBus,
+        rules: Sequence[EventRule] = tuple(DEFAULT_EVENT_RULES),
+        window_s: float = SUMMARY_WINDOW_S,
+        trend_s: float = TREND_WINDOW_S,
+    ) -> None:
+        self.bus = bus
+        self.rules = list(rules)
+        self.window_s = window_s
+        self.trend_s = trend_s
+        self.features: Dict[str, ChannelFeatures] = {}
+        self._subscription = bus.subscribe()
+        self.updates = 0
+        self.errors = 0
+        self.version = 0  # 새 샘플로 특징이 바뀔 때마다 1씩 증가 (수신 프로세스가 재시작되어도 줄지 않음)
+        self.latest_ns = 0  # 그 시점까지 받은 가장 최근 샘플의 수신 시각
+        self._wakeup: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending = False  # 이미 깨우기를 예약했으면 수신 스레드에서 다시 예약하지 않음
+
+    def _features(self, name: str) -> ChannelFeatures:
+        features = self.features.get(name)
+        if features is None:
+            channel = self.bus[name]
+            features = ChannelFeatures(name, channel.display_name, channel.unit)
+            features.events = [EventState(rule) for rule in self.rules if rule.channel == name]
+            self.features[name] = features
+        return features
+
+    def update(self, now_ns: Optional[int] = None) -> None:
+        """
+        마지막 update() 이후 들어온 샘플로 특징을 갱신합니다. (새 샘플이 있는 채널만)
+        """
+        if now_ns is None:
+            now_ns = time.monotonic_ns()
+        polled = self._subscription.poll()
+        for name, (values, timestamps) in polled.items():
+            features = self._features(name)
+            features.value = float(values[-1])
+            features.timestamp_ns = int(timestamps[-1])
+            self.latest_ns = max(self.latest_ns, features.timestamp_ns)
+            for event in features.events:
+                event.update(values, timestamps)
+
+            ring = self.bus[name].ring
+            window = ring.snapshot_seconds(self.window_s, now_ns)
+            # 새 샘플의 수신 시각이 모두 window_s보다 오래되었으면(재생 로그 등) 창이 비므로 새 샘플만 사용
+            if len(window.values):
+                values, timestamps = window.values, window.timestamps
+            features.low = float(values.min())
+            features.high = float(values.max())
+            since = np.searchsorted(timestamps, now_ns - int(self.trend_s * 1e9))
+            features.trend = _slope(values[since:], timestamps[since:])
+        if polled:
+            self.version += 1
+        self.updates += 1
+
+    def _notify(self) -> None:
+        # 수신 스레드(또는 이벤트 루프)에서 호출됨
+        if self._pending or self._loop is None:
+            return
+        self._pending = True
+        try:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+        except RuntimeError:
+            pass  # 이벤트 루프가 이미 닫힘
+
+    async def run(self, interval: float = SUMMARY_INTERVAL_S, min_interval: float = SUMMARY_MIN_INTERVAL_S) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self.bus.add_listener(self._notify)
+        try:
+            while True:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+                self._pending = False
+                try:
+                    self.update()
+                except Exception:
+                    # 한 번의 실패로 백그라운드 작업이 끝나지 않도록 기록만 하고 계속 갱신
+                    self.errors += 1
+                    logger.exception("Failed to update the sensor summary")
+                await asyncio.sleep(min_interval)
+        finally:
+            self.bus.remove_listener(self._notify)
+            self._loop = None
+
+    @asynccontextmanager
+    async def running(
+        self, interval: float = SUMMARY_INTERVAL_S, min_interval: float = SUMMARY_MIN_INTERVAL_S
+    ) -> AsyncIterator[None]:
+        task = asyncio.create_task(self.run(interval, min_interval))
+        try:
+            yield
+        finally:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    def _channel_text(self, features: ChannelFeatures, detail: int) -> str:
+        unit = f" {features.unit}" if features.unit else ""
+        text = f"{_number(features.value)}{unit}"
+        if detail >= 1:
+            word = features.trend_word
+            text += f", {word}" if word == "steady" else f", {word} {_number(features.trend)}/s"
+        if detail >= 2:
+            text += f", {self.window_s:.0f}s range {_number(features.low)}~{_number(features.high)}"
+        return text
+
+    def _events_text(self, now_ns: int) -> str:
+        parts = []
+        for features in self.features.values():
+            for event in features.events:
+                if event.last_ns is None:
+                    continue
+                ago = (now_ns - event.last_ns) / 1e9
+                parts.append(f"{event.rule.name} {ago:.0f}s ago" + (" (ongoing)" if event.active else ""))
+        return ", ".join(parts) if parts else "none"
+
+    def signature(self, steps: Optional[Dict[str, float]] = None, now_ns: Optional[int] = None) -> str:
+        """
+        비슷한 차량 상태를 같은 문자열로 묶는 서명 (응답 캐시 키용).
+        채널 값은 steps[채널 이름] 단위로 양자화하고, 추세 방향과 window_s 안에 발생한 이벤트를 포함합니다.
+        """
+        if now_ns is None:
+            now_ns = time.monotonic_ns()
+        steps = steps or {}
+        window_ns = int(self.window_s * 1e9)
+        parts = []
+        events = []
+        for name in sorted(self.features):
+            features = self.features[name]
+            parts.append(f"{name}={_quantize(features.value, steps.get(name))}/{features.trend_word}")
+            for event in features.events:
+                if event.active or (event.last_ns is not None and now_ns - event.last_ns <= window_ns):
+                    events.append(event.rule.name)
+        parts.append("events=" + ",".join(sorted(events)))
+        return ";".join(parts)
+
+    def encode(self, budget_tokens: int = SENSOR_CONTEXT_TOKENS, now_ns: Optional[int] = None) -> Dict[str, str]:
+        """
+        "레이블: 요약" 형식의 컨텍스트. 예산을 넘으면 범위 -> 이벤트 -> 추세 순서로 줄이고,
+        그래도 넘으면 뒤쪽 채널부터 제외합니다.
+        """
+        if now_ns is None:
+            now_ns = time.monotonic_ns()
+        channels = [features for features in self.features.values() if not math.isnan(features.value)]
+        has_rules = any(features.events for features in self.features.values())
+
+        for detail in (2, 1, 0):
+            for count in range(len(channels), -1, -1) if detail == 0 else (len(channels),):
+                context = {features.label: self._channel_text(features, detail) for features in channels[:count]}
+                if has_rules and detail >= 1:
+                    context["Events"] = self._events_text(now_ns)
+                if count == 0 or sum(estimate_tokens(f"{k}: {v}") for k, v in context.items()) <= budget_tokens:
+                    return context
+        return {}
+
+
+class SensorContextCache:
+    """
+    SensorSummarizer.encode() 결과를 요약 버전별로 한 번만 만들어 동시에 들어온 채팅 요청이 공유합니다.
+
+    이벤트 경과 시간("Ns ago")은 현재 시각이 아니라 가장 최근 샘플의 수신 시각(latest_ns) 기준으로 계산하므로,
+    컨텍스트는 (요약 버전, 토큰 예산)만으로 정해집니다. 데이터가 계속 들어오는 동안 두 시각의 차이는 수신 주기 정도입니다.
+    """
+
+    def __init__(self, summarizer: SensorSummarizer) -> None:
+        self.summarizer = summarizer
+        self.hits = 0
+        self.misses = 0
+        # (키, 컨텍스트)를 한 번에 교체하므로 스레드 풀에서 실행되는 노드가 읽어도 일관됨
+        self._entry: Tuple[Optional[Tuple[int, int]], Dict[str, str]] = (None, {})
+
+    def get(self, budget_tokens: int = SENSOR_CONTEXT_TOKENS) -> Dict[str, str]:
+        summarizer = self.summarizer
+        key = (summarizer.version, budget_tokens)
+        cached_key, context = self._entry
+        if cached_key == key:
+            self.hits += 1
+        else:
+            self.misses += 1
+            context = summarizer.encode(budget_tokens, summarizer.latest_ns)
+            self._entry = (key, context)
+        # 호출한 쪽에서 수정해도 캐시에 영향이 없도록 복사 (항목 수는 채널 수 정도)
+        return dict(context)
+
+    def get_stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "version": self.summarizer.version,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else None,
+        }
@@ -0,0 +1,24 @@
+import os
+
+from .sensor_bus import SensorBus
+from .sensor_ingest import create_scaner_server
+from .sensor_stream import SensorStreamHub
+from .sensor_summary import SensorContextCache, SensorSummarizer
+from .shared_sensors import SharedScanerView
+
+# 모든 센서 수신기가 발행하는 버스 (조회는 sensor_bus를 통해)
+sensor_bus = SensorBus()
+
+# 프로세스 전체에서 공유하는 센서 수신기 (수신은 server.py의 lifespan에서 시작/종료)
+# SENSOR_SHM: 여러 워커로 실행할 때 전용 수신 프로세스(sensor_ingest)가 발행하는 공유 메모리 이름.
+#             설정하면 소켓을 열지 않고 공유 메모리의 링 버퍼를 조회함
+sensor_shm = os.environ.get("SENSOR_SHM")
+if sensor_shm:
+    sensor_server = SharedScanerView(sensor_shm, bus=sensor_bus)
+else:
+    sensor_server = create_scaner_server(bus=sensor_bus)
+sensor_stream_hub = SensorStreamHub(sensor_server)
+
+# 프롬프트용 센서 요약 (server.py의 lifespan에서 주기적으로 갱신)
+sensor_summarizer = SensorSummarizer(sensor_bus)
+sensor_context_cache = SensorContextCache(sensor_summarizer)
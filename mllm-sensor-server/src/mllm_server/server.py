@@ -1,18 +1,51 @@
 import logging
-from typing import Dict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict
 
 from dotenv import load_dotenv
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from .routers.chatbot import chatbot_router
+from .routers.chatbot import chatbot_lifespan, chatbot_router
+from .routers.sensors import sensors_router
+from .sensor_ingest import run_scaner_ingest
+from .sensors import sensor_server, sensor_stream_hub, sensor_summarizer
+from .shared_sensors import SharedScanerView
 
 
 load_dotenv()
 
 logger = logging.getLogger(__name__)
-fastapi_app = FastAPI()
+
+
+@asynccontextmanager
+async def run_sensors() -> AsyncIterator[None]:
+    # SENSOR_SHM 모드에서는 수신 프로세스가 소켓/기록/재생을 맡고 워커는 공유 메모리에 연결만 함
+    if isinstance(sensor_server, SharedScanerView):
+        await sensor_server.start()
+        try:
+            yield
+        finally:
+            await sensor_server.stop()
+        return
+
+    async with run_scaner_ingest(sensor_server):
+        yield
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # 소켓, 체크포인터 연결, 그래프 컴파일은 모두 여기서 시작 (import 시에는 아무것도 열지 않음)
+    async with chatbot_lifespan(), run_sensors(), sensor_summarizer.running():
+        try:
+            yield
+        finally:
+            await sensor_stream_hub.close()
+
+
+fastapi_app = FastAPI(lifespan=lifespan)
 fastapi_app.include_router(chatbot_router)
+fastapi_app.include_router(sensors_router)
 
 origins = [
     "http://localhost",
@@ -0,0 +1,318 @@
+import asyncio
+import dataclasses
+import logging
+import sys
+import time
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+import orjson
+
+from .channels import ChannelRegistry, ChannelSpec
+from .sensor_bus import SensorBus
+from .timeseries import TimeSeriesRing
+
+logger = logging.getLogger(__name__)
+
+SENSOR_SHM_NAME = "mllm_sensors"
+SHM_MAGIC = 0x4D4C4C4D53454E53  # "MLLMSENS"
+SHM_LAYOUT_VERSION = 1
+CACHE_LINE = 64
+STATS_BYTES = 256 * 1024  # 수신 통계(JSON) 영역
+STATS_INTERVAL_S = 0.5  # 수신 프로세스가 통계와 heartbeat를 갱신하는 주기
+HEARTBEAT_TIMEOUT_S = 5.0  # heartbeat가 이보다 오래되면 워커가 다시 연결을 시도
+STATS_READ_RETRIES = 1000
+
+# 헤더 (int64 슬롯)
+H_MAGIC = 0
+H_VERSION = 1
+H_CAPACITY = 2
+H_CHANNELS = 3
+H_META_LENGTH = 4
+H_STATS_SEQUENCE = 5  # 통계 seqlock (홀수: 기록 중)
+H_STATS_LENGTH = 6
+H_STARTED_NS = 7  # 수신 프로세스 시작 시각 (재시작 감지용)
+H_HEARTBEAT_NS = 8
+H_CLOSED = 9
+HEADER_SLOTS = 16
+
+
+def _align(size: int) -> int:
+    return (size + CACHE_LINE - 1) // CACHE_LINE * CACHE_LINE
+
+
+def _open_untracked(name: str) -> shared_memory.SharedMemory:
+    # 연결만 하는 프로세스가 종료될 때 resource tracker가 세그먼트를 지우지 않도록 함 (삭제는 수신 프로세스만)
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name, track=False)
+    shm = shared_memory.SharedMemory(name)
+    resource_tracker.unregister(shm._name, "shared_memory")
+    return shm
+
+
+class SharedTimeSeriesRing(TimeSeriesRing):
+    """
+    공유 메모리 위의 TimeSeriesRing. 값/수신 시각 배열과 카운터(count, write_end)를 모두 공유 메모리에 둡니다.
+
+    TimeSeriesRing의 count는 원래 seqlock의 시퀀스 역할을 하므로, 카운터만 공유 메모리로 옮기면 다른 프로세스의
+    reader도 같은 방식(window() 후 is_intact())으로 락 없이 읽을 수 있습니다. writer는 수신 프로세스 하나이며,
+    8바이트 정렬 정수의 저장이 원자적이고 저장/읽기 순서가 유지되는 x86-64를 전제로 합니다.
+    """
+
+    def __init__(self, capacity: int, counters: np.ndarray, values: np.ndarray, timestamps: np.ndarray) -> None:
+        self.capacity = capacity
+        self._size = capacity + 1
+        self.generation = 0
+        self._bind(counters, values, timestamps)
+
+    def _bind(self, counters: np.ndarray, values: np.ndarray, timestamps: np.ndarray) -> None:
+        self._counters = counters  # [count, write_end]
+        self._values = values
+        self._timestamps = timestamps
+
+    def rebind(self, counters: np.ndarray, values: np.ndarray, timestamps: np.ndarray) -> None:
+        # 수신 프로세스가 다시 시작되면 같은 링 객체를 새 공유 메모리에 연결 (버스/구독은 그대로 유지)
+        # 새 세그먼트의 count는 0부터 시작하므로 generation을 올려 구독자가 커서를 처음부터 다시 세게 함
+        self._bind(counters, values, timestamps)
+        self.generation += 1
+
+    @property
+    def _count(self) -> int:
+        return int(self._counters[0])
+
+    @_count.setter
+    def _count(self, value: int) -> None:
+        self._counters[0] = value
+
+    @property
+    def _write_end(self) -> int:
+        return int(self._counters[1])
+
+    @_write_end.setter
+    def _write_end(self, value: int) -> None:
+        self._counters[1] = value
+
+
+class SharedSensorStore:
+    """
+    수신 프로세스가 만들고(create) API 워커가 연결(attach)하는 공유 메모리 세그먼트입니다.
+
+    배치: 헤더 | 채널 목록(JSON) | 통계(JSON, seqlock) | 채널별 [카운터 | 값 x 2 | 수신 시각 x 2]
+    채널 블록은 캐시 라인 단위로 정렬해 채널끼리 카운터가 같은 캐시 라인을 쓰지 않게 합니다.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool) -> None:
+        self.shm = shm
+        self.owner = owner
+        self.header = np.ndarray((HEADER_SLOTS,), dtype=np.int64, buffer=shm.buf)
+        if self.header[H_MAGIC] != SHM_MAGIC or self.header[H_VERSION] != SHM_LAYOUT_VERSION:
+            raise ValueError(f"Shared memory {shm.name} is not a sensor store (layout {SHM_LAYOUT_VERSION})")
+        self.capacity = int(self.header[H_CAPACITY])
+        meta_offset = _align(HEADER_SLOTS * 8)
+        meta_length = int(self.header[H_META_LENGTH])
+        self.specs = [ChannelSpec(**item) for item in orjson.loads(bytes(shm.buf[meta_offset : meta_offset + meta_length]))]
+        self._stats_offset = meta_offset + _align(meta_length)
+
+        size = self.capacity + 1
+        offset = self._stats_offset + STATS_BYTES
+        self.rings: Dict[str, SharedTimeSeriesRing] = {}
+        for spec in self.specs:
+            counters = np.ndarray((2,), dtype=np.int64, buffer=shm.buf, offset=offset)
+            offset += CACHE_LINE
+            values = np.ndarray((size * 2,), dtype=np.float64, buffer=shm.buf, offset=offset)
+            offset += _align(size * 2 * 8)
+            timestamps = np.ndarray((size * 2,), dtype=np.int64, buffer=shm.buf, offset=offset)
+            offset += _align(size * 2 * 8)
+            self.rings[spec.name] = SharedTimeSeriesRing(self.capacity, counters, values, timestamps)
+
+    @staticmethod
+    def segment_size(specs: Sequence[ChannelSpec], capacity: int, meta_length: int) -> int:
+        channel_size = CACHE_LINE + 2 * _align((capacity + 1) * 2 * 8)
+        return _align(HEADER_SLOTS * 8) + _align(meta_length) + STATS_BYTES + channel_size * len(specs)
+
+    @classmethod
+    def create(cls, name: str, specs: Sequence[ChannelSpec], capacity: int) -> "SharedSensorStore":
+        meta = orjson.dumps([dataclasses.asdict(spec) for spec in specs])
+        try:
+            shm = shared_memory.SharedMemory(name, create=True, size=cls.segment_size(specs, capacity, len(meta)))
+        except FileExistsError:
+            # 이전 수신 프로세스가 정리하지 못하고 종료된 경우. 연결된 워커는 heartbeat로 재시작을 감지함
+            logger.warning(f"Replacing stale sensor shared memory {name}")
+            stale = _open_untracked(name)
+            stale.close()
+            stale.unlink()
+            shm = shared_memory.SharedMemory(name, create=True, size=cls.segment_size(specs, capacity, len(meta)))
+        header = np.ndarray((HEADER_SLOTS,), dtype=np.int64, buffer=shm.buf)
+        header[:] = 0
+        header[H_CAPACITY] = capacity
+        header[H_CHANNELS] = len(specs)
+        header[H_META_LENGTH] = len(meta)
+        header[H_STARTED_NS] = header[H_HEARTBEAT_NS] = time.monotonic_ns()
+        meta_offset = _align(HEADER_SLOTS * 8)
+        shm.buf[meta_offset : meta_offset + len(meta)] = meta
+        # 배치를 모두 쓴 뒤에 매직 값을 기록 (그 전에 연결한 워커는 ValueError로 다시 시도)
+        header[H_VERSION] = SHM_LAYOUT_VERSION
+        header[H_MAGIC] = SHM_MAGIC
+        del header
+        logger.info(f"Sensor shared memory {name} created: {len(specs)} channels x {capacity} samples ({shm.size} bytes)")
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedSensorStore":
+        shm = _open_untracked(name)
+        try:
+            return cls(shm, owner=False)
+        except Exception:
+            shm.close()
+            raise
+
+    @property
+    def started_ns(self) -> int:
+        return int(self.header[H_STARTED_NS])
+
+    @property
+    def closed(self) -> bool:
+        return bool(self.header[H_CLOSED])
+
+    def heartbeat_age_s(self) -> float:
+        return (time.monotonic_ns() - int(self.header[H_HEARTBEAT_NS])) / 1e9
+
+    def publish_stats(self, stats: Dict[str, Any]) -> None:
+        data = orjson.dumps(stats, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+        if len(data) > STATS_BYTES:
+            logger.warning(f"Sensor stats ({len(data)} bytes) do not fit in shared memory, skipped")
+            data = b"{}"
+        sequence = int(self.header[H_STATS_SEQUENCE])
+        self.header[H_STATS_SEQUENCE] = sequence + 1  # 홀수: 기록 중
+        self.header[H_STATS_LENGTH] = len(data)
+        self.shm.buf[self._stats_offset : self._stats_offset + len(data)] = data
+        self.header[H_STATS_SEQUENCE] = sequence + 2
+        self.header[H_HEARTBEAT_NS] = time.monotonic_ns()
+
+    def read_stats(self) -> Dict[str, Any]:
+        # seqlock: 시퀀스가 짝수이고 복사 전후로 같을 때만 사용
+        for _ in range(STATS_READ_RETRIES):
+            sequence = int(self.header[H_STATS_SEQUENCE])
+            if sequence % 2:
+                time.sleep(0)
+                continue
+            length = min(int(self.header[H_STATS_LENGTH]), STATS_BYTES)
+            data = bytes(self.shm.buf[self._stats_offset : self._stats_offset + length])
+            if int(self.header[H_STATS_SEQUENCE]) == sequence:
+                return orjson.loads(data) if data else {}
+        return {}
+
+    def close(self) -> None:
+        if self.owner:
+            self.header[H_CLOSED] = 1
+        # 워커에서 아직 쓰는 뷰가 있으면 매핑을 해제할 수 없으므로 참조만 버림 (뷰가 사라질 때 해제)
+        self.rings = {}
+        self.header = None
+        try:
+            self.shm.close()
+        except BufferError:
+            pass
+
+    def unlink(self) -> None:
+        try:
+            self.shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class SharedScanerView:
+    """
+    API 워커용 SCANeR 수신기 대체. 전용 수신 프로세스(sensor_ingest)가 공유 메모리에 발행한 채널의 링 버퍼를
+    복사 없이 연결하고, ScanerFilterServer의 조회 API(channels, get_channel_stats, get_ingest_stats)를 제공합니다.
+    소켓은 열지 않습니다.
+
+    start()는 세그먼트가 생길 때까지 기다렸다가 연결하며, 수신 프로세스가 다시 시작되면(종료 표시 또는 heartbeat 중단)
+    같은 링 객체를 새 세그먼트에 다시 연결합니다.
+    """
+
+    def __init__(
+        self,
+        name: str = SENSOR_SHM_NAME,
+        bus: Optional[SensorBus] = None,
+        retry_interval_s: float = 1.0,
+    ) -> None:
+        self.name = name
+        self.bus = bus
+        self.retry_interval_s = retry_interval_s
+        self.store: Optional[SharedSensorStore] = None
+        self.channels = ChannelRegistry([], 1)
+        self.recorder = None  # 기록/재생은 수신 프로세스에서 처리
+        self.reattached = 0
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def attached(self) -> bool:
+        return self.store is not None
+
+    def attach(self) -> bool:
+        try:
+            store = SharedSensorStore.attach(self.name)
+        except (FileNotFoundError, ValueError):
+            return False
+        if self.store is None:
+            self.channels = ChannelRegistry(store.specs, store.capacity, store.rings)
+            if self.bus is not None:
+                for channel in self.channels:
+                    spec = channel.spec
+                    self.bus.register(spec.name, "scaner", channel.history, spec.label, spec.unit)
+            logger.info(f"Attached to sensor shared memory {self.name} ({len(store.specs)} channels)")
+        else:
+            if store.started_ns == self.store.started_ns:
+                store.close()
+                return True
+            if store.specs != self.store.specs or store.capacity != self.store.capacity:
+                logger.error(f"Sensor shared memory {self.name} changed its channels, restart the workers to apply")
+                store.close()
+                return False
+            for channel in self.channels:
+                ring = store.rings[channel.spec.name]
+                channel.history.rebind(ring._counters, ring._values, ring._timestamps)
+            # 이전 세그먼트의 매핑과 파일 디스크립터를 해제 (읽는 중인 뷰가 있으면 뷰가 사라질 때 해제)
+            self.store.close()
+            self.reattached += 1
+            logger.info(f"Re-attached to restarted sensor ingest ({self.name})")
+        self.store = store
+        return True
+
+    async def _watch(self) -> None:
+        while True:
+            store = self.store
+            if store is None or store.closed or store.heartbeat_age_s() > HEARTBEAT_TIMEOUT_S:
+                self.attach()
+            await asyncio.sleep(self.retry_interval_s)
+
+    async def start(self) -> None:
+        if not self.attach():
+            logger.warning(f"Sensor shared memory {self.name} is not ready, waiting for the ingest process...")
+        self._task = asyncio.create_task(self._watch())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _stats(self) -> Dict[str, Any]:
+        return self.store.read_stats() if self.store is not None else {}
+
+    def get_channel_stats(self) -> Dict[str, Dict[str, Any]]:
+        return self._stats().get("channels", {})
+
+    def get_ingest_stats(self) -> Dict[str, Any]:
+        result = dict(self._stats().get("ingest", {}))
+        result["shared_memory"] = self.name
+        result["attached"] = self.attached
+        if self.store is not None:
+            result["ingest_heartbeat_age_s"] = self.store.heartbeat_age_s()
+            result["reattached"] = self.reattached
+        return result
+
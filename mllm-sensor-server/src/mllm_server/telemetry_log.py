@@ -0,0 +1,342 @@
+import argparse
+import asyncio
+import logging
+import mmap
+import os
+import socket
+import struct
+import threading
+import time
+from typing import Callable, Dict, Iterator, NamedTuple, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# 파일 구조 (little-endian)
+#   헤더 32바이트: magic(8) version(u32) reserved(u32) created_unix_ns(i64) reserved(8)
+#   레코드: receive_ns(i64) length(u32) source(u32) payload(length) + 8바이트 정렬 패딩
+#   length == 0 인 레코드 헤더(미사용 영역)에서 로그가 끝남
+# 인덱스 파일 (<log>.idx): 레코드마다 (receive_ns, offset)
+LOG_MAGIC = b"MLLMTLOG"
+LOG_VERSION = 1
+LOG_HEADER = struct.Struct("<8sIIq8x")
+RECORD_HEADER = struct.Struct("<qII")
+INDEX_DTYPE = np.dtype([("timestamp_ns", "<i8"), ("offset", "<u8")])
+CHUNK_SIZE = 64 * 1024 * 1024
+
+SOURCE_SCANER = 1
+SOURCE_MDAQ = 2
+
+
+def _align(size: int) -> int:
+    return (size + 7) & ~7
+
+
+class TelemetryRecord(NamedTuple):
+    timestamp_ns: int  # 수신 시각 (time.monotonic_ns())
+    source: int
+    payload: memoryview  # 로그 mmap의 뷰 (핸들러 밖으로 보관하지 말 것)
+
+
+class TelemetryRecorder:
+    """
+    수신한 원본 데이터그램을 수신 시각과 함께 메모리 맵 파일에 append-only로 기록합니다.
+    파일은 chunk_size 단위로 늘어나며, close() 시 실제 기록한 길이로 잘립니다.
+    """
+
+    def __init__(self, path: str, chunk_size: int = CHUNK_SIZE) -> None:
+        self.path = path
+        self.chunk_size = chunk_size
+        self._lock = threading.Lock()  # SCANeR / MDAQ 수신 스레드가 동시에 기록할 수 있음
+        self._file = open(path, "w+b")
+        self._file.truncate(chunk_size)
+        self._mmap = mmap.mmap(self._file.fileno(), chunk_size)
+        self._mmap[: LOG_HEADER.size] = LOG_HEADER.pack(LOG_MAGIC, LOG_VERSION, 0, time.time_ns())
+        self._offset = LOG_HEADER.size
+        self._index = open(path + ".idx", "wb")
+        self.records = 0
+        self.skipped_empty = 0
+        logger.info(f"Recording telemetry to {path}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _grow(self, required: int) -> None:
+        size = len(self._mmap)
+        while size < required:
+            size += self.chunk_size
+        self._mmap.flush()
+        self._mmap.close()
+        self._file.truncate(size)
+        self._mmap = mmap.mmap(self._file.fileno(), size)
+
+    def append(self, data: bytes, source: int, receive_ns: Optional[int] = None) -> None:
+        if receive_ns is None:
+            receive_ns = time.monotonic_ns()
+        length = len(data)
+        if length == 0:
+            # 길이 0인 레코드 헤더는 로그의 끝 표시이므로 빈 데이터그램은 기록하지 않음 (인덱스 재구성이 멈춤)
+            self.skipped_empty += 1
+            return
+        with self._lock:
+            if self._mmap is None:
+                return
+            offset = self._offset
+            end = offset + RECORD_HEADER.size + _align(length)
+            # 다음 레코드 헤더(종료 표시) 자리까지 확보
+            if end + RECORD_HEADER.size > len(self._mmap):
+                self._grow(end + RECORD_HEADER.size)
+            payload_offset = offset + RECORD_HEADER.size
+            self._mmap[payload_offset : payload_offset + length] = data
+            RECORD_HEADER.pack_into(self._mmap, offset, receive_ns, length, source)
+            self._offset = end
+            self._index.write(struct.pack("<qQ", receive_ns, offset))
+            self.records += 1
+
+    def close(self) -> None:
+        with self._lock:
+            if self._mmap is None:
+                return
+            self._mmap.flush()
+            self._mmap.close()
+            self._mmap = None
+            self._file.truncate(self._offset)
+            self._file.close()
+            self._index.close()
+        logger.info(f"Recorded {self.records} records to {self.path}")
+
+
+class TelemetryLog:
+    """
+    TelemetryRecorder가 기록한 로그를 읽기 전용 메모리 맵으로 엽니다. 인덱스로 수신 시각 기준 탐색이 가능합니다.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._file = open(path, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+        magic, version, _, self.created_unix_ns = LOG_HEADER.unpack_from(self._mmap, 0)
+        if magic != LOG_MAGIC or version != LOG_VERSION:
+            raise ValueError(f"Not a telemetry log (v{LOG_VERSION}): {path}")
+        self.index = self._load_index()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def _scan_index(self) -> np.ndarray:
+        entries = []
+        offset = LOG_HEADER.size
+        end = len(self._mmap)
+        while offset + RECORD_HEADER.size <= end:
+            receive_ns, length, _ = RECORD_HEADER.unpack_from(self._mmap, offset)
+            if length == 0:
+                break
+            entries.append((receive_ns, offset))
+            offset += RECORD_HEADER.size + _align(length)
+        return np.array(entries, dtype=INDEX_DTYPE)
+
+    def _is_complete(self, index: np.ndarray) -> bool:
+        # 인덱스의 마지막 레코드 뒤에 기록된 레코드가 더 있는지 확인
+        end = LOG_HEADER.size
+        if len(index):
+            offset = int(index["offset"][-1])
+            if offset + RECORD_HEADER.size > len(self._mmap):
+                return False
+            _, length, _ = RECORD_HEADER.unpack_from(self._mmap, offset)
+            end = offset + RECORD_HEADER.size + _align(length)
+        if end + RECORD_HEADER.size > len(self._mmap):
+            return True
+        _, length, _ = RECORD_HEADER.unpack_from(self._mmap, end)
+        return length == 0
+
+    def _load_index(self) -> np.ndarray:
+        index_path = self.path + ".idx"
+        if os.path.exists(index_path):
+            index = np.fromfile(index_path, dtype=INDEX_DTYPE)
+            if self._is_complete(index):
+                return index
+        # 비정상 종료 등으로 인덱스가 로그와 맞지 않으면 다시 만듦
+        logger.warning(f"Rebuilding telemetry index for {self.path}")
+        return self._scan_index()
+
+    @property
+    def buffer(self) -> memoryview:
+        """
+        로그 파일 전체(헤더 포함)의 읽기 전용 뷰. 레코드 위치는 index["offset"]이며, 닫은 뒤에는 사용할 수 없습니다.
+        """
+        return self._view
+
+    @property
+    def duration_s(self) -> float:
+        if len(self.index) < 2:
+            return 0.0
+        return (int(self.index["timestamp_ns"][-1]) - int(self.index["timestamp_ns"][0])) / 1e9
+
+    def seek(self, timestamp_ns: int) -> int:
+        """
+        수신 시각이 timestamp_ns 이상인 첫 레코드 번호
+        """
+        return int(np.searchsorted(self.index["timestamp_ns"], timestamp_ns, side="left"))
+
+    def seek_seconds(self, seconds: float) -> int:
+        if not len(self.index):
+            return 0
+        return self.seek(int(self.index["timestamp_ns"][0]) + int(seconds * 1e9))
+
+    def record(self, number: int) -> TelemetryRecord:
+        offset = int(self.index["offset"][number])
+        receive_ns, length, source = RECORD_HEADER.unpack_from(self._mmap, offset)
+        payload_offset = offset + RECORD_HEADER.size
+        return TelemetryRecord(receive_ns, source, self._view[payload_offset : payload_offset + length])
+
+    def records(self, start: int = 0, source: Optional[int] = None) -> Iterator[TelemetryRecord]:
+        for number in range(start, len(self.index)):
+            record = self.record(number)
+            if source is None or record.source == source:
+                yield record
+
+    def source_counts(self) -> Dict[int, int]:
+        counts: Dict[int, int] = {}
+        for offset in self.index["offset"].tolist():
+            _, _, source = RECORD_HEADER.unpack_from(self._mmap, offset)
+            counts[source] = counts.get(source, 0) + 1
+        return counts
+
+    def close(self) -> None:
+        try:
+            self._view.release()
+            self._mmap.close()
+        except BufferError:
+            logger.warning(f"Telemetry log {self.path} is still referenced; leaving it mapped")
+        self._file.close()
+
+
+TelemetryHandler = Callable[[memoryview], None]
+
+
+class TelemetryReplayer:
+    """
+    로그의 레코드를 출처별 핸들러로 다시 전달합니다.
+    speed=1.0이면 실제 시간, 2.0이면 2배속, None이면 가능한 한 빠르게 재생합니다.
+    """
+
+    def __init__(
+        self,
+        log: TelemetryLog,
+        handlers: Dict[int, TelemetryHandler],
+        speed: Optional[float] = 1.0,
+    ) -> None:
+        if speed is not None and speed <= 0:
+            raise ValueError(f"Invalid replay speed: {speed}")
+        self.log = log
+        self.handlers = handlers
+        self.speed = speed
+        self.is_active = False
+
+    def _delay_ns(self, record: TelemetryRecord, base_ns: int, start_ns: int, now_ns: int) -> int:
+        if self.speed is None:
+            return 0
+        target_ns = start_ns + int((record.timestamp_ns - base_ns) / self.speed)
+        return target_ns - now_ns
+
+    def replay(self, start: int = 0) -> int:
+        self.is_active = True
+        replayed = 0
+        base_ns = start_ns = None
+        for record in self.log.records(start):
+            if not self.is_active:
+                break
+            handler = self.handlers.get(record.source)
+            if handler is None:
+                continue
+            if base_ns is None:
+                base_ns, start_ns = record.timestamp_ns, time.monotonic_ns()
+            delay_ns = self._delay_ns(record, base_ns, start_ns, time.monotonic_ns())
+            if delay_ns > 0:
+                time.sleep(delay_ns / 1e9)
+            handler(record.payload)
+            replayed += 1
+        self.is_active = False
+        return replayed
+
+    async def replay_async(self, start: int = 0) -> int:
+        self.is_active = True
+        replayed = 0
+        base_ns = start_ns = None
+        for record in self.log.records(start):
+            if not self.is_active:
+                break
+            handler = self.handlers.get(record.source)
+            if handler is None:
+                continue
+            if base_ns is None:
+                base_ns, start_ns = record.timestamp_ns, time.monotonic_ns()
+            delay_ns = self._delay_ns(record, base_ns, start_ns, time.monotonic_ns())
+            # 빠른 재생에서도 이벤트 루프를 주기적으로 양보
+            if delay_ns > 0 or replayed % 256 == 0:
+                await asyncio.sleep(max(delay_ns, 0) / 1e9)
+            handler(record.payload)
+            replayed += 1
+        self.is_active = False
+        return replayed
+
+    def stop(self) -> None:
+        self.is_active = False
+
+
+def udp_handler(address: str) -> TelemetryHandler:
+    """
+    레코드를 UDP로 다시 보내는 핸들러 (예: 로컬 수신기의 처리량 측정)
+    """
+    host, port = address.rsplit(":", 1)
+    target = (host, int(port))
+    sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    return lambda payload: sender.sendto(payload, target)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="SCANeR/MDAQ telemetry log tool")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    info_parser = subparsers.add_parser("info")
+    info_parser.add_argument("path")
+
+    replay_parser = subparsers.add_parser("replay")
+    replay_parser.add_argument("path")
+    replay_parser.add_argument("--scaner", help="SCANeR 레코드를 보낼 host:port")
+    replay_parser.add_argument("--mdaq", help="MDAQ 레코드를 보낼 host:port")
+    replay_parser.add_argument("--speed", type=float, default=1.0, help="0이면 최대 속도")
+    replay_parser.add_argument("--start", type=float, default=0.0, help="시작 위치 (초)")
+
+    args = parser.parse_args()
+    with TelemetryLog(args.path) as log:
+        if args.command == "info":
+            print(
+                f"{args.path}: {len(log)} records, {log.duration_s:.1f} s, "
+                f"sources={log.source_counts()}"
+            )
+            return
+
+        handlers = {}
+        if args.scaner:
+            handlers[SOURCE_SCANER] = udp_handler(args.scaner)
+        if args.mdaq:
+            handlers[SOURCE_MDAQ] = udp_handler(args.mdaq)
+        replayer = TelemetryReplayer(log, handlers, speed=args.speed or None)
+        replayed = replayer.replay(log.seek_seconds(args.start))
+        print(f"Replayed {replayed} records")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+import time
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+
+def capacity_for(minutes: float, rate_hz: float) -> int:
+    return int(minutes * 60 * rate_hz)
+
+
+class TimeSeriesWindow(NamedTuple):
+    start: int  # 창의 첫 샘플의 절대 인덱스 (TimeSeriesRing.count 기준)
+    values: np.ndarray
+    timestamps: np.ndarray  # time.monotonic_ns()
+
+
+class TimeSeriesRing:
+    """
+    미리 할당한 float64 값 / int64 수신 시각(monotonic ns) 배열 위의 단일 writer 링 버퍼입니다.
+
+    모든 샘플을 두 번(i, i + size) 기록하는 미러링 방식이라 최근 N개 구간은 항상 연속된 메모리이며,
+    window()는 복사 없는 뷰를 반환합니다. 누적 기록 수(count)가 시퀀스 카운터 역할을 하며,
+    reader는 락 없이 읽은 뒤 is_intact()로 그 사이에 덮어써지지 않았는지 확인합니다.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        if capacity <= 0:
+            raise ValueError(f"Invalid capacity: {capacity}")
+        self.capacity = capacity
+        # writer가 기록 중인 슬롯 하나를 여유로 두어 capacity개 전체를 항상 읽을 수 있게 함
+        self._size = capacity + 1
+        self._values = np.zeros(self._size * 2, dtype=np.float64)
+        self._timestamps = np.zeros(self._size * 2, dtype=np.int64)
+        self._count = 0
+        self._write_end = 0  # extend()가 기록 중인 구간의 끝 (절대 인덱스)
+        self.generation = 0  # 링이 새 버퍼에 다시 연결된 횟수. 바뀌면 count가 0부터 다시 시작됨
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    def __len__(self) -> int:
+        return min(self._count, self.capacity)
+
+    def append(self, value: float, timestamp_ns: Optional[int] = None) -> None:
+        if timestamp_ns is None:
+            timestamp_ns = time.monotonic_ns()
+        idx = self._count % self._size
+        self._values[idx] = value
+        self._values[idx + self._size] = value
+        self._timestamps[idx] = timestamp_ns
+        self._timestamps[idx + self._size] = timestamp_ns
+        # 기록이 끝난 뒤에 카운터를 올림 (reader에게 공개)
+        self._count += 1
+
+    def extend(self, values: np.ndarray, timestamps: Optional[np.ndarray] = None) -> None:
+        """
+        여러 샘플을 한 번에 기록합니다. capacity보다 많으면 마지막 capacity개만 남습니다.
+        """
+        n = len(values)
+        if n == 0:
+            return
+        if timestamps is None:
+            timestamps = np.full(n, time.monotonic_ns(), dtype=np.int64)
+        k = min(n, self.capacity)
+        idx = (self._count + np.arange(n - k, n)) % self._size
+        # 덮어쓸 구간을 먼저 공개해 reader가 is_intact()로 알 수 있게 함
+        self._write_end = self._count + n
+        self._values[idx] = values[n - k :]
+        self._values[idx + self._size] = values[n - k :]
+        self._timestamps[idx] = timestamps[n - k :]
+        self._timestamps[idx + self._size] = timestamps[n - k :]
+        self._count += n
+
+    def is_intact(self, window: TimeSeriesWindow) -> bool:
+        # writer는 다음에 절대 인덱스 count를 기록하며, 이는 count - size 위치를 덮어씀
+        # extend() 중이면 write_end - 1까지 기록하므로 write_end - 1 - size 위치까지 덮어씀
+        write_end = max(self._count + 1, self._write_end)
+        return window.start >= write_end - self._size
+
+    def window(self, n: Optional[int] = None) -> TimeSeriesWindow:
+        """
+        최근 n개 샘플(기본: 전체)의 zero-copy 뷰. 뷰를 다 사용한 뒤 is_intact()로 확인해야 합니다.
+        """
+        count = self._count
+        available = min(count, self.capacity)
+        n = available if n is None else max(0, min(n, available))
+        start = count - n
+        offset = start % self._size
+        return TimeSeriesWindow(
+            start,
+            self._values[offset : offset + n],
+            self._timestamps[offset : offset + n],
+        )
+
+    def window_since(self, since_ns: int) -> TimeSeriesWindow:
+        """
+        수신 시각이 since_ns 이상인 샘플의 zero-copy 뷰 (예: 최근 N초).
+        """
+        full = self.window()
+        skip = int(np.searchsorted(full.timestamps, since_ns, side="left"))
+        return TimeSeriesWindow(full.start + skip, full.values[skip:], full.timestamps[skip:])
+
+    def window_seconds(self, seconds: float, now_ns: Optional[int] = None) -> TimeSeriesWindow:
+        if now_ns is None:
+            now_ns = time.monotonic_ns()
+        return self.window_since(now_ns - int(seconds * 1e9))
+
+    def snapshot(self, n: Optional[int] = None) -> TimeSeriesWindow:
+        """
+        최근 n개 샘플의 일관된 복사본. 읽는 도중 덮어써졌으면 다시 읽습니다.
+        """
+        while True:
+            window = self.window(n)
+            snapshot = TimeSeriesWindow(window.start, window.values.copy(), window.timestamps.copy())
+            if self.is_intact(window):
+                return snapshot
+
+    def snapshot_seconds(self, seconds: float, now_ns: Optional[int] = None) -> TimeSeriesWindow:
+        while True:
+            window = self.window_seconds(seconds, now_ns)
+            snapshot = TimeSeriesWindow(window.start, window.values.copy(), window.timestamps.copy())
+            if self.is_intact(window):
+                return snapshot
+
+    def latest(self) -> Optional[float]:
+        count = self._count
+        if count == 0:
+            return None
+        return float(self._values[(count - 1) % self._size])
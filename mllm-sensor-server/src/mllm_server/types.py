@@ -1,4 +1,4 @@
-from typing import Iterable, List, Literal, Optional, Union
+from typing import Any, Iterable, List, Literal, Mapping, Optional, Union
 from pydantic import BaseModel
 
 # ---- Elements ----
@@ -84,6 +84,25 @@ class UserMessage(BaseModel):
     name: Optional[str] = None
 
 
+# ---- Requests ----
+
+
+class EventFilter(BaseModel):
+    events: Optional[List[str]] = None
+    """전달할 이벤트 종류 (예: ["on_chat_model_stream"]). 없으면 전체"""
+    names: Optional[List[str]] = None
+    """전달할 실행 이름 (노드/모델 이름, 예: ["chatbot"]). 없으면 전체"""
+
+    def matches(self, event: Mapping[str, Any]) -> bool:
+        return (self.events is None or event["event"] in self.events) and (
+            self.names is None or event["name"] in self.names
+        )
+
+
 class ChatRequest(BaseModel):
     session: Optional[str] = None
+    priority: Literal["interactive", "batch"] = "interactive"
+    """LLM 대기열 우선순위. 대화형 요청이 배치 작업보다 먼저 처리됩니다."""
+    event_filter: Optional[EventFilter] = None
+    """스트림으로 받을 이벤트. 조건에 맞지 않는 이벤트는 직렬화하지 않습니다."""
     messages: List[Union[UserMessage, AssistantMessage, SystemMessage, ToolCallMessage]]
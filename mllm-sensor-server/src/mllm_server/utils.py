@@ -1,7 +1,11 @@
 import logging
-from typing import Any
+import math
+import re
+from typing import Any, Mapping, Set
 
+import orjson
 from pydantic import BaseModel
+from pydantic_core import PydanticSerializationError
 
 logger = logging.getLogger(__name__)
 
@@ -21,4 +25,45 @@ def convert_serializable(obj: Any) -> Any:
         return obj
     else:
         logger.warning(f"Serialization Failed: {obj}")
-        return "(Object)"
\ No newline at end of file
+        return "(Object)"
+
+
+_unserializable_types: Set[type] = set()
+
+
+def _orjson_default(obj: Any) -> Any:
+    if isinstance(obj, BaseModel):
+        # 필드 직렬화기와 exclude 설정을 따르도록 model_dump()를 사용 (__dict__는 내부 속성까지 노출함)
+        try:
+            return obj.model_dump(mode="json")
+        except PydanticSerializationError:
+            pass
+        try:
+            # JSON으로 바꿀 수 없는 값이 있으면 파이썬 값으로 넘겨 orjson이 그 값만 다시 이 함수로 넘기도록 함
+            return obj.model_dump()
+        except Exception:
+            # 마지막 수단: 공개 필드 값만 그대로 전달
+            return {key: value for key, value in obj.__dict__.items() if not key.startswith("_")}
+    if type(obj) not in _unserializable_types:
+        # 같은 타입은 한 번만 경고
+        _unserializable_types.add(type(obj))
+        logger.warning(f"Serialization Failed: {type(obj).__name__}")
+    return "(Object)"
+
+
+def encode_event(event: Mapping[str, Any]) -> bytes:
+    """
+    LangGraph 이벤트를 NDJSON 한 줄로 직렬화합니다. convert_serializable()처럼 중간 dict를 만들지 않고
+    orjson이 직접 순회하며, 모델 객체만 default 훅에서 변환합니다.
+    """
+    return orjson.dumps(event, default=_orjson_default, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS)
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    LLaMA 계열 토크나이저의 대략적인 토큰 수 (숫자는 3자리씩, 단어는 4글자 단위로 나뉜다고 가정)
+    """
+    tokens = 0
+    for piece in re.findall(r"\d{1,3}|[^\W\d_]+|\S", text):
+        tokens += math.ceil(len(piece) / 4) if piece[0].isalpha() else 1
+    return tokens
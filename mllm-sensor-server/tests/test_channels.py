@@ -0,0 +1,84 @@
+import json
+
+import numpy as np
+import pytest
+
+from mllm_server.channels import DEFAULT_CHANNELS, Channel, ChannelSpec, RunningStats, load_channel_specs
+
+MS = 1_000_000
+
+
+def test_running_stats_match_numpy() -> None:
+    rng = np.random.default_rng(0)
+    # 큰 오프셋에서도 분산이 무너지지 않아야 함 (sum of squares 방식이면 정밀도를 잃음)
+    values = 1e6 + rng.normal(0.0, 0.5, 10_000)
+    stats = RunningStats()
+    for i, value in enumerate(values.tolist()):
+        stats.update(value, i * MS)
+
+    assert stats.count == len(values)
+    assert stats.mean == pytest.approx(np.mean(values), rel=1e-12)
+    assert stats.variance == pytest.approx(np.var(values, ddof=1), rel=1e-9)
+    assert (stats.min, stats.max, stats.last) == (values.min(), values.max(), values[-1])
+    assert stats.rate == pytest.approx((values[-1] - values[-2]) * 1e3)
+
+    stats.reset()
+    assert stats.as_dict() == {"count": 0}
+
+
+def test_running_stats_small_counts() -> None:
+    stats = RunningStats()
+    stats.update(3.0, 10 * MS)
+    assert (stats.mean, stats.variance, stats.rate) == (3.0, 0.0, 0.0)
+    # 같은 시각의 샘플은 변화율을 바꾸지 않음
+    stats.update(5.0, 10 * MS)
+    assert (stats.mean, stats.variance, stats.rate) == (4.0, 2.0, 0.0)
+
+
+@pytest.mark.parametrize("decimation", [1, 2, 3, 7])
+def test_channel_decimation(decimation: int) -> None:
+    channel = Channel(ChannelSpec(1, "speed", decimation=decimation), history_capacity=128)
+    values = np.arange(50, dtype=float)
+    for i, value in enumerate(values.tolist()):
+        channel.append(value, i * MS)
+
+    kept = values[decimation - 1 :: decimation]
+    assert channel.history.snapshot().values.tolist() == kept.tolist()
+    assert channel.history.snapshot().timestamps.tolist() == [int(v) * MS for v in kept]
+    assert channel.stats.count == len(kept)
+    assert channel.stats.mean == pytest.approx(kept.mean())
+
+
+def test_channel_rejects_invalid_decimation() -> None:
+    with pytest.raises(ValueError):
+        Channel(ChannelSpec(1, "speed", decimation=0), history_capacity=8)
+
+
+def test_load_channel_specs(tmp_path) -> None:
+    assert load_channel_specs(None) == DEFAULT_CHANNELS
+    path = tmp_path / "channels.json"
+    path.write_text(json.dumps([{"channel_id": 167, "name": "steering", "unit": "deg", "decimation": 2}]))
+    assert load_channel_specs(str(path)) == [ChannelSpec(167, "steering", unit="deg", decimation=2)]
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        "[{",  # JSON 아님
+        '{"channel_id": 167, "name": "steering"}',  # 목록 아님
+        "[167]",
+        '[{"channel_id": 167}]',  # name 없음
+        '[{"channel_id": 167, "name": "steering", "scale": 2}]',  # 모르는 필드
+        '[{"channel_id": "167", "name": "steering"}]',
+        '[{"channel_id": true, "name": "steering"}]',
+        '[{"channel_id": 167, "name": ""}]',
+        '[{"channel_id": 167, "name": "steering", "decimation": 0}]',
+        '[{"channel_id": 167, "name": "steering"}, {"channel_id": 120, "name": "steering"}]',
+        '[{"channel_id": 167, "name": "steering"}, {"channel_id": 167, "name": "speed"}]',
+    ],
+)
+def test_load_channel_specs_rejects_bad_file(tmp_path, content: str) -> None:
+    path = tmp_path / "channels.json"
+    path.write_text(content)
+    with pytest.raises(ValueError, match="Invalid SCANeR channel file"):
+        load_channel_specs(str(path))
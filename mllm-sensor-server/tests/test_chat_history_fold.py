@@ -0,0 +1,95 @@
+import asyncio
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.messages import HumanMessage
+from langgraph.checkpoint.memory import MemorySaver
+
+from mllm_server.chat_history import SUMMARY_TAG, HistoryWindow, message_tokens
+from mllm_server.llm_scheduler import LLMScheduler
+from mllm_server.response_cache import ResponseCache
+from mllm_server.routers.chatbot import router
+
+ANSWER = "Speed is steady."
+TIMEOUT_S = 2.0
+
+
+def test_history_is_folded_after_the_response(monkeypatch) -> None:
+    scheduler = LLMScheduler(default_limit=1)
+    monkeypatch.setattr(router, "llm_scheduler", scheduler)
+    monkeypatch.setattr(router, "llm_llama", FakeListChatModel(responses=[ANSWER]))
+    monkeypatch.setattr(router, "response_cache", ResponseCache(0))
+    monkeypatch.setattr(router, "history_window", HistoryWindow(max_turns=1, budget_tokens=1024, fold_turns=1))
+    monkeypatch.setattr(router, "simple_chat_graph", router.graph_builder.compile(checkpointer=MemorySaver()))
+    app = FastAPI()
+    app.include_router(router.chatbot_router)
+
+    with TestClient(app) as client:
+        bodies = []
+        for question in ("How fast am I going?", "Is my steering steady?"):
+            body = {"messages": [{"role": "user", "content": question}], "session": "fold"}
+            bodies.append(client.post("/chatbot/", json=body).text)
+        deadline = time.monotonic() + TIMEOUT_S
+        while router.history_folds and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    # 요약 호출은 답변 스트림에 포함되지 않고, 답변 슬롯과 별도로 슬롯을 얻음 (답변 2회 + 요약 1회)
+    assert all(SUMMARY_TAG not in body for body in bodies)
+    assert scheduler.get_stats()[router.LLM_MODEL]["admitted"] == 3
+
+    config = router.thread_config("fold")
+    state = asyncio.run(router.simple_chat_graph.aget_state(config))
+    assert state.values["summary"] == ANSWER
+    assert [message.content for message in state.values["messages"]] == ["Is my steering steady?", ANSWER]
+
+
+class RecordingChatModel(FakeListChatModel):
+    """
+    답변 스트림에 들어간 프롬프트를 기록하고, 요약 호출(ainvoke)은 실패하는 모델
+    """
+
+    prompts: list = []
+
+    async def _astream(self, messages, *args, **kwargs):
+        self.prompts.append(messages)
+        async for chunk in super()._astream(messages, *args, **kwargs):
+            yield chunk
+
+    def _call(self, *args, **kwargs) -> str:
+        raise RuntimeError("summary model is down")
+
+
+def test_prompt_stays_within_budget_when_fold_fails(monkeypatch) -> None:
+    budget = 64
+    window = HistoryWindow(max_turns=100, budget_tokens=budget, fold_turns=1)
+    llm = RecordingChatModel(responses=["The speed is steady and the steering is centered."])
+    monkeypatch.setattr(router, "llm_scheduler", LLMScheduler(default_limit=1))
+    monkeypatch.setattr(router, "llm_llama", llm)
+    monkeypatch.setattr(router, "response_cache", ResponseCache(0))
+    monkeypatch.setattr(router, "history_window", window)
+    monkeypatch.setattr(router, "simple_chat_graph", router.graph_builder.compile(checkpointer=MemorySaver()))
+    app = FastAPI()
+    app.include_router(router.chatbot_router)
+
+    questions = [f"Question number {i}: how is the vehicle doing right now?" for i in range(8)]
+    with TestClient(app) as client:
+        for question in questions:
+            body = {"messages": [{"role": "user", "content": question}], "session": "fold-fails"}
+            client.post("/chatbot/", json=body)
+            deadline = time.monotonic() + TIMEOUT_S
+            while router.history_folds and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+    # 요약은 매번 실패해 저장된 기록은 계속 늘어남
+    assert window.stats["summary_failures"] > 0
+    state = asyncio.run(router.simple_chat_graph.aget_state(router.thread_config("fold-fails")))
+    assert len(state.values["messages"]) == 2 * len(questions)
+
+    # 그래도 프롬프트의 대화 기록(차량 상태를 붙이기 전 질문 포함)은 창 안에 머묾
+    assert len(llm.prompts) == len(questions)
+    for question, prompt in zip(questions, llm.prompts):
+        history = prompt[:-1] + [HumanMessage(content=question)]
+        assert sum(message_tokens(message) for message in history) <= budget
+    assert len(llm.prompts[-1]) < len(state.values["messages"])
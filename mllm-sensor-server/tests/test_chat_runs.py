@@ -0,0 +1,148 @@
+import asyncio
+from typing import AsyncIterator, List, Optional
+
+import orjson
+import pytest
+from fastapi import HTTPException
+
+from mllm_server.chat_runs import ChatRunManager
+from mllm_server.routers.chatbot import router
+
+TIMEOUT_S = 2.0
+
+
+async def lines(count: int, gate: Optional[asyncio.Event] = None) -> AsyncIterator[bytes]:
+    for i in range(count):
+        yield orjson.dumps({"i": i}) + b"\n"
+    if gate is not None:
+        await gate.wait()
+
+
+async def collect(stream: AsyncIterator[bytes]) -> List[bytes]:
+    return [frame async for frame in stream]
+
+
+def frame_ids(frames: List[bytes]) -> List[int]:
+    return [int(frame.split(b"\n", 1)[0][4:]) for frame in frames if frame.startswith(b"id: ")]
+
+
+def test_resume_from_last_event_id() -> None:
+    async def run() -> None:
+        manager = ChatRunManager(grace_s=10.0)
+        chat_run = manager.start(lines(3))
+        await asyncio.wait_for(chat_run.task, TIMEOUT_S)
+
+        # run(1) + 데이터 3개(2~4) + end(5)
+        full = await collect(manager.subscribe(chat_run))
+        assert frame_ids(full) == [1, 2, 3, 4, 5]
+        resumed = await collect(manager.subscribe(chat_run, 3))
+        assert resumed == full[3:]
+        assert b'data: {"i":2}' in resumed[0]
+        assert (manager.stats["resumed"], manager.stats["replayed_events"]) == (1, 2)
+        await manager.close()
+
+    asyncio.run(run())
+
+
+def test_gap_for_frames_dropped_from_the_buffer() -> None:
+    async def run() -> None:
+        manager = ChatRunManager(grace_s=10.0, buffer_size=3)
+        chat_run = manager.start(lines(5))
+        await asyncio.wait_for(chat_run.task, TIMEOUT_S)
+
+        # 7개 중 마지막 3개(5~7)만 남음 -> 2~4는 gap으로 알림
+        frames = await collect(manager.subscribe(chat_run, 1))
+        assert frames[0] == b'event: gap\ndata: {"from":2,"to":4}\n\n'
+        assert frame_ids(frames) == [5, 6, 7]
+        assert manager.stats["gaps"] == 1
+        await manager.close()
+
+    asyncio.run(run())
+
+
+def test_live_subscriber_receives_new_frames() -> None:
+    async def run() -> None:
+        manager = ChatRunManager(grace_s=10.0)
+        gate = asyncio.Event()
+        chat_run = manager.start(lines(2, gate))
+        subscription = manager.subscribe(chat_run)
+        received = [await subscription.__anext__() for _ in range(3)]
+        assert frame_ids(received) == [1, 2, 3]
+
+        gate.set()
+        rest = await asyncio.wait_for(collect(subscription), TIMEOUT_S)
+        assert rest[-1].startswith(b"id: 4\nevent: end\n")
+        await manager.close()
+
+    asyncio.run(run())
+
+
+def test_subscriber_accounting_and_expiry() -> None:
+    async def run() -> None:
+        manager = ChatRunManager(grace_s=0.05)
+        gate = asyncio.Event()
+        done: List[bool] = []
+        chat_run = manager.start(lines(1, gate), lambda: done.append(True))
+
+        first = manager.subscribe(chat_run)
+        second = manager.subscribe(chat_run)
+        await first.__anext__()
+        await second.__anext__()
+        assert chat_run.subscribers == 2
+        assert manager.get_stats()["subscribers"] == 2
+        assert chat_run._expiry is None
+
+        await first.aclose()
+        assert chat_run.subscribers == 1
+        await asyncio.sleep(0.1)
+        # 구독자가 남아 있으면 유예 시간이 지나도 생성을 계속함
+        assert not chat_run.task.done()
+
+        await second.aclose()
+        assert (chat_run.subscribers, manager.get_stats()["subscribers"]) == (0, 0)
+        # 유예 시간 안에 다시 구독하면 만료가 취소됨
+        third = manager.subscribe(chat_run, 1)
+        await third.__anext__()
+        await asyncio.sleep(0.1)
+        assert not chat_run.task.done()
+        await third.aclose()
+
+        await asyncio.sleep(0.1)
+        assert chat_run.task.cancelled()
+        assert manager.get(chat_run.run_id) is None
+        assert done == [True]
+        assert manager.stats["cancelled"] == 1
+
+    asyncio.run(run())
+
+
+def test_unsubscribed_run_expires() -> None:
+    async def run() -> None:
+        manager = ChatRunManager(grace_s=0.05)
+        done: List[bool] = []
+        # 첫 바이트 전에 클라이언트가 끊어 본문(subscribe)이 시작되지 않은 실행
+        chat_run = manager.start(lines(0, asyncio.Event()), lambda: done.append(True))
+        await asyncio.sleep(0.2)
+        assert chat_run.task.cancelled()
+        assert done == [True]
+        assert manager.get(chat_run.run_id) is None
+
+    asyncio.run(run())
+
+
+@pytest.mark.parametrize("last_event_id", ["-1", "99", "abc"])
+def test_resume_rejects_last_event_id_outside_the_run(monkeypatch, last_event_id: str) -> None:
+    async def run() -> None:
+        manager = ChatRunManager(grace_s=10.0)
+        monkeypatch.setattr(router, "chat_runs", manager)
+        chat_run = manager.start(lines(1))
+        await asyncio.wait_for(chat_run.task, TIMEOUT_S)
+        with pytest.raises(HTTPException) as excinfo:
+            await router.resume_chat_run(chat_run.run_id, last_event_id)
+        assert excinfo.value.status_code == 400
+        # 범위 안의 마지막 순번은 허용
+        response = await router.resume_chat_run(chat_run.run_id, str(chat_run.sequence))
+        assert response.status_code == 200
+        await manager.close()
+
+    asyncio.run(run())
@@ -0,0 +1,60 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langgraph.checkpoint.memory import MemorySaver
+
+from mllm_server.chat_history import HistoryWindow
+from mllm_server.response_cache import ResponseCache
+from mllm_server.routers.chatbot import router
+
+ANSWER = "You are driving at a steady speed."
+
+
+class CountingScheduler:
+    def __init__(self) -> None:
+        self.acquired = 0
+
+    async def acquire(self, model: str, priority=None) -> "CountingScheduler":
+        self.acquired += 1
+        return self
+
+    def release(self) -> None:
+        pass
+
+
+@pytest.fixture
+def chat(monkeypatch):
+    scheduler = CountingScheduler()
+    llm = FakeListChatModel(responses=[ANSWER])
+    monkeypatch.setattr(router, "llm_scheduler", scheduler)
+    monkeypatch.setattr(router, "llm_llama", llm)
+    monkeypatch.setattr(router, "response_cache", ResponseCache(16))
+    monkeypatch.setattr(router, "history_window", HistoryWindow(4, 0))
+    monkeypatch.setattr(router, "simple_chat_graph", router.graph_builder.compile(checkpointer=MemorySaver()))
+    app = FastAPI()
+    app.include_router(router.chatbot_router)
+    with TestClient(app) as client:
+        yield client, scheduler
+
+
+def ask(client: TestClient, session: str) -> str:
+    body = {"messages": [{"role": "user", "content": "How fast am I going?"}], "session": session}
+    response = client.post("/chatbot/", json=body)
+    assert response.status_code == 200
+    return response.text
+
+
+def test_cache_hit_does_not_take_an_llm_slot(chat) -> None:
+    client, scheduler = chat
+    first = ask(client, "a")
+    assert ANSWER.split()[0] in first
+    assert scheduler.acquired == 1
+    assert router.response_cache.stats["stores"] == 1
+
+    # 같은 질문/같은 기록의 다른 세션: 캐시 적중이므로 슬롯 없이 재생
+    second = ask(client, "b")
+    assert '"on_chat_model_stream"' in second
+    assert scheduler.acquired == 1
+    assert router.response_cache.stats["memory_hits"] == 1
+    assert router.response_cache.stats["misses"] == 1  # 노드가 다시 조회하지 않음
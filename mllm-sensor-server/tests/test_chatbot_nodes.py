@@ -0,0 +1,33 @@
+import asyncio
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+from mllm_server.routers.chatbot import router
+
+
+class EmptyStreamLLM:
+    async def astream(self, query):
+        return
+        yield
+
+
+def test_empty_llm_stream_returns_empty_message(monkeypatch) -> None:
+    monkeypatch.setattr(router, "llm_llama", EmptyStreamLLM())
+    state = {"messages": [HumanMessage(content="hello")], "contexts": {"Speed": "30 km/h"}}
+    result = asyncio.run(router.node_llama_chatbot(state))
+    message = result["messages"][0]
+    assert isinstance(message, AIMessage)
+    assert message.content == ""
+
+
+def test_empty_answer_is_not_cached(monkeypatch) -> None:
+    stored = []
+
+    class FakeCache:
+        async def put(self, key, answer) -> None:
+            stored.append((key, answer))
+
+    monkeypatch.setattr(router, "response_cache", FakeCache())
+    state = {"messages": [HumanMessage(content="hello"), AIMessage(content="")], "cache_key": "k"}
+    assert asyncio.run(router.node_response_cache_store(state)) == {"cache_key": None}
+    assert stored == []
@@ -0,0 +1,203 @@
+import asyncio
+import operator
+from typing import Annotated, List, Optional, Tuple
+
+import aiosqlite
+import pytest
+from fastapi import HTTPException
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import empty_checkpoint
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+from langgraph.graph import END, START, StateGraph
+from typing_extensions import TypedDict
+
+from mllm_server.checkpoint_store import PooledSqliteSaver, encode_cursor, list_thread_ids, open_checkpointer
+from mllm_server.routers.chatbot import router
+
+
+async def put(saver: AsyncSqliteSaver, thread_id: str, source: str = "input") -> RunnableConfig:
+    config = {"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}}
+    return await saver.aput(config, empty_checkpoint(), {"source": source, "step": 0}, {})
+
+
+async def count_rows(saver: AsyncSqliteSaver, table: str, thread_id: str) -> int:
+    async with saver.conn.execute(f"SELECT COUNT(*) FROM {table} WHERE thread_id = ?", (thread_id,)) as cur:
+        return (await cur.fetchone())[0]
+
+
+def test_list_thread_ids_waits_for_saver_lock(tmp_path) -> None:
+    async def run() -> None:
+        async with aiosqlite.connect(str(tmp_path / "default.sqlite")) as conn:
+            saver = AsyncSqliteSaver(conn)
+            await saver.setup()
+            for i in range(5):
+                await put(saver, f"thread-{i}")
+
+            # 쓰기 중(락을 잡은 동안)에는 같은 연결로 조회하지 않음
+            async with saver.lock:
+                listing = asyncio.create_task(list_thread_ids(saver, 2))
+                await asyncio.sleep(0.05)
+                assert not listing.done()
+            assert await listing == (["thread-0", "thread-1"], "thread-1")
+            assert await list_thread_ids(saver, 2, "thread-3") == (["thread-4"], None)
+
+    asyncio.run(run())
+
+
+def test_list_thread_ids_uses_reader_pool(tmp_path) -> None:
+    async def run() -> None:
+        async with open_checkpointer(str(tmp_path / "pooled.sqlite"), readers=2, keep=0) as saver:
+            for i in range(3):
+                await put(saver, f"thread-{i}")
+            # 쓰기 락을 잡고 있어도 읽기 연결로 조회
+            async with saver.lock:
+                result = await asyncio.wait_for(list_thread_ids(saver, 10), 1.0)
+            assert result == (["thread-0", "thread-1", "thread-2"], None)
+
+    asyncio.run(run())
+
+
+def test_compact_keeps_newest_checkpoints_and_their_writes(tmp_path) -> None:
+    async def run() -> None:
+        async with open_checkpointer(str(tmp_path / "compact.sqlite"), readers=1, keep=3) as saver:
+            configs = []
+            for step in range(6):
+                config = await put(saver, "thread-a")
+                await saver.aput_writes(config, [("messages", f"write-{step}")], task_id=f"task-{step}")
+                configs.append(config)
+            await put(saver, "thread-b")
+
+            assert await saver.compact() == 3
+            kept = [item.config async for item in saver.alist({"configurable": {"thread_id": "thread-a"}})]
+            newest = [config["configurable"]["checkpoint_id"] for config in reversed(configs[3:])]
+            assert [config["configurable"]["checkpoint_id"] for config in kept] == newest
+            # 남은 체크포인트의 pending writes는 그대로, 지운 체크포인트의 writes만 삭제
+            latest = await saver.aget_tuple(configs[-1])
+            assert [value for _, _, value in latest.pending_writes] == ["write-5"]
+            assert await count_rows(saver, "writes", "thread-a") == 3
+            assert saver.stats["pruned_writes"] == 3
+            # 다른 스레드와 정리 대상이 없는 다음 compact()는 건드리지 않음
+            assert await count_rows(saver, "checkpoints", "thread-b") == 1
+            assert await saver.compact() == 0
+
+    asyncio.run(run())
+
+
+class CounterState(TypedDict):
+    steps: Annotated[List[int], operator.add]
+
+
+def test_compacted_thread_still_resumes(tmp_path) -> None:
+    def step(state: CounterState):
+        return {"steps": [len(state["steps"]) + 1]}
+
+    builder = StateGraph(CounterState)
+    builder.add_node("step", step)
+    builder.add_edge(START, "step")
+    builder.add_edge("step", END)
+
+    async def run() -> None:
+        async with open_checkpointer(str(tmp_path / "resume.sqlite"), readers=2, keep=2) as saver:
+            graph = builder.compile(checkpointer=saver)
+            config = {"configurable": {"thread_id": "driver"}}
+            for _ in range(4):
+                await graph.ainvoke({"steps": []}, config)
+            assert await saver.compact() > 0
+            assert await count_rows(saver, "checkpoints", "driver") == 2
+
+            # 정리 뒤에도 마지막 상태에서 이어서 실행
+            result = await graph.ainvoke({"steps": []}, config)
+            assert result["steps"] == [1, 2, 3, 4, 5]
+            assert (await graph.aget_state(config)).values["steps"] == [1, 2, 3, 4, 5]
+
+    asyncio.run(run())
+
+
+def test_reader_pool_sees_committed_writes(tmp_path) -> None:
+    async def run() -> None:
+        async with open_checkpointer(str(tmp_path / "readers.sqlite"), readers=2, keep=0) as saver:
+            thread = {"configurable": {"thread_id": "thread-a"}}
+            # 같은 읽기 연결이 매번 최신 커밋을 읽음 (오래된 스냅샷에 머물지 않음)
+            for _ in range(3):
+                config = await put(saver, "thread-a")
+                latest = await saver.aget_tuple(thread)
+                assert latest.config["configurable"]["checkpoint_id"] == config["configurable"]["checkpoint_id"]
+            assert len([item async for item in saver.alist(thread)]) == 3
+            # 읽기는 쓰기 락을 기다리지 않음
+            async with saver.lock:
+                assert await asyncio.wait_for(saver.aget_tuple(thread), 1.0) is not None
+
+    asyncio.run(run())
+
+
+def test_flush_sessions_indexes_turns(tmp_path) -> None:
+    async def run() -> None:
+        path = str(tmp_path / "sessions.sqlite")
+        async with open_checkpointer(path, readers=1, keep=0) as saver:
+            for source in ("input", "loop", "input", "loop"):
+                await put(saver, "thread-a", source)
+            await put(saver, "thread-b")
+            assert saver.get_stats()["unindexed_sessions"] == 2
+            await saver.flush_sessions()
+            assert saver.get_stats()["unindexed_sessions"] == 0
+            await put(saver, "thread-a")
+        # 닫을 때 남은 갱신도 반영되어 다시 열면 그대로 조회
+        async with open_checkpointer(path, readers=1, keep=0) as saver:
+            sessions, _ = await saver.list_sessions()
+            assert [(item["thread_id"], item["turns"]) for item in sessions] == [("thread-a", 3), ("thread-b", 1)]
+
+    asyncio.run(run())
+
+
+async def index_sessions(saver: PooledSqliteSaver, rows: List[Tuple[str, float]]) -> None:
+    await saver.conn.executemany(
+        "INSERT INTO session_index (thread_id, created, last_active, turns) VALUES (?, ?, ?, 1)",
+        [(thread_id, last_active, last_active) for thread_id, last_active in rows],
+    )
+    await saver.conn.commit()
+
+
+async def all_pages(saver: PooledSqliteSaver, limit: int, active_since: Optional[float] = None) -> List[List[str]]:
+    pages, cursor = [], None
+    while True:
+        items, cursor = await saver.list_sessions(limit, cursor, active_since)
+        pages.append([item["thread_id"] for item in items])
+        if cursor is None:
+            return pages
+
+
+def test_list_sessions_pages_through_ties(tmp_path) -> None:
+    async def run() -> None:
+        async with open_checkpointer(str(tmp_path / "pages.sqlite"), readers=1, keep=0) as saver:
+            # 같은 시각에 활동한 세션이 페이지 경계에 걸쳐 있어도 빠지거나 겹치지 않음
+            await index_sessions(saver, [("a", 100.0), ("b", 200.5), ("c", 200.5), ("d", 200.5), ("e", 300.0)])
+            assert await all_pages(saver, 2) == [["e", "d"], ["c", "b"], ["a"]]
+            # 마지막 페이지가 꽉 차도 다음 커서는 없음
+            assert await all_pages(saver, 5) == [["e", "d", "c", "b", "a"]]
+            assert await all_pages(saver, 2, active_since=200.5) == [["e", "d"], ["c", "b"]]
+            assert await all_pages(saver, 2, active_since=1000.0) == [[]]
+
+    asyncio.run(run())
+
+
+def test_sessions_endpoint(tmp_path, monkeypatch) -> None:
+    async def run() -> None:
+        monkeypatch.setattr(router, "memory", None)
+        with pytest.raises(HTTPException) as excinfo:
+            await router.list_sessions(limit=10, cursor=None, active_since=None)
+        assert excinfo.value.status_code == 503
+
+        async with open_checkpointer(str(tmp_path / "endpoint.sqlite"), readers=1, keep=0) as saver:
+            monkeypatch.setattr(router, "memory", saver)
+            await index_sessions(saver, [("a", 100.0), ("b", 200.0)])
+            page = await router.list_sessions(limit=1, cursor=None, active_since=None)
+            assert (page["sessions"], page["items"][0]["turns"]) == (["b"], 1)
+            page = await router.list_sessions(limit=1, cursor=page["next_cursor"], active_since=None)
+            assert (page["sessions"], page["next_cursor"]) == (["a"], None)
+
+            for cursor in ("not-a-cursor", encode_cursor(100.0, "a")[:-4], "WzFd"):
+                with pytest.raises(HTTPException) as excinfo:
+                    await router.list_sessions(limit=1, cursor=cursor, active_since=None)
+                assert excinfo.value.status_code == 400
+
+    asyncio.run(run())
@@ -0,0 +1,104 @@
+import asyncio
+import json
+from typing import Any, Dict, List
+
+import orjson
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langgraph.checkpoint.memory import MemorySaver
+from pydantic import BaseModel, PrivateAttr, field_serializer
+from pydantic.fields import Field
+
+from mllm_server.response_cache import ResponseCache
+from mllm_server.routers.chatbot import router
+from mllm_server.types import EventFilter, UserMessage
+from mllm_server.utils import convert_serializable, encode_event
+
+QUESTION = "Is my driving safe right now?"
+ANSWER = "You are keeping a steady speed."
+STREAM_ONLY = EventFilter(events=["on_chat_model_stream"])
+
+
+def encode_json(event: Dict[str, Any]) -> bytes:
+    # orjson으로 바꾸기 전의 직렬화
+    event = dict(event)
+    event["data"] = convert_serializable(event["data"])
+    return (json.dumps(event) + "\n").encode()
+
+
+def use_fake_graph(monkeypatch) -> None:
+    monkeypatch.setattr(router, "llm_llama", FakeListChatModel(responses=[ANSWER]))
+    monkeypatch.setattr(router, "response_cache", ResponseCache(0))
+    monkeypatch.setattr(router, "simple_chat_graph", router.graph_builder.compile(checkpointer=MemorySaver()))
+
+
+def test_event_filter_matches() -> None:
+    event = {"event": "on_chat_model_stream", "name": "FakeListChatModel"}
+    assert EventFilter().matches(event)
+    assert STREAM_ONLY.matches(event)
+    assert not EventFilter(events=["on_chain_end"]).matches(event)
+    assert EventFilter(names=["FakeListChatModel"]).matches(event)
+    assert not EventFilter(events=["on_chat_model_stream"], names=["chatbot"]).matches(event)
+
+
+def test_stream_events_drops_filtered_event_types(monkeypatch) -> None:
+    async def collect(event_filter) -> List[Dict[str, Any]]:
+        messages = [UserMessage(role="user", content=QUESTION)]
+        return [orjson.loads(line) async for line in router.stream_events(messages, "filter", event_filter)]
+
+    use_fake_graph(monkeypatch)
+    events = asyncio.run(collect(STREAM_ONLY))
+    assert {event["event"] for event in events} == {"on_chat_model_stream"}
+    assert "".join(event["data"]["chunk"]["content"] for event in events) == ANSWER
+
+    chains = asyncio.run(collect(EventFilter(events=["on_chain_end"], names=["chatbot"])))
+    assert [(event["event"], event["name"]) for event in chains] == [("on_chain_end", "chatbot")]
+
+
+def test_encoded_events_match_json_dumps(monkeypatch) -> None:
+    async def collect() -> List[Dict[str, Any]]:
+        config = {"configurable": {"thread_id": "compare"}}
+        events = []
+        for _ in range(2):  # 두 번째 턴의 상태에는 이전 메시지 목록이 들어 있음
+            events = [
+                event
+                async for event in router.simple_chat_graph.astream_events(
+                    {"messages": [("user", QUESTION)]}, config, version="v2"
+                )
+            ]
+        return events
+
+    use_fake_graph(monkeypatch)
+    events = asyncio.run(collect())
+    kinds = {event["event"] for event in events}
+    assert {"on_chat_model_stream", "on_chat_model_end", "on_chain_end"} <= kinds
+    for event in events:
+        assert orjson.loads(encode_event(event)) == json.loads(encode_json(event)), event["event"]
+
+
+class Reading(BaseModel):
+    value: float
+    raw: bytes = Field(default=b"", exclude=True)
+    _calibration: float = PrivateAttr(default=1.5)
+
+    @field_serializer("value")
+    def round_value(self, value: float) -> float:
+        return round(value, 1)
+
+
+class Opaque:
+    __slots__ = ()
+
+
+class Holder(BaseModel):
+    model_config = {"arbitrary_types_allowed": True}
+    reading: Reading
+    handle: Opaque
+
+
+def test_models_are_encoded_with_model_dump() -> None:
+    event = {"event": "custom", "data": {"reading": Reading(value=1.26, raw=b"\x00\x01")}}
+    assert orjson.loads(encode_event(event))["data"]["reading"] == {"value": 1.3}
+
+    # JSON으로 바꿀 수 없는 필드가 있어도 나머지 필드는 직렬화기를 그대로 따름
+    holder = Holder(reading=Reading(value=2.04), handle=Opaque())
+    assert orjson.loads(encode_event({"data": holder}))["data"] == {"reading": {"value": 2.0}, "handle": "(Object)"}
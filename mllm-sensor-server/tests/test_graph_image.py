@@ -0,0 +1,63 @@
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from mllm_server.graph_image import GraphImageCache, graph_structure_hash
+
+
+class FakeGraph:
+    def __init__(self) -> None:
+        self.fail = True
+        self.renders = 0
+
+    def get_graph(self) -> SimpleNamespace:
+        return SimpleNamespace(nodes={"a": None, "b": None}, edges=[], draw_png=self._draw)
+
+    def _draw(self, output_file_path: str) -> None:
+        self.renders += 1
+        with open(output_file_path, "wb") as f:
+            f.write(b"partial")
+            if self.fail:
+                raise RuntimeError("graphviz is not installed")
+            f.write(b" png")
+
+
+@pytest.fixture
+def graph_client(tmp_path):
+    graph = FakeGraph()
+    cache = GraphImageCache(str(tmp_path))
+    cache.set_graph(graph)
+    app = FastAPI()
+
+    @app.get("/state-graph")
+    async def state_graph(request: Request):
+        return await cache.response(request)
+
+    return graph, TestClient(app)
+
+
+def test_etag_only_after_successful_render(graph_client) -> None:
+    graph, client = graph_client
+    failed = client.get("/state-graph")
+    assert failed.status_code == 503
+    assert "etag" not in failed.headers
+
+    # 실패한 렌더링의 파일이 남지 않아 다음 요청에서 다시 그림
+    graph.fail = False
+    response = client.get("/state-graph")
+    assert response.status_code == 200
+    assert response.content == b"partial png"
+    assert graph.renders == 2
+
+    etag = response.headers["etag"]
+    assert client.get("/state-graph", headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_matching_etag_before_render_is_not_trusted(graph_client) -> None:
+    graph, client = graph_client
+    # 이전에 받은 ETag와 구조가 같아도 지금 그릴 수 없으면 304가 아니라 503
+    etag = f'"{graph_structure_hash(graph)}"'
+    response = client.get("/state-graph", headers={"If-None-Match": etag})
+    assert response.status_code == 503
@@ -0,0 +1,23 @@
+import asyncio
+import importlib
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+
+def test_import_has_no_side_effects(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    router = importlib.reload(importlib.import_module("mllm_server.routers.legacy.chatbot.router"))
+    assert not (tmp_path / "assets").exists()
+
+    app = FastAPI()
+    app.include_router(router.chatbot_router)
+    # 시작 전에는 그래프 이미지를 제공하지 않음
+    assert TestClient(app).get("/service/chatbot/state-graph").status_code == 503
+
+    async def run() -> None:
+        async with router.chatbot_lifespan():
+            assert (tmp_path / router.CHATBOT_ASSETS_DIR).is_dir()
+            assert router.graph_image._etag is not None
+
+    asyncio.run(run())
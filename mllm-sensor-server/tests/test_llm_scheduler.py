@@ -0,0 +1,186 @@
+import asyncio
+from typing import List
+
+import pytest
+
+from mllm_server.llm_scheduler import AdmissionRejected, LLMScheduler
+
+MODEL = "llama3.1"
+
+
+async def settle() -> None:
+    # 대기열에 들어가거나 깨어난 작업이 다음 단계까지 진행하도록 양보
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_concurrency_limit_per_model() -> None:
+    async def run() -> None:
+        scheduler = LLMScheduler(limits={MODEL: 2}, default_limit=1)
+        first = await scheduler.acquire(MODEL)
+        second = await scheduler.acquire(MODEL)
+        # 다른 모델은 각자의 한도를 사용
+        other = await scheduler.acquire("qwen2.5")
+
+        third = asyncio.create_task(scheduler.acquire(MODEL))
+        await settle()
+        assert not third.done()
+        stats = scheduler.get_stats()[MODEL]
+        assert (stats["limit"], stats["running"], stats["queue_depth"]) == (2, 2, 1)
+
+        first.release()
+        first.release()  # 두 번째 호출은 반영되지 않음
+        slot = await asyncio.wait_for(third, 1.0)
+        assert scheduler.get_stats()[MODEL]["running"] == 2
+        for held in (second, slot, other):
+            held.release()
+        assert scheduler.get_stats()[MODEL]["running"] == 0
+        assert scheduler.get_stats()[MODEL]["completed"] == 3
+
+    asyncio.run(run())
+
+
+def test_interactive_is_served_before_batch() -> None:
+    async def run() -> List[str]:
+        scheduler = LLMScheduler(default_limit=1)
+        order: List[str] = []
+
+        async def request(name: str, priority: str) -> None:
+            async with scheduler.slot(MODEL, priority):
+                order.append(name)
+
+        held = await scheduler.acquire(MODEL)
+        tasks = [asyncio.create_task(request("batch", "batch"))]
+        await settle()
+        tasks.append(asyncio.create_task(request("interactive-1", "interactive")))
+        await settle()
+        tasks.append(asyncio.create_task(request("interactive-2", "interactive")))
+        await settle()
+        held.release()
+        await asyncio.wait_for(asyncio.gather(*tasks), 1.0)
+        return order
+
+    # 먼저 도착한 batch보다 interactive가 먼저, 같은 우선순위는 도착 순서대로
+    assert asyncio.run(run()) == ["interactive-1", "interactive-2", "batch"]
+
+
+def test_deadline_expires_while_queued() -> None:
+    async def run() -> None:
+        scheduler = LLMScheduler(default_limit=1)
+        held = await scheduler.acquire(MODEL)
+        with pytest.raises(AdmissionRejected) as excinfo:
+            await scheduler.acquire(MODEL, timeout_s=0.05)
+        assert excinfo.value.status_code == 429
+        assert excinfo.value.reason == "deadline"
+        assert int(excinfo.value.headers["Retry-After"]) >= 1
+
+        stats = scheduler.get_stats()[MODEL]
+        assert (stats["rejected_deadline"], stats["queue_depth"], stats["running"]) == (1, 0, 1)
+        assert not scheduler._queues[MODEL].waiters
+        held.release()
+        # 만료된 요청이 슬롯을 가져가지 않음
+        slot = await asyncio.wait_for(scheduler.acquire(MODEL), 1.0)
+        assert slot.wait_s == 0.0
+        slot.release()
+
+    asyncio.run(run())
+
+
+def test_queue_full_is_rejected_with_retry_after() -> None:
+    async def run() -> None:
+        scheduler = LLMScheduler(default_limit=1, queue_size=1)
+        held = await scheduler.acquire(MODEL)
+        queued = asyncio.create_task(scheduler.acquire(MODEL))
+        await settle()
+        with pytest.raises(AdmissionRejected) as excinfo:
+            await scheduler.acquire(MODEL)
+        assert excinfo.value.status_code == 429
+        assert excinfo.value.reason == "queue_full"
+        # 생성 시간을 아직 모르면 1초 x (대기 중 1 + 새 요청 1)
+        assert excinfo.value.headers["Retry-After"] == "2"
+        assert scheduler.get_stats()[MODEL]["rejected_queue_full"] == 1
+
+        held.release()
+        (await asyncio.wait_for(queued, 1.0)).release()
+
+    asyncio.run(run())
+
+
+def test_queue_depth_and_wait_time_metrics() -> None:
+    async def run() -> None:
+        scheduler = LLMScheduler(default_limit=1)
+        held = await scheduler.acquire(MODEL)
+        waiters = [asyncio.create_task(scheduler.acquire(MODEL)) for _ in range(3)]
+        await settle()
+        assert scheduler.get_stats()[MODEL]["queue_depth"] == 3
+        await asyncio.sleep(0.05)
+        held.release()
+        for waiter in waiters:
+            (await asyncio.wait_for(waiter, 1.0)).release()
+
+        stats = scheduler.get_stats()[MODEL]
+        assert (stats["admitted"], stats["completed"]) == (4, 4)
+        assert (stats["max_queue_depth"], stats["queue_depth"]) == (3, 0)
+        # 바로 승인된 첫 요청(0 ms)과 50 ms 이상 기다린 요청들
+        assert stats["wait_ms_p50"] >= 50.0
+        assert stats["wait_ms_p99"] >= stats["wait_ms_p50"]
+        assert stats["service_time_s"] > 0.0
+
+    asyncio.run(run())
+
+
+def test_cancel_while_waiting_does_not_leak() -> None:
+    async def run() -> None:
+        scheduler = LLMScheduler(default_limit=1)
+        held = await scheduler.acquire(MODEL)
+        waiter = asyncio.create_task(scheduler.acquire(MODEL))
+        await settle()
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        queue = scheduler._queues[MODEL]
+        assert (queue.waiting, queue.waiters, queue.running) == (0, [], 1)
+        held.release()
+        assert scheduler.get_stats()[MODEL]["running"] == 0
+        slot = await scheduler.acquire(MODEL)
+        assert slot.wait_s == 0.0
+        slot.release()
+
+    asyncio.run(run())
+
+
+def test_cancel_after_wake_passes_the_slot_on() -> None:
+    async def run() -> None:
+        scheduler = LLMScheduler(default_limit=1)
+        held = await scheduler.acquire(MODEL)
+        first = asyncio.create_task(scheduler.acquire(MODEL))
+        second = asyncio.create_task(scheduler.acquire(MODEL))
+        await settle()
+        # 슬롯을 넘겨받았지만 아직 실행되지 않은 대기자가 취소됨
+        held.release()
+        first.cancel()
+        try:
+            # wait_for는 이미 끝난 대기의 결과를 취소보다 먼저 돌려줄 수 있음 (그 경우 슬롯을 받은 쪽이 반환)
+            (await first).release()
+        except asyncio.CancelledError:
+            pass
+        slot = await asyncio.wait_for(second, 1.0)
+        assert scheduler.get_stats()[MODEL]["running"] == 1
+        slot.release()
+        assert scheduler.get_stats()[MODEL]["running"] == 0
+
+    asyncio.run(run())
+
+
+def test_slot_releases_on_error() -> None:
+    async def run() -> None:
+        scheduler = LLMScheduler(default_limit=1)
+        with pytest.raises(RuntimeError):
+            async with scheduler.slot(MODEL, "batch"):
+                assert scheduler.get_stats()[MODEL]["running"] == 1
+                raise RuntimeError("generation failed")
+        stats = scheduler.get_stats()[MODEL]
+        assert (stats["running"], stats["completed"]) == (0, 1)
+
+    asyncio.run(run())
@@ -0,0 +1,46 @@
+from mdaq_watcher.frames import MDAQ_FRAME, MdaqFrameRing, decode_capture
+from mdaq_watcher.udp_server import MdaqWatcher
+from mllm_server.telemetry_log import SOURCE_MDAQ, SOURCE_SCANER, TelemetryLog, TelemetryRecorder
+
+
+def make_frame(value: float) -> bytes:
+    return MDAQ_FRAME.pack(9, *([value] * 9), 0, *([int(value)] * 51))
+
+
+def test_watcher_keeps_values_after_slot_is_reused() -> None:
+    watcher = MdaqWatcher("127.0.0.1", 0)
+    watcher.frames = MdaqFrameRing(2)
+    watcher.feed(make_frame(1.0))
+    kept_floats, kept_ints = watcher.float_values, watcher.int_values
+
+    # 슬롯 두 개를 모두 덮어씀
+    watcher.feed(make_frame(2.0))
+    watcher.feed(make_frame(3.0))
+
+    assert kept_floats.tolist() == [1.0] * 9
+    assert kept_ints.tolist() == [1] * 51
+    assert watcher.float_values.tolist() == [3.0] * 9
+
+
+def test_decode_capture_matches_struct_unpacking(tmp_path) -> None:
+    path = str(tmp_path / "mdaq.tlog")
+    frames = []
+    with TelemetryRecorder(path, chunk_size=4096) as recorder:
+        for i in range(50):
+            data = MDAQ_FRAME.pack(9, *(i + 0.25 * k for k in range(9)), -1, *(i * 100 + k for k in range(51)))
+            recorder.append(data, SOURCE_MDAQ, receive_ns=1000 + i)
+            frames.append((1000 + i, data))
+            # 다른 출처의 레코드와 길이가 맞지 않는 MDAQ 레코드는 건너뜀
+            recorder.append(b"scaner" * (i + 1), SOURCE_SCANER, receive_ns=1000 + i)
+            if i % 10 == 0:
+                recorder.append(data[:-4], SOURCE_MDAQ, receive_ns=1000 + i)
+
+    with TelemetryLog(path) as log:
+        capture = decode_capture(log)
+        assert capture.timestamps.tolist() == [timestamp for timestamp, _ in frames]
+        for frame, (_, data) in zip(capture.frames, frames):
+            start, *rest = MDAQ_FRAME.unpack(data)
+            floats, separator, ints = rest[:9], rest[9], rest[10:]
+            assert (int(frame["start"]), int(frame["separator"])) == (start, separator)
+            assert frame["floats"].tolist() == list(floats)
+            assert frame["ints"].tolist() == list(ints)
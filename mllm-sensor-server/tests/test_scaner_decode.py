@@ -0,0 +1,57 @@
+import math
+
+import numpy as np
+import pytest
+
+from mllm_server.scaner_udp import ScanerDatagramDecoder, decode_scaner_datagram
+
+
+def make_datagram(ids, values) -> bytes:
+    pairs = np.empty((len(ids), 2), dtype="<f8")
+    pairs[:, 0] = ids
+    pairs[:, 1] = values
+    return pairs.tobytes()
+
+
+@pytest.fixture
+def packet() -> bytes:
+    rng = np.random.default_rng(0)
+    ids = rng.permutation(np.arange(300, dtype=np.float64) + 100)
+    ids[rng.random(300) < 0.1] = np.inf  # SCANeR의 빈 슬롯
+    ids[5] = -np.inf
+    return make_datagram(ids, rng.normal(size=300))
+
+
+def test_decode_all_matches_struct_reference(packet: bytes) -> None:
+    decoder = ScanerDatagramDecoder([120, 167])
+    assert decoder.decode_all(packet) == decode_scaner_datagram(packet)
+
+
+def test_decode_matches_struct_reference(packet: bytes) -> None:
+    channel_ids = [120, 167, 250, 399, 5000]  # 5000: 패킷에 없는 채널
+    reference = decode_scaner_datagram(packet)
+    values, present = ScanerDatagramDecoder(channel_ids).decode(packet)
+
+    for slot, channel_id in enumerate(channel_ids):
+        assert present[slot] == (channel_id in reference)
+        if channel_id in reference:
+            assert values[slot] == reference[channel_id]
+        else:
+            assert math.isnan(values[slot])
+
+
+def test_decode_reuses_layout_with_new_values() -> None:
+    decoder = ScanerDatagramDecoder([167, 120])
+    ids = [120.0, 7.0, 167.0]
+    decoder.decode(make_datagram(ids, [1.0, 2.0, 3.0]))
+    values, present = decoder.decode(make_datagram(ids, [4.0, 5.0, 6.0]))
+    assert values.tolist() == [6.0, 4.0]
+    assert present.all()
+
+
+def test_decode_ignores_unpaired_trailing_value() -> None:
+    data = make_datagram([167.0, 120.0], [1.5, 2.5]) + np.float64(167.0).tobytes()
+    values, present = ScanerDatagramDecoder([167, 120]).decode(data)
+    assert decode_scaner_datagram(data) == {167: 1.5, 120: 2.5}
+    assert values.tolist() == [1.5, 2.5]
+    assert present.all()
@@ -0,0 +1,102 @@
+import asyncio
+import math
+import time
+
+import numpy as np
+import pytest
+
+from mllm_server.channels import DEFAULT_CHANNELS, ChannelSpec
+from mllm_server.scaner_emulator import SEND_TIME_CHANNEL_ID, SEQUENCE_CHANNEL_ID, ScanerEmulator
+from mllm_server.scaner_udp import AsyncScanerFilterServer, ScanerFilterServer
+
+HOST = "127.0.0.1"
+PACKETS = 200
+CHANNELS = 300  # 4800바이트 데이터그램
+FAR_CHANNEL_ID = 1250  # 데이터그램의 2048바이트 이후에 있는 채널
+TIMEOUT_S = 5.0
+
+
+def make_server(server_class: type) -> ScanerFilterServer:
+    channels = DEFAULT_CHANNELS + [
+        ChannelSpec(SEQUENCE_CHANNEL_ID, "sequence"),
+        ChannelSpec(SEND_TIME_CHANNEL_ID, "send_time"),
+        ChannelSpec(FAR_CHANNEL_ID, "far"),
+    ]
+    return server_class(HOST, 0, timeout=1, channels=channels, history_capacity=PACKETS * 2)
+
+
+def send_packets(port: int) -> ScanerEmulator:
+    emulator = ScanerEmulator((HOST, port), channel_count=CHANNELS, rate_hz=2000)
+    try:
+        emulator.run(count=PACKETS)
+    finally:
+        emulator.close()
+    return emulator
+
+
+def received(server: ScanerFilterServer) -> int:
+    return server.channels["sequence"].history.count
+
+
+def check_received(server: ScanerFilterServer, emulator: ScanerEmulator) -> None:
+    assert server.get_ingest_stats()["packets_truncated"] == 0
+
+    sequence = server.channels["sequence"].history.snapshot()
+    assert sequence.values.tolist() == [float(i) for i in range(PACKETS)]
+
+    # 조향각/속도는 송신 시각의 함수 (ScanerEmulator.make_packet)
+    send_time = server.channels["send_time"].history.snapshot().values
+    steering = server.channels["steering"].history.snapshot().values
+    speed = server.channels["speed"].history.snapshot().values
+    np.testing.assert_allclose(steering, 30.0 * np.sin(2 * math.pi * 0.1 * send_time))
+    np.testing.assert_allclose(speed, 50.0 + 20.0 * np.sin(2 * math.pi * 0.02 * send_time))
+
+    far_row = int(np.flatnonzero(emulator._pairs[:, 0] == FAR_CHANNEL_ID)[0])
+    far = server.channels["far"].history.snapshot().values
+    assert far.tolist() == [emulator._pairs[far_row, 1]] * PACKETS
+
+
+def test_threaded_server_receives_emulator_packets() -> None:
+    server = make_server(ScanerFilterServer)
+    server.activate()
+    try:
+        emulator = send_packets(server.filter_udp_socket.getsockname()[1])
+        deadline = time.monotonic() + TIMEOUT_S
+        while received(server) < PACKETS and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        start = time.monotonic()
+        server.deactivate()
+        shutdown_s = time.monotonic() - start
+
+    check_received(server, emulator)
+    assert shutdown_s < server.timeout
+
+
+def test_async_server_receives_emulator_packets() -> None:
+    async def run() -> ScanerEmulator:
+        await server.start()
+        try:
+            port = server.filter_udp_socket.getsockname()[1]
+            emulator = await asyncio.to_thread(send_packets, port)
+            deadline = time.monotonic() + TIMEOUT_S
+            while received(server) < PACKETS and time.monotonic() < deadline:
+                await asyncio.sleep(0.01)
+            return emulator
+        finally:
+            await server.stop()
+
+    server = make_server(AsyncScanerFilterServer)
+    check_received(server, asyncio.run(run()))
+
+
+@pytest.mark.parametrize("server_class", [ScanerFilterServer, AsyncScanerFilterServer])
+def test_feed_without_socket(server_class: type) -> None:
+    server = make_server(server_class)
+    emulator = ScanerEmulator((HOST, 9), channel_count=CHANNELS)
+    try:
+        server.feed(emulator.make_packet(0, time.monotonic_ns()))
+    finally:
+        emulator.close()
+    assert server.channels["sequence"].history.latest() == 0.0
+    assert server.get_ingest_stats()["packets_received"] == 1
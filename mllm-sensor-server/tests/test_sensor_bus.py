@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from mllm_server.sensor_bus import SensorBus
+from mllm_server.timeseries import TimeSeriesRing
+
+MS = 1_000_000
+
+
+def make_bus() -> SensorBus:
+    bus = SensorBus(capacity=64)
+    # 빠른 채널(10 ms)과 느린 채널(50 ms), 서로 다른 출처
+    bus.register("speed", "scaner")
+    bus.register("mdaq.float0", "mdaq")
+    for i in range(10):
+        bus.publish("speed", float(i), (100 + 10 * i) * MS)
+    for i in range(2):
+        bus.publish("mdaq.float0", 100.0 + i, (120 + 50 * i) * MS)
+    return bus
+
+
+def test_fuse_takes_last_sample_at_or_before_each_time() -> None:
+    bus = make_bus()
+    times = np.array([95, 100, 125, 170, 400]) * MS
+    fused = bus.fuse(["speed", "mdaq.float0"], times)
+
+    # 격자 시각과 같은 시각의 샘플도 포함, 첫 샘플 이전은 NaN/0
+    np.testing.assert_array_equal(fused.column("speed"), [np.nan, 0.0, 2.0, 7.0, 9.0])
+    np.testing.assert_array_equal(fused.column("mdaq.float0"), [np.nan, np.nan, 100.0, 101.0, 101.0])
+    assert fused.sample_timestamps[:, 0].tolist() == [0, 100 * MS, 120 * MS, 170 * MS, 190 * MS]
+    assert fused.sample_timestamps[:, 1].tolist() == [0, 0, 120 * MS, 170 * MS, 170 * MS]
+    assert fused.timestamps.tolist() == times.tolist()
+    assert list(fused.as_dict()) == ["speed", "mdaq.float0"]
+
+
+def test_fuse_drops_samples_older_than_max_age() -> None:
+    bus = make_bus()
+    times = np.array([125, 165, 190, 230]) * MS
+    fused = bus.fuse(["speed", "mdaq.float0"], times, max_age_ns=30 * MS)
+
+    # 빠른 채널은 멈춘 뒤(190 ms)에만, 느린 채널은 샘플 사이가 30 ms를 넘는 구간에서 NaN
+    np.testing.assert_array_equal(fused.column("speed"), [2.0, 6.0, 9.0, np.nan])
+    np.testing.assert_array_equal(fused.column("mdaq.float0"), [100.0, np.nan, 101.0, np.nan])
+    assert fused.sample_timestamps[3].tolist() == [0, 0]
+    # 경계: 샘플 시각과의 차이가 max_age와 같으면 유지
+    edge = bus.fuse(["speed"], np.array([220 * MS]), max_age_ns=30 * MS)
+    assert edge.values.tolist() == [[9.0]]
+
+
+def test_fuse_after_ring_wraps() -> None:
+    bus = SensorBus()
+    bus.register("steering", "serial", ring=TimeSeriesRing(4))
+    for i in range(10):
+        bus.publish("steering", float(i), i * MS)
+    # 덮어써진 구간은 남아 있는 가장 오래된 샘플보다 이전이므로 NaN
+    fused = bus.fuse(["steering"], np.array([2, 6, 9]) * MS)
+    np.testing.assert_array_equal(fused.column("steering"), [np.nan, 6.0, 9.0])
+
+
+def test_fuse_empty_channel_and_unknown_channel() -> None:
+    bus = make_bus()
+    bus.register("brake", "scaner")
+    fused = bus.fuse(["brake"], np.array([100, 200]) * MS)
+    assert np.isnan(fused.values).all()
+    assert fused.sample_timestamps.tolist() == [[0], [0]]
+    with pytest.raises(KeyError):
+        bus.fuse(["missing"], np.array([100]) * MS)
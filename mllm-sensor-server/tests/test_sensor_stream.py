@@ -0,0 +1,70 @@
+import asyncio
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from mllm_server.routers.sensors import router
+from mllm_server.routers.sensors import sensors_router
+
+TIMEOUT_S = 2.0
+
+
+@pytest.fixture
+def client() -> TestClient:
+    # lifespan 없이 라우터만 사용 (수신기가 시작되지 않아 프레임이 오지 않는 상태)
+    app = FastAPI()
+    app.include_router(sensors_router)
+    with TestClient(app) as client:
+        yield client
+
+
+def wait_for_clients(expected: int) -> int:
+    deadline = time.monotonic() + TIMEOUT_S
+    while time.monotonic() < deadline:
+        clients = router.sensor_stream_hub.get_stats()["clients"]
+        if clients == expected:
+            break
+        time.sleep(0.01)
+    return clients
+
+
+@pytest.mark.parametrize("rate", ["nan", "inf", "0", "-1", "1000"])
+def test_sse_rejects_invalid_rate(client: TestClient, rate: str) -> None:
+    assert client.get(f"/sensors/stream?rate={rate}").status_code == 422
+
+
+def test_sse_rejects_unknown_channel(client: TestClient) -> None:
+    assert client.get("/sensors/stream?channels=nope").status_code == 400
+
+
+def test_hub_rejects_nan_rate() -> None:
+    with pytest.raises(ValueError):
+        router.sensor_stream_hub.check(["steering"], float("nan"))
+
+
+def test_sse_subscribes_when_body_starts() -> None:
+    async def run() -> None:
+        response = await router.stream_sensors_sse(channels="steering", rate=10.0)
+        # 본문을 읽지 않은 응답은 구독을 남기지 않음
+        assert router.sensor_stream_hub.get_stats()["clients"] == 0
+
+        body = response.body_iterator
+        reading = asyncio.create_task(body.__anext__())
+        await asyncio.sleep(0.05)
+        assert router.sensor_stream_hub.get_stats()["clients"] == 1
+        reading.cancel()
+        await asyncio.gather(reading, return_exceptions=True)
+        await body.aclose()
+        assert router.sensor_stream_hub.get_stats()["clients"] == 0
+
+    asyncio.run(run())
+
+
+def test_websocket_disconnect_releases_idle_subscription(client: TestClient) -> None:
+    with client.websocket_connect("/sensors/stream?channels=steering&rate=10") as websocket:
+        assert wait_for_clients(1) == 1
+        websocket.close()
+        # 프레임이 없어도 종료를 바로 감지해 구독을 해제
+        assert wait_for_clients(0) == 0
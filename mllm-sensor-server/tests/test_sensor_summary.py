@@ -0,0 +1,90 @@
+import asyncio
+import time
+
+import numpy as np
+
+from mllm_server.sensor_bus import SensorBus
+from mllm_server.sensor_summary import SensorContextCache, SensorSummarizer
+
+TIMEOUT_S = 2.0
+
+
+def make_bus() -> SensorBus:
+    bus = SensorBus(capacity=256)
+    bus.register("steering", "test", label="Steering", unit="deg")
+    bus.register("speed", "test", label="Speed", unit="km/h")
+    return bus
+
+
+def test_update_with_samples_older_than_window() -> None:
+    bus = make_bus()
+    summarizer = SensorSummarizer(bus, window_s=1.0)
+    # 재생 로그처럼 수신 시각이 창보다 오래된 샘플
+    now_ns = time.monotonic_ns()
+    old_ns = now_ns - 60 * 1_000_000_000
+    ring = bus["speed"].ring
+    ring.extend(np.array([10.0, 12.0, 14.0]), np.array([old_ns, old_ns + 10**8, old_ns + 2 * 10**8]))
+
+    summarizer.update(now_ns)
+    features = summarizer.features["speed"]
+    assert features.value == 14.0
+    assert (features.low, features.high) == (10.0, 14.0)
+    assert "Speed" in summarizer.encode()
+
+
+def test_run_updates_on_ingest_notification() -> None:
+    async def run() -> float:
+        async with summarizer.running(interval=10.0, min_interval=0.0):
+            await asyncio.sleep(0.05)  # 리스너 등록 대기
+            start = time.monotonic()
+            bus.publish("steering", 5.0)
+            while "steering" not in summarizer.features and time.monotonic() - start < TIMEOUT_S:
+                await asyncio.sleep(0.001)
+            return time.monotonic() - start
+
+    bus = make_bus()
+    summarizer = SensorSummarizer(bus)
+    # interval(10초) 폴링이 아니라 수신 알림으로 갱신되어야 함
+    assert asyncio.run(run()) < 1.0
+    assert summarizer.features["steering"].value == 5.0
+    assert not bus._listeners
+
+
+def test_run_survives_update_errors() -> None:
+    class FailingSummarizer(SensorSummarizer):
+        def update(self, now_ns=None) -> None:
+            if self.errors == 0:
+                raise RuntimeError("boom")
+            super().update(now_ns)
+
+    async def run() -> None:
+        async with summarizer.running(interval=0.01, min_interval=0.0):
+            bus.publish("speed", 30.0)
+            deadline = time.monotonic() + TIMEOUT_S
+            while "speed" not in summarizer.features and time.monotonic() < deadline:
+                await asyncio.sleep(0.01)
+
+    bus = make_bus()
+    summarizer = FailingSummarizer(bus)
+    asyncio.run(run())
+    assert summarizer.errors == 1
+    assert summarizer.features["speed"].value == 30.0
+
+
+def test_context_cache_keys_on_summary_version() -> None:
+    bus = make_bus()
+    summarizer = SensorSummarizer(bus)
+    cache = SensorContextCache(summarizer)
+    bus.publish("speed", 30.0)
+    summarizer.update()
+
+    first = cache.get()
+    time.sleep(1.1)  # 초가 바뀌어도 새 데이터가 없으면 그대로 재사용
+    summarizer.update()
+    assert cache.get() == first
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    bus.publish("speed", 31.0)
+    summarizer.update()
+    assert cache.get()["Speed"].startswith("31")
+    assert cache.misses == 2
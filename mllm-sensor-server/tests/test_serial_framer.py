@@ -0,0 +1,130 @@
+import os
+import struct
+import threading
+import time
+import tty
+
+import numpy as np
+import pytest
+
+from mdaq_watcher.serial_framer import PACKET_SIZE, START_BYTE, SerialFramer, SerialPacketReader
+
+TIMEOUT_S = 5.0
+
+
+def make_packets(count: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    packets = np.empty((count, PACKET_SIZE), dtype=np.uint8)
+    packets[:, 0] = START_BYTE
+    packets[:, 1] = rng.choice([0x42, 0x45, 0x53], size=count)
+    packets[:, 2] = rng.integers(0, 8, size=count)
+    packets[:, 3:5] = rng.integers(0, 256, size=(count, 2))
+    return packets
+
+
+def legacy_parse(stream: bytes):
+    # legacy/main.py와 같은 방식 (1바이트씩 추가, buffer[1:]로 재동기화, 패킷마다 struct로 디코딩)
+    buffer = bytearray()
+    results = []
+    for i in range(len(stream)):
+        buffer += stream[i : i + 1]
+        if buffer[0] != START_BYTE:
+            buffer = buffer[1:]
+            continue
+        if len(buffer) >= PACKET_SIZE:
+            packet = buffer[:PACKET_SIZE]
+            buffer = buffer[PACKET_SIZE:]
+            _, msg_id, sub_id, high, low = packet
+            results.append((msg_id, sub_id, struct.unpack(">h", bytes([high, low]))[0]))
+    return results
+
+
+def as_tuples(packets) -> list:
+    return list(zip(packets.msg_id.tolist(), packets.sub_id.tolist(), packets.data_int.tolist()))
+
+
+def feed_chunks(framer: SerialFramer, stream: bytes, sizes) -> list:
+    results, pos, i = [], 0, 0
+    while pos < len(stream):
+        size = sizes[i % len(sizes)]
+        results += as_tuples(framer.feed(stream[pos : pos + size]))
+        pos += size
+        i += 1
+    return results
+
+
+@pytest.mark.parametrize("sizes", [[1], [2, 3], [7], [4096]])
+def test_split_frames(sizes) -> None:
+    packets = make_packets(50)
+    stream = packets.tobytes()
+    framer = SerialFramer()
+    assert feed_chunks(framer, stream, sizes) == legacy_parse(stream)
+    assert framer.packets == 50
+    assert framer.pending == 0
+    assert framer.skipped_bytes == 0
+
+
+def test_resync_after_garbage() -> None:
+    packets = make_packets(3)
+    garbage = bytes([0x00, 0x7F, 0x11])
+    stream = garbage + packets[0].tobytes() + garbage + packets[1].tobytes() + packets[2].tobytes()
+    framer = SerialFramer()
+    result = framer.feed(stream)
+    assert as_tuples(result) == legacy_parse(stream)
+    assert len(result) == 3
+    assert framer.skipped_bytes == 2 * len(garbage)
+
+
+def test_corrupted_packet() -> None:
+    # 패킷에 체크섬이 없으므로 바이트가 빠진 패킷은 다음 패킷의 시작 바이트까지 포함한 채로 읽힘 (기존과 동일)
+    # 이후 시작 바이트가 어긋난 곳에서 다시 동기화해 뒤따르는 패킷은 그대로 읽어야 함
+    packets = make_packets(4)
+    damaged = packets[1].tobytes()[:-1]
+    stream = packets[0].tobytes() + damaged + packets[2].tobytes() + packets[3].tobytes()
+    framer = SerialFramer()
+    result = as_tuples(framer.feed(stream))
+    assert result == legacy_parse(stream)
+    assert framer.pending == 0
+    assert result[-1] == (int(packets[3, 1]), int(packets[3, 2]), int(packets[3, 3:5].view(">i2")[0]))
+
+
+def test_matches_legacy_parser_on_noisy_stream() -> None:
+    rng = np.random.default_rng(1)
+    chunks = []
+    for packet in make_packets(2000, seed=1):
+        if rng.random() < 0.05:
+            chunks.append(bytes(rng.choice([0x00, 0x7F, 0xFF, 0x22], size=int(rng.integers(1, 4))).astype(np.uint8)))
+        chunks.append(packet.tobytes())
+    stream = b"".join(chunks)
+    assert feed_chunks(SerialFramer(), stream, [1, 13, 64, 5, 300]) == legacy_parse(stream)
+
+
+def test_pty_loopback() -> None:
+    packets = make_packets(2000, seed=2)
+    stream = b"\x00\x7f" + packets.tobytes()
+    master, slave = os.openpty()
+    tty.setraw(slave)
+    reader = SerialPacketReader(os.ttyname(slave), timeout=0.2)
+
+    def write() -> None:
+        # 패킷 경계와 맞지 않는 크기로 나눠 써서 패킷이 read() 사이에 걸치게 함
+        for pos in range(0, len(stream), 333):
+            os.write(master, stream[pos : pos + 333])
+            time.sleep(0.001)
+
+    writer = threading.Thread(target=write)
+    writer.start()
+    received = []
+    try:
+        deadline = time.monotonic() + TIMEOUT_S
+        while len(received) < len(packets) and time.monotonic() < deadline:
+            received += as_tuples(reader.read())
+    finally:
+        writer.join()
+        reader.close()
+        os.close(master)
+        os.close(slave)
+
+    assert received == legacy_parse(stream)
+    assert reader.framer.skipped_bytes == 2
+    assert reader.reads > 1
@@ -0,0 +1,53 @@
+import os
+
+from mllm_server import shared_sensors
+from mllm_server.channels import ChannelSpec
+from mllm_server.sensor_bus import SensorBus
+from mllm_server.sensor_stream import SensorStreamGroup
+from mllm_server.shared_sensors import H_STARTED_NS, SharedScanerView, SharedSensorStore
+
+SPECS = [ChannelSpec(167, "steering"), ChannelSpec(120, "speed")]
+
+
+def write(store: SharedSensorStore, values) -> None:
+    for i, value in enumerate(values):
+        store.rings["speed"].append(value, i + 1)
+
+
+def test_reattach_closes_old_store_and_restarts_cursors(monkeypatch) -> None:
+    # 수신 프로세스와 워커가 같은 프로세스이므로 연결할 때 수신 쪽의 resource tracker 등록을 지우지 않게 함
+    monkeypatch.setattr(shared_sensors.resource_tracker, "unregister", lambda name, rtype: None)
+    shm_name = f"mllm_test_{os.getpid()}"
+    ingest = SharedSensorStore.create(shm_name, SPECS, 16)
+    write(ingest, [1.0, 2.0, 3.0])
+    bus = SensorBus()
+    view = SharedScanerView(shm_name, bus=bus)
+    assert view.attach()
+    old_store = view.store
+    subscription = bus.subscribe(["speed"])
+    group = SensorStreamGroup(view, ["speed"], 10.0)
+    assert group.encode() is not None
+
+    # 수신 프로세스 재시작: 새 세그먼트의 count는 0부터 다시 시작
+    ingest.close()
+    ingest.unlink()
+    ingest = SharedSensorStore.create(shm_name, SPECS, 16)
+    ingest.header[H_STARTED_NS] += 1  # 같은 시각에 만들어져도 재시작으로 인식되도록 started_ns를 다르게 함
+    write(ingest, [10.0, 20.0, 30.0])
+    try:
+        assert view.attach()
+        assert view.reattached == 1
+        assert old_store.header is None and not old_store.rings  # 이전 세그먼트를 닫음
+
+        ring = view.channels["speed"].history
+        assert ring.generation == 1
+        values, _ = subscription.poll()["speed"]
+        assert values.tolist() == [10.0, 20.0, 30.0]
+
+        # 이전 세그먼트와 count가 같아도 새 프레임을 보냄
+        assert b"30.0" in group.encode()
+        assert group.encode() is None
+    finally:
+        view.store.close()
+        ingest.close()
+        ingest.unlink()
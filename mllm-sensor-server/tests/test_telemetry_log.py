@@ -0,0 +1,150 @@
+import asyncio
+import os
+import time
+from typing import List
+
+import numpy as np
+import pytest
+
+from mdaq_watcher.frames import MDAQ_FRAME
+from mdaq_watcher.mdaq import MdaqClient
+from mllm_server.channels import DEFAULT_CHANNELS, ChannelSpec
+from mllm_server.scaner_emulator import SEQUENCE_CHANNEL_ID, ScanerEmulator
+from mllm_server.scaner_udp import ScanerFilterServer
+from mllm_server.telemetry_log import (
+    SOURCE_MDAQ,
+    SOURCE_SCANER,
+    TelemetryLog,
+    TelemetryRecorder,
+    TelemetryReplayer,
+)
+
+HOST = "127.0.0.1"
+INTERVAL_NS = 20_000_000  # 레코드 간격 20 ms
+RECORDS = 6
+
+
+class RecordingMdaqClient(MdaqClient):
+    def __init__(self) -> None:
+        super().__init__(HOST, 9)
+        self.received: List[List[float]] = []
+
+    def update(self, float_values, int_values) -> None:
+        self.received.append(float_values.tolist())
+
+
+def make_frame(value: float) -> bytes:
+    return MDAQ_FRAME.pack(9, *([value] * 9), 0, *([int(value)] * 51))
+
+
+def write_log(path: str, count: int = RECORDS) -> List[bytes]:
+    payloads = [bytes([i + 1]) * (i + 3) for i in range(count)]  # 정렬 패딩이 필요한 길이
+    with TelemetryRecorder(path, chunk_size=4096) as recorder:
+        for i, payload in enumerate(payloads):
+            recorder.append(payload, SOURCE_SCANER, receive_ns=i * INTERVAL_NS)
+    return payloads
+
+
+def test_empty_payload_does_not_end_the_log(tmp_path) -> None:
+    path = str(tmp_path / "empty.tlog")
+    with TelemetryRecorder(path, chunk_size=4096) as recorder:
+        recorder.append(b"first", SOURCE_SCANER, receive_ns=1)
+        recorder.append(b"", SOURCE_SCANER, receive_ns=2)
+        recorder.append(b"second", SOURCE_MDAQ, receive_ns=3)
+    assert (recorder.records, recorder.skipped_empty) == (2, 1)
+
+    os.remove(path + ".idx")  # 비정상 종료로 인덱스를 잃은 경우
+    with TelemetryLog(path) as log:
+        assert [bytes(record.payload) for record in log.records()] == [b"first", b"second"]
+        assert log.source_counts() == {SOURCE_SCANER: 1, SOURCE_MDAQ: 1}
+
+
+def test_index_is_rebuilt_after_a_crash(tmp_path) -> None:
+    path = str(tmp_path / "crash.tlog")
+    recorder = TelemetryRecorder(path, chunk_size=4096)
+    try:
+        for i in range(3):
+            recorder.append(b"x" * (i + 1) * 1000, SOURCE_SCANER, receive_ns=i)  # chunk_size를 넘겨 파일이 늘어남
+        recorder._mmap.flush()
+        # close() 전: 로그는 chunk 단위 크기 그대로이고 인덱스 파일은 아직 비어 있음
+        with TelemetryLog(path) as log:
+            assert [len(record.payload) for record in log.records()] == [1000, 2000, 3000]
+            assert log.index["timestamp_ns"].tolist() == [0, 1, 2]
+    finally:
+        recorder.close()
+
+    with TelemetryLog(path) as log:
+        assert len(log) == 3
+        assert log.seek(1) == 1
+        assert bytes(log.record(2).payload) == b"x" * 3000
+
+
+def test_truncated_index_is_rebuilt(tmp_path) -> None:
+    path = str(tmp_path / "index.tlog")
+    payloads = write_log(path)
+    with open(path + ".idx", "r+b") as index:
+        index.truncate(16 * 2)
+    with TelemetryLog(path) as log:
+        assert [bytes(record.payload) for record in log.records()] == payloads
+        assert log.duration_s == pytest.approx((RECORDS - 1) * INTERVAL_NS / 1e9)
+        assert log.seek_seconds(0.05) == 3
+
+
+@pytest.mark.parametrize(
+    "speed, min_s, max_s",
+    [
+        (1.0, 0.1, 0.5),  # 실제 시간: 5 x 20 ms
+        (4.0, 0.025, 0.09),  # 4배속
+        (None, 0.0, 0.02),  # 최대 속도
+    ],
+)
+def test_replay_pacing(tmp_path, speed, min_s: float, max_s: float) -> None:
+    path = str(tmp_path / "pacing.tlog")
+    payloads = write_log(path)
+    with TelemetryLog(path) as log:
+        replayed: List[bytes] = []
+        replayer = TelemetryReplayer(log, {SOURCE_SCANER: lambda payload: replayed.append(bytes(payload))}, speed)
+        start = time.monotonic()
+        assert replayer.replay() == RECORDS
+        elapsed = time.monotonic() - start
+
+        async_start = time.monotonic()
+        assert asyncio.run(replayer.replay_async(log.seek_seconds(0.06))) == RECORDS - 3
+        async_elapsed = time.monotonic() - async_start
+    assert replayed == payloads + payloads[3:]
+    assert min_s <= elapsed < max_s
+    # 시작 위치부터 남은 2개 간격
+    assert min_s * 2 / 5 <= async_elapsed < max_s
+
+
+def test_invalid_replay_speed(tmp_path) -> None:
+    path = str(tmp_path / "speed.tlog")
+    write_log(path)
+    with TelemetryLog(path) as log:
+        with pytest.raises(ValueError):
+            TelemetryReplayer(log, {}, speed=0)
+
+
+def test_round_trip_into_receivers(tmp_path) -> None:
+    path = str(tmp_path / "round_trip.tlog")
+    emulator = ScanerEmulator((HOST, 9), channel_count=64)
+    try:
+        with TelemetryRecorder(path, chunk_size=4096) as recorder:
+            for i in range(20):
+                recorder.append(emulator.make_packet(i, i * 1000), SOURCE_SCANER, receive_ns=i * 1000)
+                if i % 4 == 0:
+                    recorder.append(make_frame(float(i)), SOURCE_MDAQ, receive_ns=i * 1000 + 500)
+    finally:
+        emulator.close()
+
+    channels = DEFAULT_CHANNELS + [ChannelSpec(SEQUENCE_CHANNEL_ID, "sequence")]
+    server = ScanerFilterServer(HOST, 0, timeout=1, channels=channels, history_capacity=64)
+    mdaq = RecordingMdaqClient()
+    with TelemetryLog(path) as log:
+        replayer = TelemetryReplayer(log, {SOURCE_SCANER: server.feed, SOURCE_MDAQ: mdaq.feed}, speed=None)
+        assert replayer.replay() == 25
+
+    assert server.channels["sequence"].history.snapshot().values.tolist() == [float(i) for i in range(20)]
+    assert server.get_ingest_stats()["packets_received"] == 20
+    assert mdaq.received == [[float(i)] * 9 for i in range(0, 20, 4)]
+    np.testing.assert_array_equal(mdaq.frames.snapshot().frames["ints"][:, 0], np.arange(0, 20, 4))
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from mllm_server.timeseries import TimeSeriesRing
+
+
+def fill(ring: TimeSeriesRing, start: int, stop: int) -> None:
+    for i in range(start, stop):
+        ring.append(float(i), i)
+
+
+def test_window_wraps_around() -> None:
+    ring = TimeSeriesRing(5)
+    fill(ring, 0, 12)
+
+    window = ring.window()
+    assert ring.count == 12
+    assert len(ring) == 5
+    assert window.start == 7
+    assert window.values.tolist() == [7.0, 8.0, 9.0, 10.0, 11.0]
+    assert window.timestamps.tolist() == [7, 8, 9, 10, 11]
+    assert ring.window(2).values.tolist() == [10.0, 11.0]
+    assert ring.latest() == 11.0
+
+
+def test_window_is_a_view() -> None:
+    ring = TimeSeriesRing(4)
+    fill(ring, 0, 6)
+    window = ring.window()
+    assert window.values.base is not None
+    assert not window.values.flags.owndata
+
+
+def test_extend_keeps_last_capacity_samples() -> None:
+    ring = TimeSeriesRing(5)
+    fill(ring, 0, 3)
+    ring.extend(np.arange(10, 18, dtype=np.float64), np.arange(10, 18, dtype=np.int64))
+    assert ring.count == 11
+    assert ring.window().values.tolist() == [13.0, 14.0, 15.0, 16.0, 17.0]
+    assert ring.window().timestamps.tolist() == [13, 14, 15, 16, 17]
+
+
+def test_is_intact_detects_overwritten_window() -> None:
+    ring = TimeSeriesRing(5)
+    fill(ring, 0, 7)
+    full = ring.window()
+    partial = ring.window(4)
+    assert ring.is_intact(full)
+    assert ring.is_intact(partial)
+
+    # 다음 기록은 가장 오래된 슬롯 하나를 덮어씀
+    ring.append(7.0, 7)
+    assert not ring.is_intact(full)
+    assert ring.is_intact(partial)
+
+    fill(ring, 8, 20)
+    assert not ring.is_intact(partial)
+    assert ring.is_intact(ring.window())
+
+
+def test_snapshot_is_a_copy() -> None:
+    ring = TimeSeriesRing(3)
+    fill(ring, 0, 3)
+    snapshot = ring.snapshot()
+    fill(ring, 3, 9)
+    assert snapshot.values.tolist() == [0.0, 1.0, 2.0]
+
+
+def test_invalid_capacity() -> None:
+    with pytest.raises(ValueError):
+        TimeSeriesRing(0)